@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .media_info import MediaInfo, probe_media
+
+COPY_SAMPLE_RATES = (44100, 48000)
+COPY_CHANNEL_LAYOUTS = ("", "mono", "stereo")
+# VBR-Dateien melden oft leicht ueber dem Nennwert liegende Bitraten.
+BITRATE_TOLERANCE = 1.05
+
+
+@dataclass(frozen=True)
+class AudioDecision:
+    args: List[str]
+    copy: bool
+    reason: str
+
+
+def parse_bitrate(value: str) -> int:
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kKmM]?)\s*", value or "")
+    if not match:
+        return 0
+    amount, unit = match.groups()
+    factor = {"k": 1000, "m": 1000000}.get(unit.lower(), 1)
+    return int(float(amount) * factor)
+
+
+def encode_audio_args(abitrate: str, codec: str = "aac") -> List[str]:
+    return ["-c:a", codec, "-b:a", abitrate]
+
+
+def decide_audio_args(
+    info: MediaInfo,
+    abitrate: str,
+    *,
+    codec: str = "aac",
+    has_filters: bool = False,
+    sample_rate: Optional[int] = None,
+    channels: Optional[int] = None,
+) -> AudioDecision:
+    encode = encode_audio_args(abitrate, codec)
+
+    def _reencode(reason: str) -> AudioDecision:
+        return AudioDecision(encode, False, reason)
+
+    if codec != "aac":
+        return _reencode(f"Ziel-Codec {codec}")
+    if has_filters:
+        return _reencode("Audiofilter aktiv")
+    if info.audio_codec != "aac":
+        return _reencode(f"Quelle ist {info.audio_codec or 'unbekannt'}")
+    if info.audio_profile and info.audio_profile.upper() != "LC":
+        return _reencode(f"AAC-Profil {info.audio_profile}")
+    target = parse_bitrate(abitrate)
+    if not info.audio_bitrate or not target:
+        return _reencode("Bitrate unbekannt")
+    if info.audio_bitrate > target * BITRATE_TOLERANCE:
+        return _reencode(
+            f"Bitrate {info.audio_bitrate // 1000}k über Ziel {abitrate}"
+        )
+    if info.sample_rate not in COPY_SAMPLE_RATES:
+        return _reencode(f"Samplerate {info.sample_rate} Hz")
+    if sample_rate and info.sample_rate != sample_rate:
+        return _reencode(f"Samplerate {info.sample_rate} statt {sample_rate}")
+    if info.channels not in (1, 2):
+        return _reencode(f"{info.channels} Kanäle")
+    if channels and info.channels != channels:
+        return _reencode(f"{info.channels} statt {channels} Kanäle")
+    if info.channel_layout not in COPY_CHANNEL_LAYOUTS:
+        return _reencode(f"Kanal-Layout {info.channel_layout}")
+    return AudioDecision(
+        ["-c:a", "copy"],
+        True,
+        f"AAC-LC {info.audio_bitrate // 1000}k, {info.sample_rate} Hz",
+    )
+
+
+def plan_audio_args(
+    audio_path: str,
+    abitrate: str,
+    *,
+    codec: str = "aac",
+    has_filters: bool = False,
+    sample_rate: Optional[int] = None,
+    channels: Optional[int] = None,
+) -> AudioDecision:
+    if codec != "aac" or has_filters:
+        # Ohne Kopierchance lohnt sich kein zusaetzlicher ffprobe-Aufruf.
+        return decide_audio_args(
+            MediaInfo(), abitrate, codec=codec, has_filters=has_filters
+        )
+    return decide_audio_args(
+        probe_media(audio_path),
+        abitrate,
+        codec=codec,
+        sample_rate=sample_rate,
+        channels=channels,
+    )
+
+
+def describe_decision(decision: AudioDecision) -> str:
+    action = "kopiert" if decision.copy else "neu kodiert"
+    return f"Audio {action} ({decision.reason})"
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+JOURNAL_FILE = ".videobatch_journal.jsonl"
+# Nur diese Einstellungen bestimmen den Inhalt der Ausgabe. Alles andere
+# (Ordner, Reihenfolge, Parallelitaet, Termin ...) darf sich aendern, ohne
+# dass ein Fortsetzen alles neu kodiert; neue Schalter zaehlen erst, wenn
+# sie hier eingetragen sind.
+OUTPUT_SETTING_KEYS = frozenset(
+    {
+        "crf",
+        "preset",
+        "width",
+        "height",
+        "abitrate",
+        "mode",
+        "still_optimized",
+        "segmented",
+        "audio_normalize",
+        "renditions",
+    }
+)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(path: str, with_hash: bool = False) -> Dict[str, Any]:
+    """Groesse und mtime einer Datei; Ordner (Slideshow) ueber ihre Eintraege."""
+    resolved = Path(path).expanduser().resolve()
+    if resolved.is_dir():
+        entries = sorted(
+            (p.name, p.stat().st_size, p.stat().st_mtime_ns)
+            for p in resolved.iterdir()
+            if p.is_file()
+        )
+        return {
+            "path": str(resolved),
+            "entries": hashlib.sha256(
+                json.dumps(entries).encode("utf-8")
+            ).hexdigest(),
+        }
+    stat = resolved.stat()
+    info: Dict[str, Any] = {
+        "path": str(resolved),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if with_hash:
+        info["sha256"] = _file_hash(resolved)
+    return info
+
+
+def settings_hash(settings: Mapping[str, Any]) -> str:
+    relevant = {k: v for k, v in settings.items() if k in OUTPUT_SETTING_KEYS}
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def job_key(
+    inputs: Iterable[str], settings: Mapping[str, Any], with_hash: bool = False
+) -> str:
+    prints = [fingerprint(p, with_hash) for p in inputs if p]
+    payload = json.dumps([prints, settings_hash(settings)], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BatchJournal:
+    """JSONL-Protokoll fertiger Jobs im Ausgabeordner.
+
+    Jeder fertige Job wird mit Schluessel (Eingaben + Einstellungen),
+    Ausgabepfad und Ausgabegroesse angehaengt. Beim Fortsetzen gilt ein Job
+    als erledigt, wenn die Ausgabe noch existiert und unveraendert ist.
+    """
+
+    def __init__(self, out_dir: Path):
+        self.path = Path(out_dir) / JOURNAL_FILE
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Abgebrochene letzte Zeile nach einem Absturz.
+                continue
+            if isinstance(entry, dict) and entry.get("key"):
+                self._entries[entry["key"]] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def completed_output(self, key: str) -> Optional[Path]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if not entry:
+            return None
+        output = Path(entry.get("output", ""))
+        try:
+            stat = output.stat()
+        except OSError:
+            return None
+        if stat.st_size <= 0 or stat.st_size != entry.get("size"):
+            return None
+        if stat.st_mtime_ns != entry.get("mtime_ns"):
+            return None
+        return output
+
+    def record(
+        self, key: str, output: str, inputs: Optional[List[str]] = None
+    ) -> None:
+        stat = Path(output).stat()
+        entry = {
+            "key": key,
+            "output": str(Path(output).resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "inputs": list(inputs or []),
+            "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._entries[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
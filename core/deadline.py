@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import datetime, time, timedelta
+from typing import Dict, Mapping, Optional, Sequence
+
+from .encode_history import EncodeProfile, EtaPredictor
+
+# x264-Presets vom schnellsten zum kleinsten Ergebnis.
+PRESETS = (
+    "ultrafast",
+    "superfast",
+    "veryfast",
+    "faster",
+    "fast",
+    "medium",
+    "slow",
+    "slower",
+    "veryslow",
+)
+# Ersatztabelle: Rechenzeit relativ zu "medium" (grobe x264-Richtwerte).
+# Gilt nur fuer Presets ohne eigene Messung auf diesem Rechner; die
+# Verhaeltnisse werden an die naechstgelegene gemessene Stufe gehaengt.
+PRESET_COST: Dict[str, float] = {
+    "ultrafast": 0.25,
+    "superfast": 0.35,
+    "veryfast": 0.5,
+    "faster": 0.7,
+    "fast": 0.85,
+    "medium": 1.0,
+    "slow": 1.6,
+    "slower": 3.0,
+    "veryslow": 6.0,
+}
+# Langsamere Presets nur mit Reserve waehlen; Schaetzungen schwanken.
+SAFETY_MARGIN = 0.9
+
+
+@dataclass(frozen=True)
+class DeadlinePlan:
+    preset: str
+    seconds: float
+    on_time: bool
+
+
+def next_deadline(at: time, now: Optional[datetime] = None) -> datetime:
+    """Naechster Zeitpunkt mit dieser Uhrzeit (heute oder morgen)."""
+    now = now or datetime.now()
+    target = datetime.combine(now.date(), at)
+    if target <= now:
+        target += timedelta(days=1)
+    return target
+
+
+def preset_seconds(
+    predictor: EtaPredictor,
+    profile: EncodeProfile,
+    durations: Sequence[float],
+    jobs: int = 1,
+    factor: float = 1.0,
+) -> Dict[str, float]:
+    """Geschaetzte Stapeldauer je Preset; leer ohne jede Messung.
+
+    Gemessene Presets kommen direkt aus dem Verlauf, die anderen ueber
+    :data:`PRESET_COST` von der naechstgelegenen gemessenen Stufe. Ohne
+    Messung fuer diesen Modus gilt die allgemeine Schaetzung fuer das
+    aktuelle Preset als Bezug.
+    """
+    if not durations:
+        return {}
+    measured: Dict[str, float] = {}
+    for preset in PRESETS:
+        total = _total(
+            predictor, replace(profile, preset=preset), durations, True
+        )
+        if total is not None:
+            measured[preset] = total
+    if not measured:
+        total = _total(predictor, profile, durations, False)
+        if total is None or profile.preset not in PRESET_COST:
+            return {}
+        measured[profile.preset] = total
+    result: Dict[str, float] = {}
+    for preset in PRESETS:
+        ref = min(
+            measured,
+            key=lambda known: abs(PRESETS.index(known) - PRESETS.index(preset)),
+        )
+        seconds = measured[ref] * PRESET_COST[preset] / PRESET_COST[ref]
+        result[preset] = seconds * factor / max(1, jobs)
+    return result
+
+
+def _total(
+    predictor: EtaPredictor,
+    profile: EncodeProfile,
+    durations: Sequence[float],
+    exact: bool,
+) -> Optional[float]:
+    total = 0.0
+    for duration in durations:
+        seconds = predictor.predict(profile, duration, exact=exact)
+        if seconds is None:
+            return None
+        total += seconds
+    return total
+
+
+def choose_preset(
+    estimates: Mapping[str, float],
+    budget: float,
+    current: Optional[str] = None,
+) -> Optional[DeadlinePlan]:
+    """Langsamstes Preset, das im Zeitbudget bleibt.
+
+    Passt keines, das schnellste (``on_time`` False). Das aktuelle Preset
+    bleibt, solange es noch passt, damit nicht bei jeder Schwankung
+    gewechselt wird.
+    """
+    known = [p for p in PRESETS if p in estimates]
+    if not known:
+        return None
+    fitting = [p for p in known if estimates[p] <= budget * SAFETY_MARGIN]
+    if not fitting:
+        fastest = known[0]
+        return DeadlinePlan(
+            fastest, estimates[fastest], estimates[fastest] <= budget
+        )
+    best = fitting[-1]
+    if (
+        current is not None
+        and current in estimates
+        and estimates[current] <= budget
+        and PRESETS.index(best) < PRESETS.index(current)
+    ):
+        best = current
+    return DeadlinePlan(best, estimates[best], True)
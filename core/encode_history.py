@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .paths import user_data_dir
+
+LOGGER = logging.getLogger("VideoBatchTool.encode_history")
+
+HISTORY_FILE = "encode_history.sqlite3"
+# Nur juengere Laeufe zaehlen: neue Hardware oder ffmpeg-Versionen
+# aendern das Tempo.
+MAX_SAMPLES = 500
+# Ab so vielen Messungen einer Gruppe wird eine Gerade angepasst,
+# darunter nur ein mittleres Tempo.
+MIN_FIT_SAMPLES = 3
+REFERENCE_PIXELS = 1920 * 1080
+# Korrektur aus dem laufenden Stapel nur in diesen Grenzen.
+MIN_FACTOR = 0.25
+MAX_FACTOR = 4.0
+# Erst ab so viel vorhergesagter Zeit ist die Korrektur aussagekraeftig.
+MIN_OBSERVED_SECONDS = 30.0
+# Ab diesem Faktor gilt der Stapel als auffaellig langsam.
+SLOWDOWN_FACTOR = 1.5
+
+
+def history_path() -> Path:
+    return user_data_dir() / HISTORY_FILE
+
+
+def current_load() -> Optional[float]:
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+
+@dataclass(frozen=True)
+class EncodeProfile:
+    """Einstellungen, die das Tempo bestimmen (ohne die Laufzeit)."""
+
+    mode: str
+    width: int
+    height: int
+    preset: str
+    crf: int
+    still: bool = False
+
+    @property
+    def pixel_factor(self) -> float:
+        return max(1, self.width * self.height) / REFERENCE_PIXELS
+
+
+@dataclass(frozen=True)
+class EncodeRecord:
+    profile: EncodeProfile
+    duration: float
+    wall: float
+    jobs: int = 1
+    load: Optional[float] = None
+    host: str = field(default_factory=socket.gethostname)
+    finished: float = field(default_factory=time.time)
+
+    @property
+    def speed(self) -> float:
+        """Tempo wie bei ffmpeg: Sekunden Video je Sekunde Rechenzeit."""
+        return self.duration / self.wall if self.wall > 0 else 0.0
+
+
+class EncodeHistory:
+    """Dauerhafte Messwerte aller fertigen Kodierungen (SQLite)."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or history_path()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), timeout=30, check_same_thread=False
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS encodes ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "finished REAL NOT NULL, host TEXT NOT NULL, "
+                "mode TEXT NOT NULL, width INTEGER NOT NULL, "
+                "height INTEGER NOT NULL, preset TEXT NOT NULL, "
+                "crf INTEGER NOT NULL, still INTEGER NOT NULL, "
+                "duration REAL NOT NULL, wall REAL NOT NULL, "
+                "speed REAL NOT NULL, jobs INTEGER NOT NULL, load REAL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def record(self, record: EncodeRecord) -> None:
+        p = record.profile
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT INTO encodes (finished, host, mode, width, "
+                    "height, preset, crf, still, duration, wall, speed, "
+                    "jobs, load) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        record.finished,
+                        record.host,
+                        p.mode,
+                        p.width,
+                        p.height,
+                        p.preset,
+                        p.crf,
+                        int(p.still),
+                        record.duration,
+                        record.wall,
+                        record.speed,
+                        record.jobs,
+                        record.load,
+                    ),
+                )
+                conn.commit()
+            except sqlite3.Error as exc:
+                LOGGER.warning("Verlauf nicht schreibbar: %s", exc)
+
+    def recent(
+        self, limit: int = MAX_SAMPLES, host: Optional[str] = None
+    ) -> List[EncodeRecord]:
+        """Die juengsten Messungen dieses Rechners, aelteste zuerst."""
+        host = host or socket.gethostname()
+        with self._lock:
+            try:
+                rows = (
+                    self._connection()
+                    .execute(
+                        "SELECT mode, width, height, preset, crf, still, "
+                        "duration, wall, jobs, load, host, finished "
+                        "FROM encodes WHERE host = ? "
+                        "ORDER BY id DESC LIMIT ?",
+                        (host, limit),
+                    )
+                    .fetchall()
+                )
+            except sqlite3.Error as exc:
+                LOGGER.warning("Verlauf nicht lesbar: %s", exc)
+                return []
+        return [
+            EncodeRecord(
+                EncodeProfile(mode, width, height, preset, crf, bool(still)),
+                duration,
+                wall,
+                jobs,
+                load,
+                row_host,
+                finished,
+            )
+            for (
+                mode,
+                width,
+                height,
+                preset,
+                crf,
+                still,
+                duration,
+                wall,
+                jobs,
+                load,
+                row_host,
+                finished,
+            ) in reversed(rows)
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _fit(
+    points: Sequence[Tuple[float, float]]
+) -> Optional[Tuple[float, float]]:
+    """Gerade ``wall = a + b * x`` nach kleinsten Quadraten."""
+    if not points:
+        return None
+    sum_x = sum(x for x, _ in points)
+    sum_y = sum(y for _, y in points)
+    if len(points) >= MIN_FIT_SAMPLES:
+        n = len(points)
+        mean_x, mean_y = sum_x / n, sum_y / n
+        var = sum((x - mean_x) ** 2 for x, _ in points)
+        if var > 0:
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+            intercept = mean_y - slope * mean_x
+            # Unplausible Geraden (schneller bei laengerem Material oder
+            # negative Startzeit) verwerfen, dann mittleres Tempo.
+            if slope > 0 and intercept >= 0:
+                return intercept, slope
+    if sum_x <= 0:
+        return None
+    return 0.0, sum_y / sum_x
+
+
+class EtaPredictor:
+    """Sagt die Dauer einer Kodierung aus dem Verlauf voraus.
+
+    Je Gruppe (Modus, Preset, Standbild) eine Gerade ueber Laufzeit mal
+    Bildflaeche; fehlen Messungen, wird auf groebere Gruppen
+    zurueckgegriffen (nur Modus, dann alles).
+    """
+
+    def __init__(self, records: Sequence[EncodeRecord] = ()):
+        self._records: List[EncodeRecord] = list(records)
+        self._fits: Dict[tuple, Optional[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: EncodeRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+            self._fits.clear()
+
+    def typical_jobs(self) -> int:
+        """Wie viele Kodierungen meist gleichzeitig liefen."""
+        with self._lock:
+            jobs = [r.jobs for r in self._records[-MAX_SAMPLES:]]
+        return max(1, int(median(jobs))) if jobs else 1
+
+    def predict(
+        self, profile: EncodeProfile, duration: float, exact: bool = False
+    ) -> Optional[float]:
+        """Erwartete Sekunden fuer eine Datei; None ohne Messwerte.
+
+        ``exact`` nutzt nur Messungen mit genau diesem Modus und Preset.
+        """
+        if duration <= 0:
+            return None
+        x = duration * profile.pixel_factor
+        groups = self._groups(profile)
+        for group in groups[:1] if exact else groups:
+            fit = self._fit_for(group)
+            if fit is not None:
+                return fit[0] + fit[1] * x
+        return None
+
+    def batch_seconds(
+        self,
+        profile: EncodeProfile,
+        durations: Sequence[float],
+        jobs: int = 0,
+    ) -> Optional[float]:
+        """Gesamtdauer bei ``jobs`` gleichzeitigen Kodierungen (0 = wie
+        bisher ueblich)."""
+        total = 0.0
+        for duration in durations:
+            seconds = self.predict(profile, duration)
+            if seconds is None:
+                return None
+            total += seconds
+        return total / max(1, jobs or self.typical_jobs())
+
+    @staticmethod
+    def _groups(profile: EncodeProfile) -> List[tuple]:
+        return [
+            ("preset", profile.mode, profile.preset, profile.still),
+            ("mode", profile.mode, profile.still),
+            ("all",),
+        ]
+
+    def _fit_for(self, group: tuple) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            if group not in self._fits:
+                points = [
+                    (r.duration * r.profile.pixel_factor, r.wall)
+                    for r in self._records
+                    if group in self._groups(r.profile)
+                ]
+                self._fits[group] = _fit(points)
+            return self._fits[group]
+
+
+class RunningEta:
+    """Vergleicht im laufenden Stapel Vorhersage und Messung.
+
+    Der Faktor (gemessen / vorhergesagt) verfeinert die Restzeit und
+    zeigt, wenn der Rechner gerade langsamer ist als sonst.
+    """
+
+    def __init__(self) -> None:
+        self._predicted = 0.0
+        self._actual = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, predicted: float, actual: float) -> None:
+        with self._lock:
+            self._predicted += predicted
+            self._actual += actual
+
+    @property
+    def factor(self) -> float:
+        with self._lock:
+            if self._predicted < MIN_OBSERVED_SECONDS:
+                return 1.0
+            ratio = self._actual / self._predicted
+        return min(MAX_FACTOR, max(MIN_FACTOR, ratio))
+
+    @property
+    def slow(self) -> bool:
+        return self.factor >= SLOWDOWN_FACTOR
+
+
+def remaining_seconds(
+    pending: Sequence[float],
+    running: Sequence[float],
+    jobs: int,
+    factor: float = 1.0,
+) -> float:
+    """Restzeit: wartende Jobs verteilen sich auf ``jobs`` Plaetze, die
+    laufenden belegen sie noch ihre Restzeit lang."""
+    slots = max(1, jobs)
+    return (sum(pending) * factor + sum(running)) / slots
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+PROGRESS_ARGS = ["-progress", "pipe:1", "-nostats"]
+# Hoechstens vier Aktualisierungen pro Sekunde und Zeile.
+DEFAULT_EMIT_INTERVAL = 0.25
+
+
+@dataclass
+class ProgressSnapshot:
+    out_time: float = 0.0
+    percent: float = 0.0
+    speed: float = 0.0
+    fps: float = 0.0
+    bitrate: str = ""
+    eta: float = 0.0
+    done: bool = False
+
+
+def with_progress_args(cmd: List[str]) -> List[str]:
+    if not cmd or "-progress" in cmd:
+        return list(cmd)
+    return [cmd[0], *PROGRESS_ARGS, *cmd[1:]]
+
+
+def _parse_number(value: str) -> float:
+    try:
+        return float(value.strip().rstrip("x"))
+    except ValueError:
+        return 0.0
+
+
+class ProgressReader:
+    """Liest die Schluessel/Wert-Bloecke von ``ffmpeg -progress``."""
+
+    def __init__(
+        self,
+        duration: float,
+        interval: float = DEFAULT_EMIT_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.duration = max(0.0, duration)
+        self.interval = interval
+        self._clock = clock
+        self._started = clock()
+        self._last_emit: Optional[float] = None
+        self._block: Dict[str, str] = {}
+        self.snapshot = ProgressSnapshot()
+
+    def feed(self, line: str) -> Optional[ProgressSnapshot]:
+        """Gibt einen Stand zurueck, sobald ein Block fertig und faellig ist."""
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return None
+        if key != "progress":
+            self._block[key] = value
+            return None
+        block, self._block = self._block, {}
+        self._update(block, done=value == "end")
+        now = self._clock()
+        if (
+            not self.snapshot.done
+            and self._last_emit is not None
+            and now - self._last_emit < self.interval
+        ):
+            return None
+        self._last_emit = now
+        return self.snapshot
+
+    def _update(self, block: Dict[str, str], done: bool) -> None:
+        snap = self.snapshot
+        # out_time_ms liefert trotz des Namens ebenfalls Mikrosekunden.
+        raw = block.get("out_time_us") or block.get("out_time_ms") or ""
+        micros = _parse_number(raw)
+        if micros > 0:
+            snap.out_time = micros / 1_000_000
+        snap.speed = _parse_number(block.get("speed", "")) or snap.speed
+        snap.fps = _parse_number(block.get("fps", "")) or snap.fps
+        bitrate = block.get("bitrate", "").strip()
+        if bitrate and bitrate != "N/A":
+            snap.bitrate = bitrate
+        snap.done = done
+        if done:
+            snap.percent = 100.0
+            snap.eta = 0.0
+            return
+        if self.duration:
+            snap.percent = min(100.0, snap.out_time / self.duration * 100.0)
+        snap.eta = self._estimate_eta()
+
+    def _estimate_eta(self) -> float:
+        snap = self.snapshot
+        if not self.duration or snap.out_time <= 0:
+            return 0.0
+        remaining = max(0.0, self.duration - snap.out_time)
+        if snap.speed > 0:
+            return remaining / snap.speed
+        elapsed = self._clock() - self._started
+        return remaining * elapsed / snap.out_time
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .image_prep import POOL_THRESHOLD, _pool_context
+from .paths import cache_dir
+from .probe_cache import CacheKey, ProbeCache, file_key
+
+LOGGER = logging.getLogger("VideoBatchTool.image_dedupe")
+
+HASH_CACHE_FILE = "image_hash_cache.sqlite3"
+HASH_VERSION = 1
+# dHash: 9x8 Graustufen-Miniatur, 64 Bit aus Helligkeitsvergleichen.
+HASH_SIZE = 8
+# Bis zu so vielen abweichenden Bits gilt ein Bild als gleiches Motiv
+# (anderer Export, andere Groesse/Kompression); Folien mit geaendertem
+# Text liegen deutlich darueber.
+DUPLICATE_THRESHOLD = 4
+# Viele kleine Aufgaben: gebuendelt an die Prozesse verteilen.
+POOL_CHUNKSIZE = 32
+
+
+def hash_cache_path() -> Path:
+    return cache_dir() / HASH_CACHE_FILE
+
+
+_DEFAULT_CACHE: Optional[ProbeCache] = None
+
+
+def default_hash_cache() -> ProbeCache:
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = ProbeCache(hash_cache_path())
+    return _DEFAULT_CACHE
+
+
+def dhash(path: str, size: int = HASH_SIZE) -> int:
+    """Differenz-Hash einer winzigen Graustufen-Miniatur."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        # JPEG direkt verkleinert dekodieren (1/8): fuer 9x8 Pixel reicht das.
+        img.draft("L", (size * 8, size * 8))
+        thumb = img.convert("L").resize(
+            (size + 1, size), Image.Resampling.BILINEAR
+        )
+    try:
+        import numpy as np
+    except ImportError:
+        pixels = list(thumb.tobytes())
+        rows = [
+            pixels[r * (size + 1) : (r + 1) * (size + 1)] for r in range(size)
+        ]
+        bits = [row[c + 1] > row[c] for row in rows for c in range(size)]
+    else:
+        grid = np.asarray(thumb, dtype=np.int16)
+        bits = (grid[:, 1:] > grid[:, :-1]).ravel().tolist()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def _dhash_safely(path: str) -> Optional[int]:
+    try:
+        return dhash(path)
+    except Exception:
+        return None
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """Burkhard-Keller-Baum fuer Hamming-Abstaende.
+
+    Eine Suche mit kleinem Radius besucht nur wenige Zweige, statt jedes
+    Bild mit jedem zu vergleichen.
+    """
+
+    def __init__(self) -> None:
+        self._root: Optional[Tuple[int, List[int], Dict[int, tuple]]] = None
+
+    def add(self, value: int, index: int) -> None:
+        if self._root is None:
+            self._root = (value, [index], {})
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(index)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [index], {})
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> List[int]:
+        found: List[int] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                found.extend(node[1])
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def image_hashes(
+    paths: Sequence[str],
+    cache: Optional[ProbeCache] = None,
+    max_workers: Optional[int] = None,
+) -> List[Optional[int]]:
+    """Hash je Pfad (None = nicht lesbar); berechnet wird nur Neues."""
+    cache = cache or default_hash_cache()
+    hashes: List[Optional[int]] = [None] * len(paths)
+    todo: Dict[str, List[int]] = {}
+    keys: Dict[str, Optional[CacheKey]] = {}
+    for index, path in enumerate(paths):
+        key = keys[path] = keys.get(path) or file_key(path)
+        cached = cache.get(key) if key is not None else None
+        if cached is not None and cached.get("version") == HASH_VERSION:
+            hashes[index] = int(cached["dhash"])
+        else:
+            todo.setdefault(path, []).append(index)
+    if not todo:
+        return hashes
+    names = list(todo)
+    if len(names) < POOL_THRESHOLD:
+        results = [_dhash_safely(name) for name in names]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=_pool_context()
+        ) as pool:
+            results = list(
+                pool.map(_dhash_safely, names, chunksize=POOL_CHUNKSIZE)
+            )
+    fresh = []
+    for name, value in zip(names, results):
+        if value is None:
+            LOGGER.warning("Bild nicht vergleichbar: %s", name)
+            continue
+        for index in todo[name]:
+            hashes[index] = value
+        key = keys[name]
+        if key is not None:
+            fresh.append((key, {"version": HASH_VERSION, "dhash": value}))
+    cache.put_many(fresh)
+    return hashes
+
+
+def group_duplicates(
+    hashes: Sequence[Optional[int]], threshold: int = DUPLICATE_THRESHOLD
+) -> List[List[int]]:
+    """Gruppen aehnlicher Bilder als Indizes, jeweils in Eingabereihenfolge."""
+    parent = list(range(len(hashes)))
+
+    def _find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    tree = BKTree()
+    for index, value in enumerate(hashes):
+        if value is None:
+            continue
+        for other in tree.search(value, threshold):
+            a, b = _find(index), _find(other)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+        tree.add(value, index)
+    groups: Dict[int, List[int]] = {}
+    for index, value in enumerate(hashes):
+        if value is not None:
+            groups.setdefault(_find(index), []).append(index)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def find_duplicates(
+    paths: Sequence[str],
+    threshold: int = DUPLICATE_THRESHOLD,
+    cache: Optional[ProbeCache] = None,
+    max_workers: Optional[int] = None,
+) -> List[List[str]]:
+    """Nahezu gleiche Bilder; das erste jeder Gruppe ist das Original."""
+    hashes = image_hashes(paths, cache, max_workers)
+    return [
+        [paths[i] for i in members]
+        for members in group_duplicates(hashes, threshold)
+    ]
+
+
+def redundant_images(groups: Sequence[Sequence[str]]) -> Set[str]:
+    """Alles ausser dem ersten Bild jeder Gruppe."""
+    first = {group[0] for group in groups}
+    return {path for group in groups for path in group[1:] if path not in first}
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .paths import work_dir
+
+LOGGER = logging.getLogger("VideoBatchTool.image_prep")
+
+PREP_DIR = "slide_frames"
+PREP_VERSION = 1
+PREP_MAX_AGE_DAYS = 7
+JPEG_QUALITY = 95
+RAW_SUFFIX = ".rgb"
+# Unterhalb dieser Anzahl lohnt der Start eines Prozess-Pools nicht.
+POOL_THRESHOLD = 4
+# EXIF-Ausrichtungen, bei denen Breite und Hoehe vertauscht sind.
+_ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+# Ein Lock je Zieldatei: parallele Jobs mit demselben Bild warten auf das
+# erste Ergebnis, statt es gleichzeitig ein zweites Mal zu erzeugen.
+_GUARD = threading.Lock()
+_TARGET_LOCKS: Dict[str, threading.Lock] = {}
+
+
+def _lock_for(target: Path) -> threading.Lock:
+    with _GUARD:
+        return _TARGET_LOCKS.setdefault(str(target), threading.Lock())
+
+
+def prep_dir() -> Path:
+    return work_dir() / PREP_DIR
+
+
+def prepared_name(
+    src: Path,
+    width: int,
+    height: int,
+    fit_mode: str,
+    background: str,
+    suffix: str = ".jpg",
+) -> str:
+    stat = src.stat()
+    payload = json.dumps(
+        [
+            PREP_VERSION,
+            str(src.resolve()),
+            stat.st_size,
+            stat.st_mtime_ns,
+            width,
+            height,
+            fit_mode,
+            background,
+        ]
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+    return f"{digest}{suffix}"
+
+
+def _background_rgb(background: str) -> Tuple[int, int, int]:
+    from PIL import ImageColor
+
+    value = background.strip()
+    if value.lower().startswith("0x"):
+        value = "#" + value[2:]
+    try:
+        rgb = ImageColor.getrgb(value)
+    except ValueError:
+        return (0, 0, 0)
+    return (rgb[0], rgb[1], rgb[2])
+
+
+def _scale_factor(
+    size: Tuple[int, int], width: int, height: int, fit_mode: str
+) -> float:
+    sx, sy = width / size[0], height / size[1]
+    return max(sx, sy) if fit_mode == "cover" else min(sx, sy)
+
+
+def prepare_image(
+    src: str,
+    target: str,
+    width: int,
+    height: int,
+    fit_mode: str = "contain",
+    background: str = "black",
+) -> str:
+    """Dekodiert, dreht (EXIF) und skaliert ein Bild genau einmal."""
+    from PIL import Image, ImageOps
+
+    with Image.open(src) as img:
+        orientation = img.getexif().get(0x0112, 1)
+        w, h = img.size
+        upright = (h, w) if orientation in _ROTATED_ORIENTATIONS else (w, h)
+        factor = _scale_factor(upright, width, height, fit_mode)
+        if factor < 1 and img.format == "JPEG":
+            # DCT-Skalierung: JPEG direkt in 1/2, 1/4 oder 1/8 dekodieren.
+            img.draft("RGB", (math.ceil(w * factor), math.ceil(h * factor)))
+        frame = ImageOps.exif_transpose(img).convert("RGB")
+    if fit_mode == "cover":
+        frame = ImageOps.fit(frame, (width, height), Image.Resampling.LANCZOS)
+    else:
+        frame = ImageOps.contain(
+            frame, (width, height), Image.Resampling.LANCZOS
+        )
+        canvas = Image.new("RGB", (width, height), _background_rgb(background))
+        canvas.paste(
+            frame, ((width - frame.width) // 2, (height - frame.height) // 2)
+        )
+        frame = canvas
+    # Eigener Name je Aufruf: auch ein zweiter Prozess (etwa eine andere
+    # Instanz) ueberschreibt keine halb geschriebene Datei.
+    tmp = f"{target}.{os.getpid()}-{uuid.uuid4().hex[:8]}.part"
+    try:
+        if target.lower().endswith(RAW_SUFFIX):
+            # Unkomprimierte RGB24-Pixel: ffmpeg muss nichts mehr dekodieren.
+            with open(tmp, "wb") as handle:
+                handle.write(frame.tobytes())
+        elif target.lower().endswith(".png"):
+            frame.save(tmp, format="PNG", compress_level=1)
+        else:
+            frame.save(tmp, format="JPEG", quality=JPEG_QUALITY)
+        os.replace(tmp, target)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+    return target
+
+
+def _pool_context():
+    # Kein fork: der Aufrufer ist oft ein Qt-Prozess mit laufenden Threads.
+    methods = multiprocessing.get_all_start_methods()
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def prune_prepared(root: Path, max_age_days: int = PREP_MAX_AGE_DAYS) -> int:
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in root.glob("*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def prepare_images(
+    images: Sequence[Path],
+    width: int,
+    height: int,
+    fit_mode: str = "contain",
+    background: str = "black",
+    root: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    suffix: str = ".jpg",
+) -> List[Path]:
+    """Liefert fertig skalierte Einzelbilder; bei Fehlern das Original.
+
+    Bereits vorbereitete Bilder werden aus dem Arbeitsordner wiederverwendet,
+    alle anderen parallel in einem Prozess-Pool erzeugt. Ohne Pillow bleibt
+    die Liste unveraendert und ffmpeg skaliert wie bisher selbst.
+    """
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return [Path(p) for p in images]
+    root = root or prep_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    prune_prepared(root)
+    result: List[Path] = []
+    todo: List[Tuple[int, Path, Path]] = []
+    queued = set()
+    for index, image in enumerate(images):
+        src = Path(image)
+        try:
+            target = root / prepared_name(
+                src, width, height, fit_mode, background, suffix
+            )
+        except OSError:
+            result.append(src)
+            continue
+        result.append(target)
+        if target not in queued:
+            queued.add(target)
+            todo.append((index, src, target))
+    # Sortiert sperren, damit sich zwei Aufrufe nicht gegenseitig blockieren.
+    with ExitStack() as stack:
+        for target in sorted(queued):
+            stack.enter_context(_lock_for(target))
+        outcomes = _prepare_missing(
+            todo, width, height, fit_mode, background, max_workers
+        )
+    failed = set()
+    for (_, src, target), error in zip(todo, outcomes):
+        if error:
+            LOGGER.warning("Bild nicht vorbereitet (%s): %s", src, error)
+            failed.add(target)
+    if failed:
+        result = [
+            Path(images[i]) if path in failed else path
+            for i, path in enumerate(result)
+        ]
+    return result
+
+
+def _prepare_missing(
+    todo: List[Tuple[int, Path, Path]],
+    width: int,
+    height: int,
+    fit_mode: str,
+    background: str,
+    max_workers: Optional[int],
+) -> List[str]:
+    """Erzeugt fehlende Bilder; je Eintrag ein Fehlertext oder ""."""
+    outcomes = [""] * len(todo)
+    missing: List[int] = []
+    for pos, (_, _, target) in enumerate(todo):
+        if target.exists():
+            os.utime(target)
+        else:
+            missing.append(pos)
+    if not missing:
+        return outcomes
+    args = [
+        (
+            str(todo[pos][1]),
+            str(todo[pos][2]),
+            width,
+            height,
+            fit_mode,
+            background,
+        )
+        for pos in missing
+    ]
+    if len(args) < POOL_THRESHOLD:
+        errors = [_prepare_safely(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=_pool_context()
+        ) as pool:
+            errors = list(pool.map(_prepare_safely, *zip(*args)))
+    for pos, error in zip(missing, errors):
+        outcomes[pos] = error
+    return outcomes
+
+
+def _prepare_safely(
+    src: str,
+    target: str,
+    width: int,
+    height: int,
+    fit_mode: str,
+    background: str,
+) -> str:
+    try:
+        prepare_image(src, target, width, height, fit_mode, background)
+    except Exception as exc:
+        return str(exc) or exc.__class__.__name__
+    return ""
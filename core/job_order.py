@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+ORDER_TABLE = "table"
+# Laengste zuerst (LPT): kein langer Job bleibt allein am Ende uebrig.
+ORDER_LONGEST = "longest"
+# Kuerzeste zuerst: moeglichst frueh moeglichst viele fertige Videos.
+ORDER_SHORTEST = "shortest"
+ORDERS = (ORDER_TABLE, ORDER_LONGEST, ORDER_SHORTEST)
+ORDER_LABELS = {
+    ORDER_TABLE: "Tabellenreihenfolge",
+    ORDER_LONGEST: "Längste zuerst (kürzeste Gesamtzeit)",
+    ORDER_SHORTEST: "Kürzeste zuerst (früh erste Ergebnisse)",
+}
+
+# Grobe Rechenzeit je Sekunde Laufzeit, relativ zu Bild + Audio.
+# GUI-Modi und die Modi der Profi-CLI ("video", "slideshow").
+MODE_COST: Dict[str, float] = {
+    "Standard": 1.0,
+    "Mehrere Audios, 1 Bild": 1.0,
+    "Slideshow": 1.5,
+    "Video + Audio": 2.0,
+    "slideshow": 1.5,
+    "video": 2.0,
+}
+# Standbild-Modus (1 fps) kodiert nur einen Bruchteil der Bilder.
+STILL_COST_FACTOR = 0.25
+# Jede weitere Stufe einer Qualitaetsleiter ist kleiner als die erste.
+RENDITION_COST = 0.5
+# Start, Proben und Muxen kosten auch bei kurzen Jobs etwas.
+JOB_OVERHEAD_SECONDS = 2.0
+
+
+def job_cost(
+    duration: float,
+    mode: str = "Standard",
+    still: bool = False,
+    renditions: int = 1,
+) -> float:
+    """Geschaetzte Rechenzeit eines Jobs in "Bild-Audio-Sekunden"."""
+    cost = max(0.0, duration) * MODE_COST.get(mode, 1.0)
+    if still:
+        cost *= STILL_COST_FACTOR
+    cost *= 1.0 + RENDITION_COST * max(0, renditions - 1)
+    return cost + JOB_OVERHEAD_SECONDS
+
+
+def order_key(
+    order: str, cost: Callable[[T], float]
+) -> Optional[Callable[[T], float]]:
+    """Sortierschluessel fuer eine Reihenfolge; None = Tabellenreihenfolge."""
+    if order == ORDER_LONGEST:
+        return lambda item: -cost(item)
+    if order == ORDER_SHORTEST:
+        return cost
+    return None
+
+
+def order_jobs(
+    items: Sequence[T], order: str, cost: Callable[[T], float]
+) -> List[T]:
+    """Jobs in der gewaehlten Reihenfolge; gleich teure bleiben stabil."""
+    key = order_key(order, cost)
+    if key is None:
+        return list(items)
+    return sorted(items, key=key)
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .paths import work_dir
+
+JOB_QUEUE_FILE = "job_queue.sqlite3"
+DEFAULT_LEASE_SECONDS = 120.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def job_queue_path() -> Path:
+    return work_dir() / JOB_QUEUE_FILE
+
+
+def default_worker_id(suffix: str = "") -> str:
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    return f"{worker}:{suffix}" if suffix else worker
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    batch: str
+    payload: Dict[str, Any]
+    attempts: int
+    worker: str
+
+
+class JobQueue:
+    """Dauerhafte Jobwarteschlange in einer SQLite-Datei.
+
+    Ein Worker holt sich mit :meth:`claim` einen Job samt Lease (Mietzeit).
+    Laeuft die Lease ab, ohne dass :meth:`heartbeat` sie verlaengert, darf
+    ein anderer Worker den Job uebernehmen. So ueberlebt ein Batch den
+    Absturz einzelner Prozesse oder Rechner. Fuer mehrere Rechner muss die
+    Datei auf einem Dateisystem mit funktionierenden Sperren liegen.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path) if path else job_queue_path()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit-Modus: Transaktionen werden explizit geoeffnet, damit
+        # claim() die Datei mit BEGIN IMMEDIATE exklusiv reservieren kann.
+        self._conn = sqlite3.connect(
+            str(self.path),
+            timeout=60,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "batch TEXT NOT NULL, payload TEXT NOT NULL, "
+            "state TEXT NOT NULL, worker TEXT, lease_until REAL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, "
+            "updated REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_batch_state "
+            "ON jobs (batch, state)"
+        )
+
+    def _transaction(self, sql: str, params: Iterable[Any] = ()) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(sql, tuple(params))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return cursor
+
+    def enqueue(self, batch: str, payloads: Iterable[Dict[str, Any]]) -> int:
+        now = self._clock()
+        rows = [
+            (batch, json.dumps(p, ensure_ascii=False), PENDING, now)
+            for p in payloads
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO jobs (batch, payload, state, updated) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def claim(self, worker: str, batch: str) -> Optional[ClaimedJob]:
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire(batch, now)
+                row = self._conn.execute(
+                    "SELECT id, payload, attempts FROM jobs "
+                    "WHERE batch = ? AND (state = ? OR "
+                    "(state = ? AND lease_until < ?)) "
+                    "ORDER BY id LIMIT 1",
+                    (batch, PENDING, RUNNING, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                job_id, payload, attempts = row
+                attempts += 1
+                self._conn.execute(
+                    "UPDATE jobs SET state = ?, worker = ?, lease_until = ?, "
+                    "attempts = ?, updated = ? WHERE id = ?",
+                    (
+                        RUNNING,
+                        worker,
+                        now + self.lease_seconds,
+                        attempts,
+                        now,
+                        job_id,
+                    ),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return ClaimedJob(job_id, batch, json.loads(payload), attempts, worker)
+
+    def _expire(self, batch: str, now: float) -> None:
+        # Abgelaufene Leases ohne verbleibende Versuche gelten als gescheitert.
+        self._conn.execute(
+            "UPDATE jobs SET state = ?, result = ?, updated = ? "
+            "WHERE batch = ? AND state = ? AND lease_until < ? "
+            "AND attempts >= ?",
+            (
+                FAILED,
+                json.dumps({"ok": False, "error": "Lease abgelaufen"}),
+                now,
+                batch,
+                RUNNING,
+                now,
+                self.max_attempts,
+            ),
+        )
+
+    def requeue_expired(self, batch: str) -> int:
+        now = self._clock()
+        cursor = self._transaction(
+            "UPDATE jobs SET state = ?, worker = NULL, lease_until = NULL, "
+            "updated = ? WHERE batch = ? AND state = ? AND lease_until < ? "
+            "AND attempts < ?",
+            (PENDING, now, batch, RUNNING, now, self.max_attempts),
+        )
+        return cursor.rowcount
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        now = self._clock()
+        cursor = self._transaction(
+            "UPDATE jobs SET lease_until = ?, updated = ? "
+            "WHERE id = ? AND worker = ? AND state = ?",
+            (now + self.lease_seconds, now, job_id, worker, RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    def complete(
+        self,
+        job_id: int,
+        worker: str,
+        result: Dict[str, Any],
+        ok: bool = True,
+    ) -> bool:
+        cursor = self._transaction(
+            "UPDATE jobs SET state = ?, result = ?, lease_until = NULL, "
+            "updated = ? WHERE id = ? AND worker = ? AND state = ?",
+            (
+                DONE if ok else FAILED,
+                json.dumps(result, ensure_ascii=False),
+                self._clock(),
+                job_id,
+                worker,
+                RUNNING,
+            ),
+        )
+        return cursor.rowcount == 1
+
+    def counts(self, batch: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM jobs WHERE batch = ? "
+                "GROUP BY state",
+                (batch,),
+            ).fetchall()
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update({state: count for state, count in rows})
+        return counts
+
+    def results(self, batch: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM jobs WHERE batch = ? "
+                "AND state IN (?, ?) ORDER BY id",
+                (batch, DONE, FAILED),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows if row[0]]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LeaseKeeper:
+    """Verlaengert die Lease eines Jobs im Hintergrund, solange er laeuft."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        job: ClaimedJob,
+        on_lost: Optional[Callable[[], None]] = None,
+    ):
+        self.queue = queue
+        self.job = job
+        self.on_lost = on_lost
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            try:
+                alive = self.queue.heartbeat(self.job.id, self.job.worker)
+            except sqlite3.Error:
+                continue
+            if not alive:
+                self.lost = True
+                if self.on_lost is not None:
+                    self.on_lost()
+                return
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import (
+    Callable,
+    Deque,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class LiveQueue(Generic[T]):
+    """Warteschlange, die waehrend eines laufenden Stapels weiter waechst.
+
+    Mehrere Worker holen sich mit :meth:`take` den naechsten Job; neue Jobs
+    koennen jederzeit angehaengt, wartende entfernt oder vorgezogen werden.
+    Eintraege werden ueber ihre Identitaet verglichen (``is``), damit auch
+    nicht hashbare Objekte wie ``PairItem`` funktionieren.
+
+    Mit ``close_when_idle`` schliesst sich die Schlange selbst, sobald sie
+    leer ist und kein Worker mehr arbeitet; sonst erst mit :meth:`close`.
+    Mit ``key`` bleiben wartende Jobs aufsteigend sortiert, auch neu
+    angehaengte; vorgezogene Jobs stehen trotzdem vorn.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[T] = (),
+        close_when_idle: bool = True,
+        key: Optional[Callable[[T], float]] = None,
+    ):
+        self.close_when_idle = close_when_idle
+        self._key = key
+        self._items: Deque[T] = deque(
+            sorted(items, key=key) if key is not None else items
+        )
+        # So viele Jobs am Anfang wurden per move_to_front vorgezogen.
+        self._pinned = 0
+        self._cond = threading.Condition()
+        self._busy = 0
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        with self._cond:
+            return self._closed
+
+    def set_close_when_idle(self, value: bool) -> None:
+        """Umschalten im Lauf: ``True`` beendet den Stapel nach dem letzten
+        laufenden Job, statt weiter auf neue zu warten."""
+        with self._cond:
+            self.close_when_idle = value
+            self._cond.notify_all()
+
+    def put(self, item: T) -> bool:
+        return self.extend([item]) == 1
+
+    def extend(self, items: Iterable[T]) -> int:
+        """Haengt Jobs hinten an; eine geschlossene Schlange nimmt nichts."""
+        with self._cond:
+            if self._closed:
+                return 0
+            before = len(self._items)
+            for item in items:
+                self._insert(item)
+            added = len(self._items) - before
+            if added:
+                self._cond.notify(added)
+            return added
+
+    def take(self) -> Optional[T]:
+        """Naechster Job; blockiert, bis einer da ist. None = Schluss.
+
+        Nach jedem Job muss der Worker :meth:`done` aufrufen.
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                if self._items:
+                    self._busy += 1
+                    self._pinned = max(0, self._pinned - 1)
+                    return self._items.popleft()
+                if self.close_when_idle and self._busy == 0:
+                    self._close_locked()
+                    return None
+                self._cond.wait()
+
+    def done(self) -> None:
+        with self._cond:
+            self._busy = max(0, self._busy - 1)
+            if self._busy == 0 and not self._items:
+                # Wartende Worker pruefen, ob der Stapel jetzt fertig ist.
+                self._cond.notify_all()
+
+    def cancel(self, item: T) -> bool:
+        """Entfernt einen noch wartenden Job; laufende bleiben unberuehrt."""
+        with self._cond:
+            index = self._index(item)
+            if index < 0:
+                return False
+            del self._items[index]
+            if index < self._pinned:
+                self._pinned -= 1
+            if not self._items and self._busy == 0:
+                self._cond.notify_all()
+            return True
+
+    def move_to_front(self, item: T) -> bool:
+        """Zieht einen wartenden Job vor, er wird als Naechstes vergeben."""
+        with self._cond:
+            index = self._index(item)
+            if index < 0:
+                return False
+            del self._items[index]
+            self._items.appendleft(item)
+            if index >= self._pinned:
+                self._pinned += 1
+            return True
+
+    def is_pending(self, item: T) -> bool:
+        with self._cond:
+            return self._index(item) >= 0
+
+    def pending(self) -> List[T]:
+        with self._cond:
+            return list(self._items)
+
+    def close(self) -> None:
+        """Keine neuen Jobs mehr vergeben; wartende Worker kehren zurueck."""
+        with self._cond:
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        self._closed = True
+        self._cond.notify_all()
+
+    def _insert(self, item: T) -> None:
+        if self._key is None:
+            self._items.append(item)
+            return
+        value = self._key(item)
+        # Hinter gleich teure Jobs, damit die Reihenfolge stabil bleibt.
+        for index in range(self._pinned, len(self._items)):
+            if self._key(self._items[index]) > value:
+                self._items.insert(index, item)
+                return
+        self._items.append(item)
+
+    def _index(self, item: T) -> int:
+        for index, queued in enumerate(self._items):
+            if queued is item:
+                return index
+        return -1
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import subprocess
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from .audio_copy import AudioDecision
+from .media_info import probe_media
+from .paths import cache_dir
+from .probe_cache import ProbeCache, file_key
+
+LOGGER = logging.getLogger("VideoBatchTool.loudness")
+
+LOUDNESS_CACHE_FILE = "loudness_cache.sqlite3"
+# Zielwerte wie bisher bei --audio-normalize (EBU R128, Sprache/Musik).
+TARGET_I = -16.0
+TARGET_LRA = 11.0
+TARGET_TP = -1.5
+# loudnorm gibt intern 192 kHz aus; ohne Angabe der Quelle wird es 48 kHz.
+DEFAULT_SAMPLE_RATE = 48000
+_JSON_BLOCK = re.compile(r"\{[^{}]*\}", re.S)
+
+Runner = Callable[[List[str]], "subprocess.CompletedProcess[str]"]
+
+
+@dataclass(frozen=True)
+class LoudnessMeasurement:
+    input_i: float
+    input_lra: float
+    input_tp: float
+    input_thresh: float
+    target_offset: float
+
+
+def loudness_cache_path() -> Path:
+    return cache_dir() / LOUDNESS_CACHE_FILE
+
+
+_DEFAULT_CACHE: Optional[ProbeCache] = None
+
+
+def default_loudness_cache() -> ProbeCache:
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = ProbeCache(loudness_cache_path())
+    return _DEFAULT_CACHE
+
+
+def _targets() -> str:
+    return f"I={TARGET_I:g}:LRA={TARGET_LRA:g}:TP={TARGET_TP:g}"
+
+
+def one_pass_filter() -> str:
+    return f"loudnorm={_targets()}"
+
+
+def measure_command(audio: str) -> List[str]:
+    return [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        audio,
+        "-vn",
+        "-af",
+        f"{one_pass_filter()}:print_format=json",
+        "-f",
+        "null",
+        "-",
+    ]
+
+
+def parse_measurement(output: str) -> Optional[LoudnessMeasurement]:
+    """Liest den JSON-Block, den loudnorm am Ende der Analyse ausgibt.
+
+    Stille liefert ``-inf``; dann gibt es nichts anzugleichen (None).
+    """
+    blocks = _JSON_BLOCK.findall(output or "")
+    if not blocks:
+        return None
+    try:
+        data = json.loads(blocks[-1])
+        values = {
+            f.name: float(data[f.name]) for f in fields(LoudnessMeasurement)
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not all(math.isfinite(v) for v in values.values()):
+        return None
+    return LoudnessMeasurement(**values)
+
+
+def _run(cmd: List[str]) -> "subprocess.CompletedProcess[str]":
+    return subprocess.run(
+        cmd, capture_output=True, text=True, encoding="utf-8", errors="replace"
+    )
+
+
+def measure_loudness(
+    audio: str,
+    cache: Optional[ProbeCache] = None,
+    runner: Optional[Runner] = None,
+) -> Optional[LoudnessMeasurement]:
+    """Erster Durchgang: misst eine Datei genau einmal.
+
+    Das Ergebnis liegt dauerhaft im Cache (Pfad, Groesse, mtime); weitere
+    Kodierungen derselben Datei, auch mehrere Aufloesungsstufen, lesen nur
+    noch die Messwerte.
+    """
+    run = runner or _run
+    cache = cache or default_loudness_cache()
+    targets = _targets()
+    key = file_key(audio)
+    values = cache.get(key) if key is not None else None
+    if values is None or values.get("targets") != targets:
+        try:
+            result = run(measure_command(audio))
+        except OSError as exc:
+            LOGGER.warning(
+                "Lautheitsmessung fehlgeschlagen (%s): %s", audio, exc
+            )
+            return None
+        if result.returncode != 0:
+            LOGGER.warning("Lautheit nicht messbar: %s", audio)
+            return None
+        measurement = parse_measurement(result.stderr or "")
+        # Auch Stille wird gemerkt, damit sie nicht erneut analysiert wird.
+        values = {"targets": targets, "silent": measurement is None}
+        if measurement is not None:
+            values.update(asdict(measurement))
+        if key is not None:
+            cache.put(key, values)
+    if values.get("silent"):
+        return None
+    known = {f.name for f in fields(LoudnessMeasurement)}
+    return LoudnessMeasurement(
+        **{k: v for k, v in values.items() if k in known}
+    )
+
+
+def loudnorm_filter(
+    measurement: LoudnessMeasurement, sample_rate: int = 0
+) -> str:
+    """Zweiter Durchgang: lineare Angleichung mit den gemessenen Werten."""
+    return (
+        f"{one_pass_filter()}"
+        f":measured_I={measurement.input_i:.2f}"
+        f":measured_LRA={measurement.input_lra:.2f}"
+        f":measured_TP={measurement.input_tp:.2f}"
+        f":measured_thresh={measurement.input_thresh:.2f}"
+        f":offset={measurement.target_offset:.2f}"
+        f":linear=true,aresample={sample_rate or DEFAULT_SAMPLE_RATE}"
+    )
+
+
+def normalize_filter(
+    audio: str,
+    cache: Optional[ProbeCache] = None,
+    runner: Optional[Runner] = None,
+) -> str:
+    """Audiofilter zur Lautheitsangleichung einer Datei.
+
+    Ohne Messwerte (Fehler, Stille) bleibt es beim einfachen loudnorm.
+    """
+    sample_rate = probe_media(audio).sample_rate
+    measurement = measure_loudness(audio, cache, runner)
+    if measurement is None:
+        return (
+            f"{one_pass_filter()},"
+            f"aresample={sample_rate or DEFAULT_SAMPLE_RATE}"
+        )
+    return loudnorm_filter(measurement, sample_rate)
+
+
+def with_loudnorm(
+    decision: AudioDecision, audio: str, runner: Optional[Runner] = None
+) -> AudioDecision:
+    """Haengt die Lautheitsangleichung an eine neu kodierende Audiowahl.
+
+    ``runner`` startet die Messung; die GUI uebergibt einen, der den
+    Prozess registriert, damit Stopp auch die Analyse beendet.
+    """
+    audio_filter = normalize_filter(audio, runner=runner)
+    return replace(decision, args=[*decision.args, "-af", audio_filter])
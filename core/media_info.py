@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+import sys
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Optional
+
+import ffmpeg
+
+from .probe_cache import ProbeCache
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    duration: float = 0.0
+    video_codec: str = ""
+    width: int = 0
+    height: int = 0
+    frame_rate: float = 0.0
+    audio_codec: str = ""
+    audio_profile: str = ""
+    audio_bitrate: int = 0
+    sample_rate: int = 0
+    channels: int = 0
+    channel_layout: str = ""
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _to_int(value: Any) -> int:
+    return int(_to_float(value))
+
+
+def _parse_rate(value: Any) -> float:
+    text = str(value or "")
+    if "/" in text:
+        num, _, den = text.partition("/")
+        den_value = _to_float(den)
+        return _to_float(num) / den_value if den_value else 0.0
+    return _to_float(text)
+
+
+def media_info_from_probe(payload: Dict[str, Any]) -> MediaInfo:
+    fmt = payload.get("format", {}) or {}
+    streams = payload.get("streams", []) or []
+    video: Dict[str, Any] = next(
+        (s for s in streams if s.get("codec_type") == "video"),
+        {},
+    )
+    audio: Dict[str, Any] = next(
+        (s for s in streams if s.get("codec_type") == "audio"),
+        {},
+    )
+    duration = _to_float(fmt.get("duration"))
+    if not duration:
+        duration = _to_float(audio.get("duration"))
+    return MediaInfo(
+        duration=duration,
+        video_codec=str(video.get("codec_name", "")),
+        width=_to_int(video.get("width")),
+        height=_to_int(video.get("height")),
+        frame_rate=_parse_rate(
+            video.get("avg_frame_rate") or video.get("r_frame_rate")
+        ),
+        audio_codec=str(audio.get("codec_name", "")),
+        audio_profile=str(audio.get("profile", "")),
+        audio_bitrate=_to_int(audio.get("bit_rate")),
+        sample_rate=_to_int(audio.get("sample_rate")),
+        channels=_to_int(audio.get("channels")),
+        channel_layout=str(audio.get("channel_layout", "")),
+    )
+
+
+PROBE_WORKERS_MIN = 2
+PROBE_WORKERS_MAX = 8
+
+_DEFAULT_CACHE: Optional[ProbeCache] = None
+
+
+def default_probe_cache() -> ProbeCache:
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = ProbeCache()
+    return _DEFAULT_CACHE
+
+
+def probe_worker_count(cpu_count: Optional[int] = None) -> int:
+    # ffprobe wartet ueberwiegend auf I/O, daher etwas ueber der Kernzahl,
+    # aber gedeckelt, damit Netzlaufwerke nicht ueberlastet werden.
+    cpus = cpu_count if cpu_count is not None else (os.cpu_count() or 1)
+    return max(PROBE_WORKERS_MIN, min(PROBE_WORKERS_MAX, cpus))
+
+
+def _probe_fields(path: str) -> Dict[str, Any]:
+    try:
+        return asdict(media_info_from_probe(ffmpeg.probe(path)))
+    except Exception as e:
+        print("Fehler beim Prüfen der Mediendatei:", e, file=sys.stderr)
+    return {}
+
+
+def probe_media(path: str, cache: Optional[ProbeCache] = None) -> MediaInfo:
+    values = (cache or default_probe_cache()).lookup(path, _probe_fields)
+    known = {f.name for f in fields(MediaInfo)}
+    return MediaInfo(**{k: v for k, v in values.items() if k in known})
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .paths import cache_dir
+from .probe_cache import CacheKey, file_key
+
+LOGGER = logging.getLogger("VideoBatchTool.output_cache")
+
+OUTPUT_CACHE_DIR = "outputs"
+DEFAULT_MAX_BYTES = 20 * 1024**3
+HASH_CHUNK_SIZE = 1024 * 1024
+# Linux-ioctl fuer Reflinks (Copy-on-Write, z.B. Btrfs/XFS).
+FICLONE = 0x40049409
+# Argumente ohne Einfluss auf das Ergebnis.
+VOLATILE_ARGS = frozenset({"-y", "-n", "-nostats", "-hide_banner"})
+# Leere Begleitdatei je Eintrag; ihre mtime gilt als "zuletzt benutzt".
+USED_SUFFIX = ".used"
+
+
+def output_cache_dir() -> Path:
+    return cache_dir() / OUTPUT_CACHE_DIR
+
+
+def normalize_command(
+    cmd: Sequence[Any], placeholders: Mapping[str, str]
+) -> List[str]:
+    """Ersetzt Pfade durch Platzhalter, damit nur die Einstellungen zaehlen."""
+    normalized: List[str] = []
+    skip_next = False
+    for raw in cmd[1:]:
+        arg = str(raw)
+        if skip_next:
+            skip_next = False
+            continue
+        if arg in VOLATILE_ARGS:
+            continue
+        if arg == "-progress":
+            skip_next = True
+            continue
+        normalized.append(placeholders.get(arg, arg))
+    return normalized
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with src.open("rb") as s, dst.open("wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+
+def copy_file(src: Path, dst: Path) -> str:
+    """Reflink, sonst Kopie: ``dst`` bekommt immer einen eigenen Inode."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst.unlink(missing_ok=True)
+    if _reflink(src, dst):
+        return "Reflink"
+    shutil.copy2(src, dst)
+    return "Kopie"
+
+
+def link_or_copy(src: Path, dst: Path) -> str:
+    """Hardlink, sonst Reflink, sonst Kopie; gibt die genutzte Art zurueck."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+        return "Hardlink"
+    except OSError:
+        pass
+    return copy_file(src, dst)
+
+
+def unlink_shared(path: Path) -> None:
+    """Loest eine Ausgabe vom Cache, bevor sie ueberschrieben wird.
+
+    ffmpeg ``-y`` kuerzt die Datei an Ort und Stelle; ein Hardlink aus
+    :meth:`OutputCache.fetch` wuerde sonst den Cache-Eintrag zerstoeren.
+    """
+    try:
+        if path.stat().st_nlink > 1:
+            path.unlink()
+    except OSError:
+        pass
+
+
+class OutputCache:
+    """Inhaltsadressierter Speicher fertiger Ausgaben mit LRU-Begrenzung."""
+
+    def __init__(
+        self, root: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.root = root or output_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._digests: Dict[CacheKey, str] = {}
+
+    def content_digest(self, path: str) -> str:
+        key = file_key(path)
+        with self._lock:
+            if key is not None and key in self._digests:
+                return self._digests[key]
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        value = digest.hexdigest()
+        if key is not None:
+            with self._lock:
+                self._digests[key] = value
+        return value
+
+    def key_for(
+        self,
+        inputs: Iterable[str],
+        cmd: Sequence[Any],
+        placeholders: Mapping[str, str],
+    ) -> str:
+        payload = {
+            "inputs": [self.content_digest(p) for p in inputs],
+            "argv": normalize_command(cmd, placeholders),
+        }
+        data = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
+
+    def path_for(self, key: str, suffix: str) -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    @staticmethod
+    def _used_path(cached: Path) -> Path:
+        return cached.with_name(f"{cached.name}{USED_SUFFIX}")
+
+    def _mark_used(self, cached: Path) -> None:
+        # Nicht den Eintrag selbst anfassen: Ausgaben sind oft Hardlinks
+        # darauf, und deren mtime prueft das Journal beim Fortsetzen.
+        self._used_path(cached).touch()
+
+    def fetch(self, key: str, target: Path) -> Optional[str]:
+        cached = self.path_for(key, target.suffix)
+        if not cached.is_file():
+            return None
+        try:
+            self._mark_used(cached)
+            return link_or_copy(cached, target)
+        except OSError as exc:
+            LOGGER.warning("Ausgabe-Cache nicht lesbar: %s", exc)
+            return None
+
+    def store(self, key: str, source: Path) -> None:
+        cached = self.path_for(key, source.suffix)
+        if cached.is_file():
+            return
+        tmp = cached.with_name(f"{cached.name}.part")
+        try:
+            # Kein Hardlink: die Ausgabe des Nutzers kann spaeter
+            # ueberschrieben werden, der Eintrag muss unveraendert bleiben.
+            copy_file(source, tmp)
+            tmp.replace(cached)
+            self._mark_used(cached)
+        except OSError as exc:
+            tmp.unlink(missing_ok=True)
+            LOGGER.warning("Ausgabe-Cache nicht schreibbar: %s", exc)
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Loescht die am laengsten unbenutzten Eintraege ueber dem Limit.
+
+        Eintraege mit weiteren Hardlinks (fertige Ausgaben) belegen keinen
+        eigenen Platz: sie zaehlen nicht mit und bleiben erhalten.
+        """
+        with self._lock:
+            entries = []
+            for path in self.root.glob("*/*"):
+                if path.name.endswith((".part", USED_SUFFIX)):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if stat.st_nlink > 1:
+                    continue
+                try:
+                    used = self._used_path(path).stat().st_mtime
+                except OSError:
+                    used = stat.st_mtime
+                entries.append((used, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                self._used_path(path).unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            return removed
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Set, Tuple
+
+from .utils import linux_safe_stem
+
+# Typische Namenszusaetze, die nur die Rolle der Datei beschreiben:
+# "lied_01_cover.jpg" gehoert zu "lied_01.mp3".
+ROLE_SUFFIXES = frozenset(
+    {
+        "art",
+        "artwork",
+        "audio",
+        "bild",
+        "cover",
+        "final",
+        "folder",
+        "front",
+        "image",
+        "img",
+        "master",
+        "musik",
+        "song",
+        "thumb",
+        "thumbnail",
+        "ton",
+        "track",
+    }
+)
+# Unterhalb dieser Aehnlichkeit (Dice ueber Trigramme) wird nicht gepaart.
+MIN_CONFIDENCE = 0.55
+# Nur die Nummer stimmt ueberein, der Name nicht.
+NUMBER_CONFIDENCE = 0.5
+# Trigramme, die in sehr vielen Namen vorkommen ("tra", "ck_"), sagen
+# nichts aus und wuerden die Suche quadratisch machen.
+MAX_POSTING_SHARE = 0.2
+MIN_POSTING_LIMIT = 50
+_TOKENS = re.compile(r"\d+|[a-z]+")
+
+
+@dataclass(frozen=True)
+class NameKey:
+    text: str
+    numbers: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class PairMatch:
+    image: str
+    audio: str
+    confidence: float
+
+
+@dataclass
+class PairingResult:
+    matches: List[PairMatch] = field(default_factory=list)
+    unmatched_images: List[str] = field(default_factory=list)
+    unmatched_audios: List[str] = field(default_factory=list)
+
+    @property
+    def fuzzy(self) -> int:
+        return sum(1 for m in self.matches if m.confidence < 1.0)
+
+
+def name_key(path: str) -> NameKey:
+    """Vergleichbarer Name: klein, ohne Rollen-Zusatz, Zahlen ohne Nullen.
+
+    "Lied 01 (Cover).JPG" und "lied_1.mp3" ergeben denselben Schluessel.
+    """
+    # os.path statt Path: bei zehntausenden Namen spuerbar schneller.
+    stem = os.path.splitext(os.path.basename(path))[0]
+    tokens = _TOKENS.findall(linux_safe_stem(stem, ""))
+    while len(tokens) > 1 and tokens[-1] in ROLE_SUFFIXES:
+        tokens.pop()
+    tokens = [str(int(t)) if t.isdigit() else t for t in tokens]
+    numbers = tuple(int(t) for t in tokens if t.isdigit())
+    return NameKey("_".join(tokens), numbers)
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def pair_by_name(
+    images: Sequence[str],
+    audios: Sequence[str],
+    min_confidence: float = MIN_CONFIDENCE,
+) -> PairingResult:
+    """Paart Bilder und Audios ueber ihre Namen statt ueber die Position.
+
+    Zuerst gleiche Schluessel ueber ein Hash-Verzeichnis (Sicherheit 1.0),
+    danach fuer den Rest die aehnlichsten Namen ueber ein Trigramm-
+    Verzeichnis (unterschiedliche Nummern schliessen ein Paar aus),
+    zuletzt eindeutige gleiche Nummern. Ergebnis in Bildreihenfolge.
+    """
+    audio_keys = [name_key(a) for a in audios]
+    by_key: Dict[str, List[int]] = defaultdict(list)
+    for index in reversed(range(len(audios))):
+        by_key[audio_keys[index].text].append(index)
+    found: Dict[int, Tuple[int, float]] = {}
+    open_images: List[int] = []
+    image_keys = [name_key(i) for i in images]
+    for index, key in enumerate(image_keys):
+        bucket = by_key.get(key.text)
+        if bucket:
+            found[index] = (bucket.pop(), 1.0)
+        else:
+            open_images.append(index)
+    open_audios = sorted(i for bucket in by_key.values() for i in bucket)
+    if open_images and open_audios:
+        found.update(
+            _fuzzy_matches(
+                [(i, image_keys[i]) for i in open_images],
+                [(i, audio_keys[i]) for i in open_audios],
+                min_confidence,
+            )
+        )
+        taken = {audio_index for audio_index, _ in found.values()}
+        found.update(
+            _number_matches(
+                [(i, image_keys[i]) for i in open_images if i not in found],
+                [(i, audio_keys[i]) for i in open_audios if i not in taken],
+            )
+        )
+    result = PairingResult()
+    used: Set[int] = set()
+    for index, image in enumerate(images):
+        if index in found:
+            audio_index, confidence = found[index]
+            used.add(audio_index)
+            result.matches.append(
+                PairMatch(image, audios[audio_index], round(confidence, 3))
+            )
+        else:
+            result.unmatched_images.append(image)
+    result.unmatched_audios = [
+        audio for index, audio in enumerate(audios) if index not in used
+    ]
+    return result
+
+
+def _fuzzy_matches(
+    images: List[Tuple[int, NameKey]],
+    audios: List[Tuple[int, NameKey]],
+    min_confidence: float,
+) -> Dict[int, Tuple[int, float]]:
+    grams = {index: trigrams(key.text) for index, key in audios}
+    postings: Dict[str, List[int]] = defaultdict(list)
+    by_numbers: Dict[Tuple[int, ...], List[int]] = defaultdict(list)
+    for index, key in audios:
+        by_numbers[key.numbers].append(index)
+        for gram in grams[index]:
+            postings[gram].append(index)
+    limit = max(MIN_POSTING_LIMIT, int(len(audios) * MAX_POSTING_SHARE))
+    candidates: List[Tuple[float, int, int]] = []
+    for image_index, key in images:
+        own = trigrams(key.text)
+        shared: Counter = Counter()
+        if key.numbers:
+            # Nummern muessen gleich sein: nur diese wenigen Audios pruefen.
+            for audio_index in by_numbers.get(key.numbers, ()):
+                shared[audio_index] = len(own & grams[audio_index])
+        else:
+            for gram in own:
+                posting = postings.get(gram, ())
+                if len(posting) <= limit:
+                    shared.update(posting)
+        for audio_index, count in shared.items():
+            score = 2 * count / (len(own) + len(grams[audio_index]))
+            if score >= min_confidence:
+                candidates.append((score, image_index, audio_index))
+    return _assign(candidates)
+
+
+def _number_matches(
+    images: List[Tuple[int, NameKey]], audios: List[Tuple[int, NameKey]]
+) -> Dict[int, Tuple[int, float]]:
+    """Letzter Versuch: "IMG_0007.jpg" zu "Aufnahme 7.m4a", wenn die
+    Nummer auf beiden Seiten nur einmal vorkommt."""
+
+    def _unique(entries: List[Tuple[int, NameKey]]) -> Dict[tuple, int]:
+        seen: Dict[tuple, List[int]] = defaultdict(list)
+        for index, key in entries:
+            if key.numbers:
+                seen[key.numbers].append(index)
+        return {k: v[0] for k, v in seen.items() if len(v) == 1}
+
+    audio_numbers = _unique(audios)
+    return {
+        image_index: (audio_numbers[numbers], NUMBER_CONFIDENCE)
+        for numbers, image_index in _unique(images).items()
+        if numbers in audio_numbers
+    }
+
+
+def _assign(
+    candidates: List[Tuple[float, int, int]],
+) -> Dict[int, Tuple[int, float]]:
+    # Beste Aehnlichkeit zuerst; jedes Audio nur einmal vergeben.
+    candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+    taken: Set[int] = set()
+    result: Dict[int, Tuple[int, float]] = {}
+    for score, image_index, audio_index in candidates:
+        if image_index in result or audio_index in taken:
+            continue
+        result[image_index] = (audio_index, score)
+        taken.add(audio_index)
+    return result
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+ENCODE = "encode"
+COPY = "copy"
+
+# Unter/ueber diesem Verhaeltnis Last/Kerne wird hoch- bzw. runtergeregelt.
+UNDERLOAD_RATIO = 0.75
+OVERLOAD_RATIO = 1.25
+# Mehr Jobs lohnen nur, wenn der Gesamtdurchsatz spuerbar steigt.
+MIN_GAIN = 1.05
+ADJUST_INTERVAL = 15.0
+MAX_COPY_JOBS = 8
+
+
+def job_kind(cmd: Sequence[object]) -> str:
+    """Reine Stream-Kopie (kein Video-Encoder) oder echte Kodierung."""
+    args = [str(a) for a in cmd]
+    for i, arg in enumerate(args[:-1]):
+        if arg in ("-c:v", "-vcodec", "-codec:v"):
+            return COPY if args[i + 1] == "copy" else ENCODE
+    return ENCODE
+
+
+_VIDEO_CODEC_ARGS = ("-c:v", "-vcodec", "-codec:v")
+
+
+def with_thread_args(cmd: List[str], threads: int) -> List[str]:
+    """Begrenzt die Threads jedes Video-Encoders im Befehl.
+
+    ``-threads`` steht direkt hinter jeder ``-c:v``-Angabe und gilt so fuer
+    genau diesen Encoder, auch bei mehreren Ausgaben oder dem tee-Muxer.
+    Ohne Encoder-Angabe bleibt es eine Option der letzten Ausgabe.
+    """
+    if threads <= 0 or "-threads" in cmd or len(cmd) < 2:
+        return list(cmd)
+    result: List[str] = []
+    placed = False
+    args = list(cmd)
+    for i, arg in enumerate(args):
+        result.append(arg)
+        if i > 0 and args[i - 1] in _VIDEO_CODEC_ARGS and arg != "copy":
+            result += ["-threads", str(threads)]
+            placed = True
+    if placed:
+        return result
+    return [*args[:-1], "-threads", str(threads), args[-1]]
+
+
+def _default_load() -> Optional[float]:
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+
+class AdaptiveScheduler:
+    """Vergibt Job-Slots und ``-threads`` passend zur Rechnerauslastung.
+
+    ``fixed > 0`` entspricht der bisherigen festen Parallelitaet, verteilt
+    die Kerne aber auf die Jobs. ``fixed == 0`` startet mit wenigen
+    Kodierungen und regelt anhand der Systemlast und des gemessenen
+    Gesamtdurchsatzes (Summe der ffmpeg-``speed``-Werte) nach. Kopierjobs
+    belasten kaum die CPU und haben ein eigenes, hoeheres Limit.
+    """
+
+    def __init__(
+        self,
+        fixed: int = 0,
+        cpus: Optional[int] = None,
+        load: Callable[[], Optional[float]] = _default_load,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.cpus = max(1, cpus or os.cpu_count() or 1)
+        self.fixed = max(0, fixed)
+        self._load = load
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._running: Dict[str, int] = {ENCODE: 0, COPY: 0}
+        # None: Job hat noch kein Tempo gemeldet (z. B. Abschnitte ohne
+        # -progress); er zaehlt dann nicht zur Durchsatzmessung.
+        self._speeds: Dict[int, Optional[float]] = {}
+        self._next_token = 0
+        if self.fixed:
+            self.max_encode = self.fixed
+            self.max_copy = self.fixed
+            self.encode_target = self.fixed
+        else:
+            self.max_encode = max(1, self.cpus // 2)
+            self.max_copy = max(2, min(MAX_COPY_JOBS, self.cpus))
+            self.encode_target = max(1, self.cpus // 4)
+        self._ceiling = self.max_encode
+        self._last_adjust = clock()
+        self._last_throughput: Optional[float] = None
+        self._last_step = 0
+
+    @property
+    def max_concurrency(self) -> int:
+        if self.fixed:
+            return self.fixed
+        return self.max_encode + self.max_copy
+
+    def threads_for(self, kind: str) -> int:
+        if kind == COPY:
+            return 0
+        return max(1, self.cpus // max(1, self.encode_target))
+
+    def _has_slot(self, kind: str) -> bool:
+        if self.fixed:
+            return sum(self._running.values()) < self.fixed
+        if kind == COPY:
+            return self._running[COPY] < self.max_copy
+        return self._running[ENCODE] < self.encode_target
+
+    def acquire(
+        self, kind: str, stop: Optional[threading.Event] = None
+    ) -> Optional[int]:
+        """Wartet auf einen Slot; liefert ein Token oder None bei Abbruch."""
+        with self._cond:
+            while not self._has_slot(kind):
+                if stop is not None and stop.is_set():
+                    return None
+                self._cond.wait(timeout=0.5)
+                self._maybe_adjust()
+            self._running[kind] += 1
+            self._next_token += 1
+            token = self._next_token
+            if kind == ENCODE:
+                self._speeds[token] = None
+            return token
+
+    def report_speed(self, token: int, speed: float) -> None:
+        with self._cond:
+            if token in self._speeds:
+                self._speeds[token] = speed
+            self._maybe_adjust()
+
+    def release(self, token: int, kind: str) -> None:
+        with self._cond:
+            self._running[kind] = max(0, self._running[kind] - 1)
+            self._speeds.pop(token, None)
+            self._cond.notify_all()
+
+    def _maybe_adjust(self) -> None:
+        if self.fixed:
+            return
+        now = self._clock()
+        if now - self._last_adjust < ADJUST_INTERVAL:
+            return
+        self._last_adjust = now
+        load = self._load()
+        speeds = [v for v in self._speeds.values() if v is not None]
+        # Nur vergleichen, wenn jede laufende Kodierung ihr Tempo meldet;
+        # stumme Jobs sahen sonst wie ein Einbruch des Durchsatzes aus.
+        throughput: Optional[float] = (
+            sum(speeds)
+            if self._speeds and len(speeds) == len(self._speeds)
+            else None
+        )
+        busy = self._running[ENCODE] >= self.encode_target
+        if (
+            self._last_step > 0
+            and busy
+            and throughput is not None
+            and self._last_throughput is not None
+        ):
+            if throughput < self._last_throughput * MIN_GAIN:
+                # Der letzte zusaetzliche Job hat nichts gebracht.
+                self._ceiling = max(1, self.encode_target - 1)
+                self.encode_target = self._ceiling
+                self._last_step = -1
+                self._last_throughput = throughput
+                return
+        ratio = load / self.cpus if load is not None else None
+        if ratio is not None and ratio > OVERLOAD_RATIO:
+            if self.encode_target > 1:
+                self.encode_target -= 1
+                self._last_step = -1
+        elif (
+            busy
+            and (ratio is None or ratio < UNDERLOAD_RATIO)
+            and self.encode_target < min(self._ceiling, self.max_encode)
+        ):
+            self.encode_target += 1
+            self._last_step = 1
+            self._cond.notify_all()
+        else:
+            self._last_step = 0
+        self._last_throughput = throughput
+
+    def describe(self) -> str:
+        if self.fixed:
+            return (
+                f"fest {self.fixed} Jobs, "
+                f"{self.threads_for(ENCODE)} Threads je Kodierung"
+            )
+        return (
+            f"automatisch: {self.encode_target}–{self.max_encode} "
+            f"Kodierungen, bis zu {self.max_copy} Kopierjobs"
+        )
@@ -67,6 +67,12 @@ class PluginManager:
                 )
         return current_payload
 
+    def has_hook(self, hook_name: str) -> bool:
+        return any(
+            callable(getattr(module, hook_name, None))
+            for module in self._modules
+        )
+
     @property
     def loaded_plugins(self) -> Iterable[str]:
         for module in self._modules:
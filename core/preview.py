@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .paths import work_dir
+from .segments import clip_timeline, write_list
+
+PREVIEW_DIR = "preview"
+PREVIEW_SECONDS = 10.0
+PREVIEW_MAX_HEIGHT = 360
+PREVIEW_PRESET = "ultrafast"
+# Nur zum Pruefen von Bildausschnitt und Pegel; Qualitaet ist Nebensache.
+PREVIEW_CRF = 32
+# Eingaben mit diesen Optionen sind Standbilder: dort ist jede Stelle gleich.
+_LOOP_OPTIONS = ("-loop", "-stream_loop")
+
+
+@dataclass(frozen=True)
+class PreviewSpec:
+    seconds: float = PREVIEW_SECONDS
+    windows: int = 1
+
+
+def preview_dir() -> Path:
+    return work_dir() / PREVIEW_DIR
+
+
+def reset_preview_dir(root: Optional[Path] = None) -> Path:
+    """Wegwerf-Ordner: alte Vorschauen werden bei jedem Lauf geloescht."""
+    root = root or preview_dir()
+    shutil.rmtree(root, ignore_errors=True)
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def preview_size(
+    width: int, height: int, max_height: int = PREVIEW_MAX_HEIGHT
+) -> Tuple[int, int]:
+    if height <= max_height:
+        return width, height
+    scaled = round(width * max_height / height)
+    return max(2, scaled - scaled % 2), max_height
+
+
+def preview_settings(settings: Dict[str, Any], root: Path) -> Dict[str, Any]:
+    """Batch-Einstellungen fuer die Vorschau: klein, schnell, ohne Ablage."""
+    width, height = preview_size(
+        int(settings.get("width", 1920)), int(settings.get("height", 1080))
+    )
+    return {
+        **settings,
+        "out_dir": str(root),
+        "width": width,
+        "height": height,
+        "preset": PREVIEW_PRESET,
+        "crf": max(int(settings.get("crf", 0)), PREVIEW_CRF),
+        "resume": False,
+        "output_cache": False,
+        "segmented": False,
+        "renditions": "",
+    }
+
+
+def preview_windows(
+    duration: float, spec: PreviewSpec
+) -> List[Tuple[float, float]]:
+    """Start und Laenge der Ausschnitte, gleichmaessig ueber die Laufzeit."""
+    seconds = max(0.1, spec.seconds)
+    if duration <= 0:
+        return [(0.0, seconds)]
+    if duration <= seconds or spec.windows <= 1:
+        return [(0.0, min(seconds, duration))]
+    count = min(spec.windows, max(1, int(duration // seconds)))
+    if count == 1:
+        return [(0.0, seconds)]
+    step = (duration - seconds) / (count - 1)
+    return [(round(i * step, 3), seconds) for i in range(count)]
+
+
+def read_concat_list(path: Path) -> List[Tuple[str, Optional[float]]]:
+    entries: List[Tuple[str, Optional[float]]] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line.startswith("file "):
+            name = line[5:].strip()
+            if len(name) >= 2 and name[0] == name[-1] == "'":
+                name = name[1:-1]
+            entries.append((name.replace("\\'", "'"), None))
+        elif line.startswith("duration ") and entries:
+            entries[-1] = (entries[-1][0], float(line[9:]))
+    return entries
+
+
+def window_command(
+    cmd: Sequence[str],
+    start: float,
+    seconds: float,
+    target: str,
+    root: Path,
+) -> List[str]:
+    """Schneidet einen fertigen Batch-Befehl auf einen Ausschnitt zu.
+
+    Eingaben springen per ``-ss`` an den Start; Standbild-Schleifen bleiben
+    unveraendert. Concat-Listen (Slideshows) enthalten je Bild nur ein
+    Einzelbild, in das ffmpeg nicht springen kann: sie werden stattdessen
+    auf das Zeitfenster gekuerzt. ``-t`` vor dem Ziel ersetzt eine
+    Laengenangabe des Befehls (ffmpeg nutzt die letzte); ``-shortest``
+    entfaellt, weil es bei duennen Bildfolgen zu frueh abbricht.
+    """
+    args = [str(a) for a in cmd[:-1] if str(a) != "-shortest"]
+    result: List[str] = []
+    group: List[str] = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg != "-i" or i + 1 >= len(args):
+            result.append(arg)
+            group.append(arg)
+            i += 1
+            continue
+        source = args[i + 1]
+        if start > 0 and "concat" in group:
+            entries = read_concat_list(Path(source))
+            source = str(
+                write_list(clip_timeline(entries, start, seconds), root)
+            )
+        elif start > 0 and not any(opt in group for opt in _LOOP_OPTIONS):
+            result += ["-ss", f"{start:.3f}"]
+        result += ["-i", source]
+        group = []
+        i += 2
+    return [*result, "-t", f"{seconds:.3f}", target]
+
+
+def join_command(clips: Sequence[Path], root: Path, target: str) -> List[str]:
+    list_path = write_list([(str(clip), None) for clip in clips], root)
+    return [
+        "ffmpeg",
+        "-y",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(list_path),
+        "-c",
+        "copy",
+        "-movflags",
+        "+faststart",
+        target,
+    ]
+
+
+def render_preview(
+    cmd: Sequence[str],
+    duration: float,
+    spec: PreviewSpec,
+    runner: Callable[[List[str]], int],
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """Rendert die Ausschnitte eines Batch-Befehls zu einer Vorschau."""
+    windows = preview_windows(duration, spec)
+    output = Path(str(cmd[-1]))
+    root = output.parent
+    if len(windows) == 1:
+        start, seconds = windows[0]
+        return runner(window_command(cmd, start, seconds, str(output), root))
+    clips: List[Path] = []
+    try:
+        for n, (start, seconds) in enumerate(windows):
+            clip = output.with_name(f"{output.stem}_{n}.mp4")
+            code = runner(window_command(cmd, start, seconds, str(clip), root))
+            if code != 0:
+                return code
+            clips.append(clip)
+            if on_progress is not None:
+                on_progress(len(clips), len(windows))
+        return runner(join_command(clips, root, str(output)))
+    finally:
+        for clip in clips:
+            clip.unlink(missing_ok=True)
+
+
+def open_file(path: Path) -> bool:
+    """Oeffnet die Vorschau im Standardprogramm des Systems."""
+    try:
+        if sys.platform.startswith("win"):
+            os.startfile(str(path))  # type: ignore[attr-defined]
+        elif sys.platform == "darwin":
+            subprocess.Popen(["open", str(path)])
+        else:
+            subprocess.Popen(
+                ["xdg-open", str(path)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .paths import cache_dir
+
+LOGGER = logging.getLogger("VideoBatchTool.probe_cache")
+
+PROBE_CACHE_FILE = "probe_cache.sqlite3"
+
+CacheKey = Tuple[str, int, int]
+
+
+def probe_cache_path() -> Path:
+    return cache_dir() / PROBE_CACHE_FILE
+
+
+def file_key(path: str) -> Optional[CacheKey]:
+    try:
+        resolved = Path(path).expanduser().resolve()
+        stat = resolved.stat()
+    except (OSError, RuntimeError):
+        return None
+    return (str(resolved), stat.st_size, stat.st_mtime_ns)
+
+
+class ProbeCache:
+    """Dauerhafter ffprobe-Zwischenspeicher, Schluessel: Pfad, Groesse, mtime."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or probe_cache_path()
+        self._lock = threading.Lock()
+        self._memory: Dict[CacheKey, Dict[str, Any]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), timeout=30, check_same_thread=False
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS probes ("
+                "path TEXT NOT NULL, size INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, info TEXT NOT NULL, "
+                "PRIMARY KEY (path, size, mtime_ns))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._memory:
+                return dict(self._memory[key])
+            try:
+                row = (
+                    self._connection()
+                    .execute(
+                        "SELECT info FROM probes "
+                        "WHERE path = ? AND size = ? AND mtime_ns = ?",
+                        key,
+                    )
+                    .fetchone()
+                )
+            except sqlite3.Error as exc:
+                LOGGER.warning("Probe-Cache nicht lesbar: %s", exc)
+                return None
+            if row is None:
+                return None
+            try:
+                info = json.loads(row[0])
+            except json.JSONDecodeError:
+                return None
+            self._memory[key] = info
+            return dict(info)
+
+    def put(self, key: CacheKey, info: Dict[str, Any]) -> None:
+        self.put_many([(key, info)])
+
+    def put_many(
+        self, entries: Iterable[Tuple[CacheKey, Dict[str, Any]]]
+    ) -> None:
+        """Schreibt mehrere Eintraege in einer Transaktion."""
+        entries = list(entries)
+        with self._lock:
+            for key, info in entries:
+                self._memory[key] = dict(info)
+            try:
+                conn = self._connection()
+                # Alte Eintraege derselben Datei (andere Groesse/mtime)
+                # sind nicht mehr gueltig.
+                conn.executemany(
+                    "DELETE FROM probes WHERE path = ?",
+                    [(key[0],) for key, _ in entries],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO probes "
+                    "(path, size, mtime_ns, info) VALUES (?, ?, ?, ?)",
+                    [
+                        (*key, json.dumps(info, ensure_ascii=False))
+                        for key, info in entries
+                    ],
+                )
+                conn.commit()
+            except sqlite3.Error as exc:
+                LOGGER.warning("Probe-Cache nicht schreibbar: %s", exc)
+
+    def lookup(
+        self,
+        path: str,
+        prober: Callable[[str], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        key = file_key(path)
+        if key is None:
+            return prober(path)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        info = prober(path)
+        if info:
+            self.put(key, info)
+        return info
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Optional, Set
+
+# Statuswerte, die einen Job abschliessen, und ihr Zaehler.
+FINAL_STATUSES = {
+    "FERTIG": "done",
+    "FEHLER": "failed",
+    "ABGEBROCHEN": "aborted",
+}
+
+
+@dataclass(frozen=True)
+class ProgressFlush:
+    first_row: int
+    last_row: int
+    done: int
+    failed: int
+    aborted: int
+    total: int
+
+    @property
+    def has_rows(self) -> bool:
+        return self.first_row >= 0
+
+    @property
+    def processed(self) -> int:
+        return self.done + self.failed + self.aborted
+
+    @property
+    def percent(self) -> float:
+        return self.processed / max(1, self.total) * 100.0
+
+
+class ProgressAggregator:
+    """Sammelt Zeilenfortschritt aus Worker-Threads fuer gebuendelte Updates.
+
+    Worker schreiben den Fortschritt direkt ins PairItem und markieren die
+    Zeile nur; die Oberflaeche holt per Timer mit :meth:`take` einen Stand ab
+    und zeichnet nur den geaenderten Zeilenbereich neu.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self._lock = threading.Lock()
+        self._dirty: Set[int] = set()
+        self._counts = {"done": 0, "failed": 0, "aborted": 0}
+        self._counts_changed = False
+
+    def add_jobs(self, count: int) -> None:
+        """Waehrend des Laufs nachgereichte Jobs mitzaehlen."""
+        with self._lock:
+            self.total += count
+            self._counts_changed = True
+
+    def touch(self, row: int) -> None:
+        # Negative Zeilen: Paar steht nicht (mehr) in der Tabelle.
+        if row < 0:
+            return
+        with self._lock:
+            self._dirty.add(row)
+
+    def finish(self, row: int, status: str) -> None:
+        counter = FINAL_STATUSES.get(status)
+        with self._lock:
+            if row >= 0:
+                self._dirty.add(row)
+            if counter is not None:
+                self._counts[counter] += 1
+                self._counts_changed = True
+
+    def take(self) -> Optional[ProgressFlush]:
+        """Liefert die seit dem letzten Aufruf geaenderten Zeilen."""
+        with self._lock:
+            if not self._dirty and not self._counts_changed:
+                return None
+            rows = self._dirty
+            self._dirty = set()
+            self._counts_changed = False
+            counts = dict(self._counts)
+        return ProgressFlush(
+            first_row=min(rows) if rows else -1,
+            last_row=max(rows) if rows else -1,
+            total=self.total,
+            **counts,
+        )
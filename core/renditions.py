@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from .still_cache import scale_pad_filter
+
+# Gaengige Stufen (16:9); eigene Groessen gehen als "BREITExHOEHE".
+RENDITION_SIZES = {
+    "2160p": (3840, 2160),
+    "1440p": (2560, 1440),
+    "1080p": (1920, 1080),
+    "720p": (1280, 720),
+    "480p": (854, 480),
+    "360p": (640, 360),
+}
+_SIZE_PATTERN = re.compile(r"(\d+)x(\d+)")
+
+
+@dataclass(frozen=True)
+class Rendition:
+    name: str
+    width: int
+    height: int
+
+    @property
+    def size(self) -> str:
+        return f"{self.width}x{self.height}"
+
+
+def parse_ladder(text: str) -> List[Rendition]:
+    """Liest z.B. "1080p, 720p, 480p"; groesste Stufe zuerst.
+
+    Leerer Text bedeutet: keine Stufen, eine Ausgabe wie bisher.
+    """
+    ladder: List[Rendition] = []
+    for token in re.split(r"[,;\s]+", (text or "").strip().lower()):
+        if not token:
+            continue
+        if token in RENDITION_SIZES:
+            width, height = RENDITION_SIZES[token]
+        else:
+            match = _SIZE_PATTERN.fullmatch(token)
+            if match is None:
+                raise ValueError(f"Unbekannte Auflösungsstufe: {token}")
+            width, height = int(match.group(1)), int(match.group(2))
+            if width < 16 or height < 16 or width % 2 or height % 2:
+                raise ValueError(
+                    f"Auflösungsstufe {token}: Breite und Höhe müssen "
+                    "gerade und mindestens 16 sein"
+                )
+        if all((r.width, r.height) != (width, height) for r in ladder):
+            ladder.append(Rendition(token, width, height))
+    return sorted(ladder, key=lambda r: r.width * r.height, reverse=True)
+
+
+def ladder_filter(ladder: Sequence[Rendition], pre_filter: str = "") -> str:
+    """Ein Decode, danach je Stufe eigenes Skalieren/Auffuellen (4:2:0)."""
+    head = f"{pre_filter}," if pre_filter else ""
+    splits = "".join(f"[s{i}]" for i in range(len(ladder)))
+    chains = [f"[0:v]{head}split={len(ladder)}{splits}"]
+    for i, rendition in enumerate(ladder):
+        chains.append(
+            f"[s{i}]{scale_pad_filter(rendition.width, rendition.height)},"
+            f"setsar=1,format=yuv420p[v{i}]"
+        )
+    return ";".join(chains)
+
+
+def _tee_escape(path: str) -> str:
+    return path.replace("\\", "\\\\").replace("'", "\\'").replace("|", "\\|")
+
+
+def tee_outputs(outputs: Sequence[str]) -> str:
+    """Ziel fuer den tee-Muxer: Stufe i bekommt Videospur i und den Ton."""
+    return "|".join(
+        f"[select=\\'v:{i},a\\':f=mp4:movflags=+faststart]"
+        f"{_tee_escape(str(path))}"
+        for i, path in enumerate(outputs)
+    )
+
+
+def build_ladder_command(
+    input_args: Sequence[str],
+    audio: str,
+    ladder: Sequence[Rendition],
+    outputs: Sequence[str],
+    video_args: Sequence[str],
+    audio_args: Sequence[str],
+    pre_filter: str = "",
+    duration: float = 0.0,
+) -> List[str]:
+    """Alle Stufen in einem ffmpeg-Lauf.
+
+    Das Bild wird einmal dekodiert und per ``split`` verteilt; der Ton wird
+    genau einmal kodiert und vom tee-Muxer in jede Ausgabe geschrieben.
+    """
+    if len(outputs) != len(ladder):
+        raise ValueError("Je Auflösungsstufe wird genau eine Ausgabe benötigt")
+    audio_index = sum(1 for arg in input_args if arg == "-i")
+    cmd = [
+        "ffmpeg",
+        "-y",
+        *input_args,
+        "-i",
+        audio,
+        "-filter_complex",
+        ladder_filter(ladder, pre_filter),
+    ]
+    for i in range(len(ladder)):
+        cmd += ["-map", f"[v{i}]"]
+    cmd += ["-map", f"{audio_index}:a:0", *video_args, *audio_args]
+    if duration > 0:
+        cmd += ["-t", f"{duration:.3f}"]
+    # Wie bei direkter MP4-Ausgabe: SPS/PPS in den Dateikopf, nicht in den
+    # Datenstrom (der tee-Muxer gibt das Format nicht an den Encoder weiter).
+    return cmd + [
+        "-shortest",
+        "-flags",
+        "+global_header",
+        "-f",
+        "tee",
+        tee_outputs(outputs),
+    ]
@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .batch_journal import fingerprint
+from .job_queue import DEFAULT_LEASE_SECONDS
+from .paths import work_dir
+
+LOGGER = logging.getLogger("VideoBatchTool.segments")
+
+SEGMENT_DIR = "segments"
+SEGMENT_VERSION = 2
+# Laenge eines Abschnitts; ein Vielfaches der Bildrate haelt die Grenzen
+# bildgenau, damit die Abschnitte per -c copy aneinanderpassen.
+SEGMENT_SECONDS = 300.0
+SEGMENT_FPS = 25
+# Erst ab dieser Laufzeit lohnt das Aufteilen.
+MIN_SEGMENTED_SECONDS = 1800.0
+HEARTBEAT_SECONDS = 10.0
+# Unbenutzte Abschnitte und Listen werden nach dieser Zeit entfernt.
+SEGMENT_MAX_AGE_DAYS = 7
+POLL_SECONDS = 2.0
+
+
+def segment_dir() -> Path:
+    return work_dir() / SEGMENT_DIR
+
+
+def segment_workers(cpu_count: Optional[int] = None) -> int:
+    cpus = cpu_count or os.cpu_count() or 1
+    return max(2, cpus // 4)
+
+
+@dataclass(frozen=True)
+class Segment:
+    index: int
+    start: float
+    duration: float
+
+
+@dataclass(frozen=True)
+class SegmentJob:
+    key: str
+    command: List[str]
+
+
+def plan_segments(
+    total: float, seconds: float = SEGMENT_SECONDS
+) -> List[Segment]:
+    segments: List[Segment] = []
+    start = 0.0
+    while total - start > 1e-3:
+        length = min(seconds, total - start)
+        segments.append(Segment(len(segments), start, length))
+        start += seconds
+    return segments
+
+
+def segment_job(cmd: Sequence[str], inputs: Sequence[str] = ()) -> SegmentJob:
+    """Schluessel aus dem Befehl: gleiche Abschnitte werden nur einmal kodiert.
+
+    ``inputs`` sind die Dateien, die der Abschnitt liest; Groesse und mtime
+    gehen in den Schluessel ein, damit ein geaendertes Bild am selben Pfad
+    nicht alte Abschnitte wiederverwendet.
+    """
+    args = [str(a) for a in cmd if str(a) != "-y"]
+    prints = []
+    for path in dict.fromkeys(inputs):
+        try:
+            prints.append(fingerprint(path))
+        except OSError:
+            # Fehlt die Datei, scheitert ffmpeg ohnehin mit klarer Meldung.
+            continue
+    payload = json.dumps([SEGMENT_VERSION, args[1:], prints], sort_keys=True)
+    key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return SegmentJob(key, [str(a) for a in cmd])
+
+
+def _escape(path: str) -> str:
+    return Path(path).as_posix().replace("'", r"\'")
+
+
+def write_list(
+    entries: Sequence[Tuple[str, Optional[float]]], root: Path
+) -> Path:
+    """Concat-Liste, benannt nach ihrem Inhalt (bleibt fuer Wiederholungen).
+
+    Vorhandene Listen werden angefasst, damit das Aufraeumen alter
+    Arbeitsdateien keine Liste loescht, die ein Abschnitt noch braucht.
+    """
+    lines = []
+    for path, duration in entries:
+        lines.append(f"file '{_escape(path)}'")
+        if duration is not None:
+            lines.append(f"duration {duration:.6f}")
+    text = "\n".join(lines) + "\n"
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+    root.mkdir(parents=True, exist_ok=True)
+    target = root / f"{digest}.txt"
+    if target.is_file():
+        try:
+            os.utime(target)
+            return target
+        except OSError:
+            pass
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.part")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, target)
+    return target
+
+
+def clip_timeline(
+    entries: Sequence[Tuple[str, Optional[float]]],
+    start: float,
+    duration: float,
+    fps: int = SEGMENT_FPS,
+) -> List[Tuple[str, Optional[float]]]:
+    """Concat-Eintraege (Bild, Standzeit), gekuerzt auf ein Zeitfenster.
+
+    Der abschliessend wiederholte Eintrag liefert das letzte Einzelbild;
+    er liegt ein Bild vor dem Fensterende, damit ``-t`` ihn nicht
+    abschneidet und der Ausschnitt bildgenau endet.
+    """
+    end = start + duration
+    clipped: List[Tuple[str, Optional[float]]] = []
+    position = 0.0
+    for path, length in entries:
+        a = max(start, position)
+        b = min(end, position + (length or 0.0))
+        position += length or 0.0
+        if a >= end:
+            break
+        if b > a:
+            clipped.append((path, b - a))
+    if clipped:
+        path, length = clipped[-1]
+        clipped[-1] = (path, max(0.0, (length or 0.0) - 1.0 / fps))
+        clipped.append((path, None))
+    return clipped
+
+
+def slideshow_window(
+    frames: Sequence[str],
+    per: float,
+    segment: Segment,
+    fps: int = SEGMENT_FPS,
+) -> List[Tuple[str, Optional[float]]]:
+    """Bilder und (gekuerzte) Standzeiten, die in einen Abschnitt fallen."""
+    return clip_timeline(
+        [(frame, per) for frame in frames],
+        segment.start,
+        segment.duration,
+        fps,
+    )
+
+
+def slideshow_job(
+    frames: Sequence[str],
+    per: float,
+    segment: Segment,
+    video_args: Sequence[str],
+    root: Path,
+    fps: int = SEGMENT_FPS,
+) -> SegmentJob:
+    """Abschnitt einer Slideshow mit eigener Teil-Liste und deren Bildern."""
+    window = slideshow_window(frames, per, segment, fps)
+    cmd = segment_command(
+        concat_input(write_list(window, root)), segment, video_args
+    )
+    return segment_job(cmd, [path for path, _ in window])
+
+
+def concat_input(list_path: Path) -> List[str]:
+    return ["-f", "concat", "-safe", "0", "-i", str(list_path)]
+
+
+def segment_command(
+    input_args: Sequence[str], segment: Segment, video_args: Sequence[str]
+) -> List[str]:
+    """Videobefehl fuer einen Abschnitt; Ziel und ``-an`` haengt der Encoder an.
+
+    Die Eingabe beginnt bereits am Abschnitt (Standbild oder Teil-Liste),
+    daher gibt es kein ``-ss``: gleiche Abschnitte haben gleiche Befehle.
+    """
+    return [
+        "ffmpeg",
+        "-y",
+        *input_args,
+        "-t",
+        f"{segment.duration:.3f}",
+        *video_args,
+    ]
+
+
+def build_concat_mux_command(
+    list_path: Path,
+    audio: str,
+    output: str,
+    audio_args: Sequence[str],
+    duration: float = 0.0,
+) -> List[str]:
+    """Fuegt die Abschnitte ohne Neukodierung zusammen; Audio genau einmal."""
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(list_path),
+        "-i",
+        audio,
+        "-map",
+        "0:v:0",
+        "-map",
+        "1:a:0",
+        "-c:v",
+        "copy",
+        *audio_args,
+    ]
+    if duration > 0:
+        cmd += ["-t", f"{duration:.3f}"]
+    return cmd + ["-shortest", "-movflags", "+faststart", str(output)]
+
+
+class SegmentError(RuntimeError):
+    pass
+
+
+class SegmentedEncoder:
+    """Kodiert Abschnitte parallel; fertige Abschnitte bleiben liegen.
+
+    Jeder Abschnitt wird ueber eine Sperrdatei (``O_EXCL``) beansprucht.
+    Liegt der Segmentordner auf einem gemeinsamen Laufwerk, helfen andere
+    Prozesse oder Rechner mit demselben Auftrag mit; verwaiste Sperren
+    (ohne Lebenszeichen) werden nach ``stale_seconds`` uebernommen. Nach
+    einem Absturz werden nur fehlende Abschnitte neu kodiert.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[List[str]], int],
+        root: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        stop: Optional[threading.Event] = None,
+        stale_seconds: float = DEFAULT_LEASE_SECONDS,
+    ):
+        self.runner = runner
+        self.root = root or segment_dir()
+        self.max_workers = max_workers or segment_workers()
+        self.stop = stop or threading.Event()
+        self.stale_seconds = stale_seconds
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}.mp4"
+
+    def _lock_path(self, key: str) -> Path:
+        return self.root / f"{key}.lock"
+
+    def _claim(self, key: str) -> bool:
+        if self.path_for(key).is_file():
+            return False
+        lock = self._lock_path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    age = time.time() - lock.stat().st_mtime
+                except OSError:
+                    continue
+                if age <= self.stale_seconds:
+                    return False
+                LOGGER.warning("Verwaiste Segment-Sperre uebernommen: %s", lock)
+                lock.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "w") as handle:
+                handle.write(self._owner)
+            return True
+        return False
+
+    def _heartbeat(self, lock: Path, done: threading.Event) -> None:
+        while not done.wait(HEARTBEAT_SECONDS):
+            try:
+                os.utime(lock)
+            except OSError:
+                return
+
+    def _encode(self, job: SegmentJob) -> bool:
+        target = self.path_for(job.key)
+        partial = target.with_name(f"{job.key}.part")
+        lock = self._lock_path(job.key)
+        done = threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat, args=(lock, done), daemon=True
+        )
+        beat.start()
+        try:
+            code = self.runner([*job.command, "-an", "-f", "mp4", str(partial)])
+            if code != 0 or not partial.is_file():
+                return False
+            os.replace(partial, target)
+            return True
+        finally:
+            done.set()
+            beat.join()
+            partial.unlink(missing_ok=True)
+            lock.unlink(missing_ok=True)
+
+    def run(
+        self,
+        jobs: Sequence[SegmentJob],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Path:
+        """Stellt alle Abschnitte bereit und liefert die Concat-Liste."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        for job in jobs:
+            # Wiederverwendete Abschnitte gelten als frisch, damit kein
+            # anderer Prozess sie beim Aufraeumen entfernt.
+            try:
+                os.utime(self.path_for(job.key))
+            except OSError:
+                continue
+        self.prune()
+        unique = list({job.key: job for job in jobs}.values())
+        total = len(unique)
+        failed = threading.Event()
+        guard = threading.Lock()
+
+        def report() -> None:
+            if on_progress is not None:
+                ready = sum(1 for j in unique if self.path_for(j.key).is_file())
+                on_progress(ready, total)
+
+        while True:
+            missing = [j for j in unique if not self.path_for(j.key).is_file()]
+            report()
+            if not missing:
+                break
+            if self.stop.is_set():
+                raise SegmentError("Abbruch durch Benutzer")
+            queue = list(missing)
+
+            def work() -> None:
+                while not (failed.is_set() or self.stop.is_set()):
+                    with guard:
+                        job = next(
+                            (j for j in queue if self._claim(j.key)), None
+                        )
+                        if job is None:
+                            return
+                        queue.remove(job)
+                    if not self._encode(job):
+                        failed.set()
+                        return
+                    report()
+
+            workers = min(self.max_workers, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # Kontext mitgeben, damit z. B. eine ProcessGroup des
+                # Aufrufers auch die Abschnitts-Prozesse erfasst.
+                futures = [
+                    pool.submit(contextvars.copy_context().run, work)
+                    for _ in range(workers)
+                ]
+                for future in futures:
+                    future.result()
+            if self.stop.is_set():
+                raise SegmentError("Abbruch durch Benutzer")
+            if failed.is_set():
+                raise SegmentError("Abschnitt konnte nicht kodiert werden")
+            if any(not self.path_for(j.key).is_file() for j in missing):
+                # Andere Prozesse arbeiten noch an ihren Abschnitten.
+                time.sleep(POLL_SECONDS)
+        return self.concat_list(jobs)
+
+    def prune(self, max_age_days: int = SEGMENT_MAX_AGE_DAYS) -> int:
+        """Entfernt lange unbenutzte Abschnitte, Listen und Teildateien.
+
+        Sperrdateien bleiben liegen (sie verwaisen ueber ``stale_seconds``),
+        ebenso alles, woran gerade jemand mit Sperre arbeitet.
+        """
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for path in self.root.glob("*"):
+            if path.suffix == ".lock":
+                continue
+            key = path.name.split(".", 1)[0]
+            try:
+                if self._lock_path(key).exists():
+                    continue
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def concat_list(self, jobs: Sequence[SegmentJob]) -> Path:
+        entries = [(str(self.path_for(job.key)), None) for job in jobs]
+        return write_list(entries, self.root)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .paths import cache_dir
+
+STILL_SEGMENT_SECONDS = 10
+STILL_SEGMENT_FPS = 25
+STILL_IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def still_segment_dir() -> Path:
+    return cache_dir() / "still_segments"
+
+
+def is_still_image(path: str) -> bool:
+    return Path(path or "").suffix.lower() in STILL_IMAGE_SUFFIXES
+
+
+def still_segment_key(
+    image: str,
+    width: int,
+    height: int,
+    crf: int,
+    preset: str,
+    fps: int = STILL_SEGMENT_FPS,
+) -> str:
+    src = Path(image).expanduser().resolve()
+    stat = src.stat()
+    payload = {
+        "image": str(src),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "width": int(width),
+        "height": int(height),
+        "crf": int(crf),
+        "preset": str(preset),
+        "seconds": STILL_SEGMENT_SECONDS,
+        "fps": int(fps),
+    }
+    raw = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def scale_pad_filter(width: int, height: int) -> str:
+    return (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
+    )
+
+
+def build_segment_command(
+    image: str,
+    target: Path,
+    width: int,
+    height: int,
+    crf: int,
+    preset: str,
+    fps: int = STILL_SEGMENT_FPS,
+) -> List[str]:
+    frames = STILL_SEGMENT_SECONDS * fps
+    return [
+        "ffmpeg",
+        "-y",
+        "-framerate",
+        str(fps),
+        "-i",
+        image,
+        "-t",
+        str(STILL_SEGMENT_SECONDS),
+        "-vf",
+        # Erst skalieren, dann wiederholen: das Bild wird nur einmal
+        # dekodiert und skaliert (mit -loop 1 fuer jedes Einzelbild).
+        f"{scale_pad_filter(width, height)},loop=loop=-1:size=1,"
+        "format=yuv420p",
+        "-c:v",
+        "libx264",
+        "-tune",
+        "stillimage",
+        "-preset",
+        preset,
+        "-crf",
+        str(crf),
+        # Genau ein GOP pro Segment: jede Wiederholung beginnt mit Keyframe.
+        "-g",
+        str(frames),
+        "-keyint_min",
+        str(frames),
+        "-sc_threshold",
+        "0",
+        "-an",
+        "-f",
+        "mp4",
+        str(target),
+    ]
+
+
+def build_mux_command(
+    segment: Path,
+    audio: str,
+    output: str,
+    audio_args: Sequence[str],
+    duration: float = 0.0,
+) -> List[str]:
+    cmd = ["ffmpeg", "-y", "-stream_loop", "-1"]
+    if duration > 0:
+        # -shortest allein stoppt eine Endlosschleife mit -c:v copy nicht
+        # zuverlaessig, daher wird die Schleife auf die Audiolaenge begrenzt.
+        cmd += ["-t", f"{duration:.3f}"]
+    return cmd + [
+        "-i",
+        str(segment),
+        "-i",
+        audio,
+        "-map",
+        "0:v:0",
+        "-map",
+        "1:a:0",
+        "-c:v",
+        "copy",
+        *audio_args,
+        "-shortest",
+        "-movflags",
+        "+faststart",
+        str(output),
+    ]
+
+
+class StillSegmentCache:
+    """Kodiert ein Standbild einmal und liefert das Segment wiederholt aus."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or still_segment_dir()
+        self._guard = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}.mp4"
+
+    def ensure(
+        self,
+        image: str,
+        width: int,
+        height: int,
+        crf: int,
+        preset: str,
+        runner: Callable[[List[str]], int],
+        fps: int = STILL_SEGMENT_FPS,
+    ) -> Path:
+        key = still_segment_key(image, width, height, crf, preset, fps)
+        target = self.path_for(key)
+        with self._lock_for(key):
+            if target.is_file() and target.stat().st_size > 0:
+                return target
+            self.root.mkdir(parents=True, exist_ok=True)
+            partial = target.with_name(f"{key}.part")
+            cmd = build_segment_command(
+                image, partial, width, height, crf, preset, fps
+            )
+            code = runner(cmd)
+            if code != 0 or not partial.is_file():
+                partial.unlink(missing_ok=True)
+                raise RuntimeError(
+                    f"Standbild-Segment konnte nicht erstellt werden: {image}"
+                )
+            partial.replace(target)
+        return target
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from .image_prep import RAW_SUFFIX, prepare_images
+from .still_cache import is_still_image, scale_pad_filter
+
+# Standbild-optimierte Ausgabe: wenige Bilder, lange GOPs, x264 auf
+# statische Inhalte abgestimmt. 1 fps spielen alle gaengigen Player ab.
+STILL_OUTPUT_FPS = 1
+# Ein Keyframe pro Minute haelt das Springen im Video ertraeglich.
+STILL_KEYFRAME_SECONDS = 60
+# Obergrenze fuer -g; die Keyframes setzt force_key_frames zeitbasiert.
+STILL_MAX_GOP_FRAMES = 100000
+
+
+@dataclass(frozen=True)
+class StillSource:
+    path: str
+    args: List[str]
+    video_filter: str
+
+
+def still_source(
+    image: str,
+    width: int,
+    height: int,
+    fps: Optional[int] = None,
+    prescale: bool = True,
+) -> StillSource:
+    """Eingabe fuer ein Standbild als Dauerquelle.
+
+    Mit ``-loop 1`` dekodiert und skaliert ffmpeg das Bild fuer jedes
+    Ausgabebild neu. Stattdessen wird es einmal mit Pillow auf Zielgroesse
+    gebracht und als Rohbild (RGB24) wiederholt gelesen. Ohne Pillow oder
+    bei Fehlern bleibt es beim bisherigen ``-loop 1``.
+    """
+    rate = ["-framerate", str(fps)] if fps else []
+    scale = scale_pad_filter(width, height)
+    path = image
+    if prescale and is_still_image(image):
+        path = str(
+            prepare_images([Path(image)], width, height, suffix=RAW_SUFFIX)[0]
+        )
+    if not path.endswith(RAW_SUFFIX):
+        return StillSource(path, ["-loop", "1", *rate, "-i", path], scale)
+    args = [
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "rgb24",
+        "-video_size",
+        f"{width}x{height}",
+        *rate,
+        "-stream_loop",
+        "-1",
+        "-i",
+        path,
+    ]
+    # RGB-Eingabe wuerde x264 sonst zu 4:4:4 (High 4:4:4) verleiten, das
+    # viele Player nicht abspielen.
+    return StillSource(path, args, f"{scale},format=yuv420p")
+
+
+def still_video_args(
+    fps: Optional[int] = STILL_OUTPUT_FPS, duration: Optional[float] = None
+) -> List[str]:
+    """x264-Ausgabeoptionen; ``fps=None`` erzeugt VFR (ein Bild je Dia)."""
+    rate = ["-r", str(fps)] if fps else ["-fps_mode", "vfr"]
+    # Bei 1 fps puffert x264 viele Sekunden; -shortest allein schiesst dann
+    # deutlich ueber das Audioende hinaus.
+    limit = ["-t", f"{duration:.3f}"] if duration else []
+    return [
+        *rate,
+        *limit,
+        "-fflags",
+        "+shortest",
+        "-max_interleave_delta",
+        "100M",
+        "-tune",
+        "stillimage",
+        "-pix_fmt",
+        "yuv420p",
+        "-g",
+        str(STILL_MAX_GOP_FRAMES),
+        "-force_key_frames",
+        f"expr:gte(t,n_forced*{STILL_KEYFRAME_SECONDS})",
+        "-sc_threshold",
+        "0",
+    ]
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .image_prep import prune_prepared
+from .paths import work_dir
+from .segments import write_list
+
+LOGGER = logging.getLogger("VideoBatchTool.tail_extend")
+
+TAIL_DIR = "tails"
+TAIL_VERSION = 1
+# Nur Codecs, deren Parameter sich mit einem eigenen Encoder nachbilden
+# lassen; alles andere wird wie bisher komplett neu kodiert.
+TAIL_ENCODERS = {"h264": "libx264"}
+X264_PIX_FMTS = frozenset(
+    {"yuv420p", "yuvj420p", "yuv422p", "yuvj422p", "yuv444p", "yuvj444p"}
+)
+X264_PROFILES = {
+    "constrained baseline": "baseline",
+    "baseline": "baseline",
+    "main": "main",
+    "high": "high",
+    "high 10": "high10",
+    "high 4:2:2": "high422",
+    "high 4:4:4 predictive": "high444",
+}
+# Kuerzere Luecken faellt niemandem auf; dafuer lohnt kein Extra-Segment.
+MIN_TAIL_SECONDS = 0.05
+
+
+def tail_dir() -> Path:
+    return work_dir() / TAIL_DIR
+
+
+@dataclass(frozen=True)
+class VideoStream:
+    codec: str
+    profile: str
+    level: int
+    width: int
+    height: int
+    pix_fmt: str
+    frame_rate: str
+    time_base: str
+    sample_aspect_ratio: str
+    duration: float
+
+
+def video_stream_info(payload: Dict[str, Any]) -> Optional[VideoStream]:
+    streams = payload.get("streams", []) or []
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        return None
+    try:
+        duration = float(
+            video.get("duration")
+            or (payload.get("format", {}) or {}).get("duration")
+            or 0
+        )
+        level = int(video.get("level") or 0)
+        width = int(video.get("width") or 0)
+        height = int(video.get("height") or 0)
+    except (TypeError, ValueError):
+        return None
+    return VideoStream(
+        codec=str(video.get("codec_name", "")),
+        profile=str(video.get("profile", "")),
+        level=level,
+        width=width,
+        height=height,
+        pix_fmt=str(video.get("pix_fmt", "")),
+        frame_rate=str(
+            video.get("r_frame_rate") or video.get("avg_frame_rate") or ""
+        ),
+        time_base=str(video.get("time_base", "")),
+        sample_aspect_ratio=str(video.get("sample_aspect_ratio") or ""),
+        duration=duration,
+    )
+
+
+def probe_video_stream(path: str) -> Optional[VideoStream]:
+    import ffmpeg
+
+    try:
+        return video_stream_info(ffmpeg.probe(path))
+    except Exception as exc:
+        LOGGER.warning("Videostream nicht lesbar (%s): %s", path, exc)
+        return None
+
+
+def tail_encoder_args(
+    stream: VideoStream, crf: int, preset: str
+) -> Optional[List[str]]:
+    """Encoder-Optionen passend zum Original oder None (nicht moeglich)."""
+    encoder = TAIL_ENCODERS.get(stream.codec)
+    if encoder is None or stream.pix_fmt not in X264_PIX_FMTS:
+        return None
+    if stream.width <= 0 or stream.height <= 0 or stream.duration <= 0:
+        return None
+    if not stream.frame_rate or stream.frame_rate.startswith("0"):
+        return None
+    args = [
+        "-c:v",
+        encoder,
+        "-pix_fmt",
+        stream.pix_fmt,
+        "-r",
+        stream.frame_rate,
+        "-preset",
+        preset,
+        "-crf",
+        str(crf),
+        "-tune",
+        "stillimage",
+        # Parametersaetze im Datenstrom: der Decoder uebernimmt sie am
+        # Uebergang, obwohl die Datei die des Originals traegt.
+        "-x264-params",
+        "repeat-headers=1",
+    ]
+    profile = X264_PROFILES.get(stream.profile.lower())
+    if profile:
+        args += ["-profile:v", profile]
+    if stream.level > 0:
+        args += ["-level:v", f"{stream.level / 10:g}"]
+    if stream.sample_aspect_ratio not in ("", "0:1", "1:1", "N/A"):
+        args += ["-aspect", _display_aspect(stream)]
+    _, _, den = stream.time_base.partition("/")
+    if den.isdigit():
+        args += ["-video_track_timescale", den]
+    return args
+
+
+def _display_aspect(stream: VideoStream) -> str:
+    num, _, den = stream.sample_aspect_ratio.partition(":")
+    try:
+        ratio = stream.width * int(num) / (stream.height * int(den))
+    except (ValueError, ZeroDivisionError):
+        return f"{stream.width}:{stream.height}"
+    return f"{ratio:.6f}"
+
+
+def last_frame_command(video: str, target: Path) -> List[str]:
+    # Nur die letzte Sekunde dekodieren; -update ueberschreibt das Bild,
+    # bis das letzte Einzelbild uebrig bleibt.
+    return [
+        "ffmpeg",
+        "-y",
+        "-sseof",
+        "-1",
+        "-i",
+        video,
+        "-an",
+        "-update",
+        "1",
+        "-f",
+        "image2",
+        str(target),
+    ]
+
+
+def tail_command(
+    frame: Path,
+    stream: VideoStream,
+    seconds: float,
+    encoder_args: List[str],
+    target: Path,
+) -> List[str]:
+    return [
+        "ffmpeg",
+        "-y",
+        "-loop",
+        "1",
+        "-framerate",
+        stream.frame_rate,
+        "-i",
+        str(frame),
+        "-t",
+        f"{seconds:.3f}",
+        "-vf",
+        f"scale={stream.width}:{stream.height}",
+        *encoder_args,
+        "-an",
+        "-f",
+        "mp4",
+        str(target),
+    ]
+
+
+def tail_key(
+    video: str, stream: VideoStream, seconds: float, encoder_args: List[str]
+) -> str:
+    src = Path(video).expanduser().resolve()
+    stat = src.stat()
+    payload = json.dumps(
+        [
+            TAIL_VERSION,
+            str(src),
+            stat.st_size,
+            stat.st_mtime_ns,
+            asdict(stream),
+            round(seconds, 3),
+            encoder_args,
+        ]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def extend_with_tail(
+    video: str,
+    total: float,
+    crf: int,
+    preset: str,
+    runner: Callable[[List[str]], int],
+    root: Optional[Path] = None,
+    stream: Optional[VideoStream] = None,
+) -> Optional[Path]:
+    """Concat-Liste aus unveraendertem Original und Standbild-Schluss.
+
+    Kodiert wird nur das fehlende Stueck: das letzte Bild des Videos,
+    mit den Parametern des Originals (Codec, Profil, Pixelformat,
+    Bildrate, Zeitbasis). Liefert None, wenn das nicht moeglich ist; der
+    Aufrufer kodiert dann wie bisher mit ``tpad`` neu.
+    """
+    stream = stream or probe_video_stream(video)
+    if stream is None:
+        return None
+    seconds = total - stream.duration
+    encoder_args = tail_encoder_args(stream, crf, preset)
+    if encoder_args is None or seconds < MIN_TAIL_SECONDS:
+        return None
+    root = root or tail_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    prune_prepared(root)
+    try:
+        key = tail_key(video, stream, seconds, encoder_args)
+    except OSError:
+        return None
+    tail = root / f"{key}.mp4"
+    if not tail.is_file():
+        frame = root / f"{key}.png"
+        partial = root / f"{key}.part"
+        try:
+            if runner(last_frame_command(video, frame)) != 0:
+                return None
+            if not frame.is_file():
+                return None
+            cmd = tail_command(frame, stream, seconds, encoder_args, partial)
+            if runner(cmd) != 0 or not partial.is_file():
+                return None
+            os.replace(partial, tail)
+        finally:
+            frame.unlink(missing_ok=True)
+            partial.unlink(missing_ok=True)
+    return write_list(
+        [(str(Path(video).resolve()), stream.duration), (str(tail), None)],
+        root,
+    )
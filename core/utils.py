@@ -3,14 +3,16 @@ from __future__ import annotations
 import re
 import subprocess
 import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
 from subprocess import CompletedProcess, PIPE
-from typing import List
-
-import ffmpeg
+from typing import Any, Dict, Iterator, List, Optional, Set
 
 from .config import cfg
+from .media_info import probe_media
 
 
 def human_time(seconds: float) -> str:
@@ -52,6 +54,7 @@ def build_output_name_values(
     quality: str | None = None,
     resolution: str | None = None,
     form: str | None = None,
+    rendition: str | None = None,
 ) -> dict[str, str]:
     now = now or datetime.now()
     stamp = now.strftime("%Y%m%d-%H%M%S")
@@ -68,6 +71,7 @@ def build_output_name_values(
         "qualitaet": linux_safe_stem(quality or "auto", "auto"),
         "abmasse": linux_safe_stem(resolution or "0x0", "0x0"),
         "form": linux_safe_stem(form or "standard", "standard"),
+        "stufe": linux_safe_stem(rendition or resolution or "0x0", "0x0"),
     }
 
 
@@ -88,6 +92,7 @@ def build_out_name(
     quality: str | None = None,
     resolution: str | None = None,
     form: str | None = None,
+    rendition: str | None = None,
 ) -> Path:
     values = build_output_name_values(
         audio,
@@ -96,6 +101,7 @@ def build_out_name(
         quality=quality,
         resolution=resolution,
         form=form,
+        rendition=rendition,
     )
     template = (
         template
@@ -108,28 +114,80 @@ def build_out_name(
     filename = _sanitize_filename(filename)
     if not filename.lower().endswith(".mp4"):
         filename = f"{filename}.mp4"
+    if rendition and "{stufe}" not in template and "{abmasse}" not in template:
+        # Sonst bekaemen alle Aufloesungsstufen denselben Namen.
+        filename = f"{filename[:-4]}_{values['stufe']}.mp4"
     return out_dir / filename
 
 
 def probe_duration(path: str) -> float:
-    try:
-        pr = ffmpeg.probe(path)
-        fmt = pr.get("format", {})
-        if "duration" in fmt:
-            return float(fmt["duration"])
-        for st in pr.get("streams", []):
-            if st.get("codec_type") == "audio":
-                return float(st.get("duration", 0) or 0)
-    except Exception as e:
-        print("Fehler beim Prüfen der Dauer:", e, file=sys.stderr)
-    return 0.0
+    return probe_media(path).duration
+
+
+# ffmpeg schreibt UTF-8; kaputte Bytes sollen den Lauf nicht abbrechen.
+_TEXT: Dict[str, Any] = {"text": True, "encoding": "utf-8", "errors": "replace"}
+
+
+class ProcessGroup:
+    """Alle ffmpeg-Prozesse eines Jobs, damit sie gemeinsam enden koennen.
+
+    Innerhalb von :meth:`active` startet :func:`run_ffmpeg` seine Prozesse
+    in dieser Gruppe, auch aus Threads, die den Kontext mitnehmen.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._procs: Set[subprocess.Popen] = set()
+        self.terminated = False
+
+    @contextmanager
+    def active(self) -> Iterator["ProcessGroup"]:
+        token = _PROCESS_GROUP.set(self)
+        try:
+            yield self
+        finally:
+            _PROCESS_GROUP.reset(token)
+
+    def run(self, cmd: List[str]) -> CompletedProcess[str]:
+        proc = subprocess.Popen(cmd, stdout=PIPE, stderr=PIPE, **_TEXT)
+        with self._lock:
+            self._procs.add(proc)
+            stopped = self.terminated
+        if stopped:
+            proc.terminate()
+        try:
+            out, err = proc.communicate()
+        finally:
+            with self._lock:
+                self._procs.discard(proc)
+        return CompletedProcess(cmd, proc.returncode, out, err)
+
+    def terminate(self) -> None:
+        """Beendet laufende Prozesse; spaeter gestartete enden sofort."""
+        with self._lock:
+            self.terminated = True
+            procs = list(self._procs)
+        for proc in procs:
+            try:
+                proc.terminate()
+            except OSError:
+                pass
+
+
+_PROCESS_GROUP: ContextVar[Optional[ProcessGroup]] = ContextVar(
+    "process_group", default=None
+)
 
 
 def run_ffmpeg(cmd: List[str]) -> CompletedProcess[str]:
     if cfg.debug:
         print("Starte:", " ".join(cmd))
+    group = _PROCESS_GROUP.get()
     try:
-        res = subprocess.run(cmd, stdout=PIPE, stderr=PIPE, text=True)
+        if group is not None:
+            res = group.run(cmd)
+        else:
+            res = subprocess.run(cmd, stdout=PIPE, stderr=PIPE, **_TEXT)
     except FileNotFoundError:
         print("FFmpeg nicht gefunden. Bitte installieren.", file=sys.stderr)
         return CompletedProcess(cmd, 1, "", "ffmpeg fehlt")
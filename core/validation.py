@@ -83,7 +83,7 @@ def validate_output_template(template: str) -> FieldValidationResult:
                 f"{exc}\n"
                 "Erlaubt sind: {audio_stem}, {audio_name}, {date}, {time}, "
                 "{stamp}, {video_laenge}, {zeitstempel}, {qualitaet}, "
-                "{abmasse}, {form}."
+                "{abmasse}, {stufe}, {form}."
             ),
         )
     return FieldValidationResult(value=cleaned, is_valid=True)
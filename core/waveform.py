@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+from array import array
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .paths import cache_dir
+from .probe_cache import file_key
+
+LOGGER = logging.getLogger("VideoBatchTool.waveform")
+
+WAVEFORM_DIR = "waveforms"
+WAVEFORM_VERSION = 1
+# Fuer eine Uebersicht genuegt ein grobes Signal: 2 kHz Mono halten den
+# Datenstrom auch bei Stunden-Dateien klein (1 h = rund 14 MB).
+WAVEFORM_RATE = 2000
+WAVEFORM_BINS = 240
+WAVEFORM_WORKERS = 2
+_SCALE = 127
+
+# Je Abschnitt (Minimum, Maximum) im Bereich -127..127.
+Peaks = List[Tuple[int, int]]
+Decoder = Callable[[List[str]], Optional[bytes]]
+
+
+def waveform_dir() -> Path:
+    return cache_dir() / WAVEFORM_DIR
+
+
+def decode_command(path: str, rate: int = WAVEFORM_RATE) -> List[str]:
+    return [
+        "ffmpeg",
+        "-nostdin",
+        "-v",
+        "error",
+        "-i",
+        path,
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(rate),
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "-",
+    ]
+
+
+def _decode(cmd: List[str]) -> Optional[bytes]:
+    try:
+        result = subprocess.run(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+    except OSError as exc:
+        LOGGER.warning("Wellenform nicht dekodierbar: %s", exc)
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def reduce_peaks(pcm: bytes, bins: int = WAVEFORM_BINS) -> Peaks:
+    """Verdichtet 16-bit-PCM auf ``bins`` Min/Max-Paare.
+
+    Mit NumPy in einem Schritt ueber alle Abschnitte; ohne NumPy
+    (optionale Abhaengigkeit) per Python-Schleife mit gleichem Ergebnis.
+    """
+    count = len(pcm) // 2
+    if count == 0 or bins <= 0:
+        return []
+    bins = min(bins, count)
+    step = count // bins
+    try:
+        import numpy as np
+    except ImportError:
+        samples = array("h", pcm[: count * 2])
+        if sys.byteorder == "big":
+            samples.byteswap()
+        lows = [min(samples[i * step : (i + 1) * step]) for i in range(bins)]
+        highs = [max(samples[i * step : (i + 1) * step]) for i in range(bins)]
+    else:
+        frames = np.frombuffer(pcm, dtype="<i2", count=step * bins)
+        frames = frames.reshape(bins, step)
+        lows = frames.min(axis=1).tolist()
+        highs = frames.max(axis=1).tolist()
+    return [(_scale(low), _scale(high)) for low, high in zip(lows, highs)]
+
+
+def _scale(value: int) -> int:
+    return max(-_SCALE, min(_SCALE, round(value * _SCALE / 32767)))
+
+
+def _cache_file(path: str, bins: int, root: Path) -> Optional[Path]:
+    key = file_key(path)
+    if key is None:
+        return None
+    payload = json.dumps([WAVEFORM_VERSION, *key, bins, WAVEFORM_RATE])
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return root / f"{digest}.peaks"
+
+
+def _read_peaks(target: Path) -> Optional[Peaks]:
+    try:
+        data = target.read_bytes()
+    except OSError:
+        return None
+    values = array("b", data)
+    return list(zip(values[0::2], values[1::2]))
+
+
+def _write_peaks(target: Path, peaks: Peaks) -> None:
+    values = array("b", [v for pair in peaks for v in pair])
+    partial = target.with_suffix(".part")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial.write_bytes(values.tobytes())
+        os.replace(partial, target)
+    except OSError as exc:
+        LOGGER.warning("Wellenform nicht speicherbar: %s", exc)
+        partial.unlink(missing_ok=True)
+
+
+def cached_peaks(
+    path: str, bins: int = WAVEFORM_BINS, root: Optional[Path] = None
+) -> Optional[Peaks]:
+    """Nur der Cache: schnell genug fuer den GUI-Thread."""
+    target = _cache_file(path, bins, root or waveform_dir())
+    if target is None or not target.is_file():
+        return None
+    return _read_peaks(target)
+
+
+def waveform_peaks(
+    path: str,
+    bins: int = WAVEFORM_BINS,
+    root: Optional[Path] = None,
+    decoder: Optional[Decoder] = None,
+) -> Optional[Peaks]:
+    """Min/Max-Spitzen einer Audiodatei; dekodiert wird nur einmal.
+
+    Schluessel ist der Dateifingerabdruck (Pfad, Groesse, mtime); beim
+    naechsten Start kommen die Werte aus ``cache_dir()/waveforms``.
+    """
+    root = root or waveform_dir()
+    target = _cache_file(path, bins, root)
+    if target is None:
+        return None
+    if target.is_file():
+        return _read_peaks(target)
+    pcm = (decoder or _decode)(decode_command(path))
+    if not pcm:
+        return None
+    peaks = reduce_peaks(pcm, bins)
+    if peaks:
+        _write_peaks(target, peaks)
+    return peaks
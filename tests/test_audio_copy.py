@@ -0,0 +1,80 @@
+from dataclasses import replace
+from typing import Any
+
+from core.audio_copy import decide_audio_args, parse_bitrate
+from core.media_info import MediaInfo, media_info_from_probe
+
+
+def _aac(**overrides: Any) -> MediaInfo:
+    info = MediaInfo(
+        duration=60.0,
+        audio_codec="aac",
+        audio_profile="LC",
+        audio_bitrate=160000,
+        sample_rate=44100,
+        channels=2,
+        channel_layout="stereo",
+    )
+    return replace(info, **overrides)
+
+
+def test_parse_bitrate_units() -> None:
+    assert parse_bitrate("192k") == 192000
+    assert parse_bitrate("2M") == 2000000
+    assert parse_bitrate("abc") == 0
+
+
+def test_compatible_aac_is_copied() -> None:
+    decision = decide_audio_args(_aac(), "192k")
+
+    assert decision.copy
+    assert decision.args == ["-c:a", "copy"]
+
+
+def test_higher_bitrate_is_reencoded() -> None:
+    decision = decide_audio_args(_aac(audio_bitrate=256000), "192k")
+
+    assert not decision.copy
+    assert decision.args == ["-c:a", "aac", "-b:a", "192k"]
+    assert "Bitrate" in decision.reason
+
+
+def test_incompatible_sources_are_reencoded() -> None:
+    assert not decide_audio_args(_aac(audio_codec="mp3"), "192k").copy
+    assert not decide_audio_args(_aac(audio_profile="HE-AAC"), "192k").copy
+    assert not decide_audio_args(_aac(sample_rate=22050), "192k").copy
+    assert not decide_audio_args(_aac(channels=6), "192k").copy
+    assert not decide_audio_args(_aac(), "192k", has_filters=True).copy
+    assert not decide_audio_args(_aac(), "192k", sample_rate=48000).copy
+
+
+def test_media_info_from_probe_reads_streams() -> None:
+    info = media_info_from_probe(
+        {
+            "format": {"duration": "12.5"},
+            "streams": [
+                {
+                    "codec_type": "video",
+                    "codec_name": "h264",
+                    "width": 1920,
+                    "height": 1080,
+                    "avg_frame_rate": "30000/1001",
+                },
+                {
+                    "codec_type": "audio",
+                    "codec_name": "aac",
+                    "profile": "LC",
+                    "bit_rate": "128000",
+                    "sample_rate": "48000",
+                    "channels": 2,
+                    "channel_layout": "stereo",
+                },
+            ],
+        }
+    )
+
+    assert info.duration == 12.5
+    assert info.video_codec == "h264"
+    assert round(info.frame_rate, 2) == 29.97
+    assert info.audio_bitrate == 128000
+    assert info.sample_rate == 48000
@@ -0,0 +1,77 @@
+import os
+from pathlib import Path
+
+from core.batch_journal import JOURNAL_FILE, BatchJournal, job_key
+
+
+def _inputs(tmp_path: Path):
+    image = tmp_path / "bild.jpg"
+    audio = tmp_path / "ton.mp3"
+    image.write_bytes(b"img")
+    audio.write_bytes(b"audio")
+    return [str(image), str(audio)]
+
+
+def test_recorded_output_is_found_after_reload(tmp_path: Path) -> None:
+    inputs = _inputs(tmp_path)
+    settings = {
+        "crf": 23,
+        "out_dir": "egal",
+        "parallel_jobs": 4,
+        "deadline": 1_900_000_000.0,
+    }
+    key = job_key(inputs, settings)
+    output = tmp_path / "out.mp4"
+    output.write_bytes(b"video")
+
+    BatchJournal(tmp_path).record(key, str(output), inputs)
+    journal = BatchJournal(tmp_path)
+
+    assert journal.completed_output(key) == output.resolve()
+    # Ausgabeordner, Parallelitaet und Termin aendern den Schluessel nicht.
+    assert job_key(inputs, {"crf": 23}) == key
+
+
+def test_scheduling_settings_keep_the_key(tmp_path: Path) -> None:
+    inputs = _inputs(tmp_path)
+    base = {"crf": 23, "preset": "medium", "mode": "Standard"}
+    key = job_key(inputs, base)
+
+    for extra in (
+        {"job_order": "longest"},
+        {"keep_queue_open": True},
+        {"deadline_time": "18:00"},
+        {"output_cache": False, "resume": True},
+    ):
+        assert job_key(inputs, {**base, **extra}) == key
+    assert job_key(inputs, {**base, "audio_normalize": True}) != key
+
+
+def test_changed_inputs_or_settings_change_the_key(tmp_path: Path) -> None:
+    inputs = _inputs(tmp_path)
+    key = job_key(inputs, {"crf": 23})
+
+    assert job_key(inputs, {"crf": 28}) != key
+    stat = Path(inputs[1]).stat()
+    os.utime(inputs[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert job_key(inputs, {"crf": 23}) != key
+
+
+def test_modified_or_missing_output_is_not_complete(tmp_path: Path) -> None:
+    inputs = _inputs(tmp_path)
+    key = job_key(inputs, {})
+    output = tmp_path / "out.mp4"
+    output.write_bytes(b"video")
+    journal = BatchJournal(tmp_path)
+    journal.record(key, str(output), inputs)
+
+    output.write_bytes(b"kaputt und laenger")
+    assert journal.completed_output(key) is None
+    output.unlink()
+    assert journal.completed_output(key) is None
+
+
+def test_truncated_journal_line_is_ignored(tmp_path: Path) -> None:
+    (tmp_path / JOURNAL_FILE).write_text('{"key": "a", "output"', "utf-8")
+
+    assert len(BatchJournal(tmp_path)) == 0
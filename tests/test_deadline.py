@@ -0,0 +1,73 @@
+from datetime import datetime, time
+from typing import Optional
+
+import pytest
+
+from core.deadline import (
+    PRESET_COST,
+    choose_preset,
+    next_deadline,
+    preset_seconds,
+)
+from core.encode_history import EncodeProfile, EncodeRecord, EtaPredictor
+
+PROFILE = EncodeProfile("Standard", 1920, 1080, "medium", 23)
+
+
+def _history(preset: str, speed: float) -> EtaPredictor:
+    profile = EncodeProfile("Standard", 1920, 1080, preset, 23)
+    return EtaPredictor(
+        [EncodeRecord(profile, d, d / speed, host="pc") for d in (60, 300)]
+    )
+
+
+def test_next_deadline_rolls_over_to_tomorrow() -> None:
+    now = datetime(2026, 3, 2, 17, 30)
+
+    assert next_deadline(time(18, 0), now) == datetime(2026, 3, 2, 18, 0)
+    assert next_deadline(time(6, 0), now) == datetime(2026, 3, 3, 6, 0)
+
+
+def test_preset_seconds_scales_from_measured_preset() -> None:
+    predictor = _history("fast", speed=10.0)
+
+    estimates = preset_seconds(predictor, PROFILE, [600.0, 400.0], jobs=2)
+
+    assert estimates["fast"] == pytest.approx(50.0)
+    ratio = PRESET_COST["veryslow"] / PRESET_COST["fast"]
+    assert estimates["veryslow"] == pytest.approx(50.0 * ratio)
+    assert preset_seconds(predictor, PROFILE, []) == {}
+    assert preset_seconds(EtaPredictor(), PROFILE, [60.0]) == {}
+
+
+def test_preset_seconds_without_own_mode_uses_current_preset() -> None:
+    other = EncodeProfile("Slideshow", 1920, 1080, "veryfast", 23)
+    predictor = EtaPredictor([EncodeRecord(other, 100.0, 20.0, host="pc")])
+
+    estimates = preset_seconds(predictor, PROFILE, [100.0])
+
+    assert estimates["medium"] == pytest.approx(20.0)
+    assert estimates["slow"] > estimates["medium"] > estimates["fast"]
+
+
+def test_choose_preset_slowest_in_time_with_hysteresis() -> None:
+    estimates = {"veryfast": 50.0, "medium": 100.0, "slow": 160.0}
+
+    def chosen(budget: float, current: Optional[str] = None) -> str:
+        plan = choose_preset(estimates, budget, current)
+        assert plan is not None
+        return plan.preset
+
+    assert chosen(200.0) == "slow"
+    assert chosen(120.0) == "medium"
+    # "slow" passt noch knapp: kein Wechsel bei kleiner Schwankung.
+    assert chosen(170.0, current="slow") == "slow"
+    assert chosen(150.0, current="slow") == "medium"
+
+
+def test_choose_preset_reports_missed_deadline() -> None:
+    plan = choose_preset({"ultrafast": 90.0, "medium": 300.0}, 60.0)
+
+    assert plan is not None
+    assert (plan.preset, plan.on_time) == ("ultrafast", False)
+    assert choose_preset({}, 60.0) is None
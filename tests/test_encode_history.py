@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from core.encode_history import (
+    MAX_FACTOR,
+    EncodeHistory,
+    EncodeProfile,
+    EncodeRecord,
+    EtaPredictor,
+    RunningEta,
+    remaining_seconds,
+)
+
+FAST = EncodeProfile("Standard", 1920, 1080, "ultrafast", 23)
+SLOW = EncodeProfile("Standard", 1920, 1080, "slow", 23)
+
+
+def _record(profile: EncodeProfile, duration: float, wall: float, jobs=1):
+    return EncodeRecord(profile, duration, wall, jobs, load=0.5, host="pc")
+
+
+def test_history_round_trip(tmp_path: Path) -> None:
+    history = EncodeHistory(tmp_path / "history.sqlite3")
+    history.record(_record(FAST, 120.0, 10.0, jobs=2))
+    history.record(_record(SLOW, 60.0, 30.0))
+    history.close()
+
+    records = EncodeHistory(tmp_path / "history.sqlite3").recent(host="pc")
+
+    assert [r.profile.preset for r in records] == ["ultrafast", "slow"]
+    assert records[0].speed == pytest.approx(12.0)
+    assert records[0].jobs == 2
+    assert EncodeHistory(tmp_path / "history.sqlite3").recent(host="x") == []
+
+
+def test_predictor_fits_line_per_group() -> None:
+    # 5 s Start plus 0.1 s je Sekunde Material.
+    records = [_record(FAST, d, 5.0 + 0.1 * d) for d in (60, 120, 600)]
+    records.append(_record(SLOW, 100.0, 80.0))
+    predictor = EtaPredictor(records)
+
+    assert predictor.predict(FAST, 300.0) == pytest.approx(35.0)
+    assert predictor.predict(SLOW, 50.0) == pytest.approx(40.0)
+    # Halbe Bildflaeche, halbe Rechenzeit (ohne Startanteil).
+    small = EncodeProfile("Standard", 1920, 540, "ultrafast", 23)
+    assert predictor.predict(small, 300.0) == pytest.approx(20.0)
+    assert predictor.predict(FAST, 0.0) is None
+    assert EtaPredictor().predict(FAST, 60.0) is None
+
+
+def test_predictor_falls_back_and_learns() -> None:
+    predictor = EtaPredictor([_record(FAST, 100.0, 10.0, jobs=2)] * 3)
+    video = EncodeProfile("Video + Audio", 1920, 1080, "medium", 23)
+
+    assert predictor.predict(video, 100.0) == pytest.approx(10.0)
+    predictor.add(_record(video, 100.0, 50.0))
+    assert predictor.predict(video, 200.0) == pytest.approx(100.0)
+    assert predictor.batch_seconds(FAST, [100.0, 100.0]) == pytest.approx(10.0)
+    assert predictor.batch_seconds(FAST, [100.0], jobs=1) == pytest.approx(10.0)
+
+
+def test_running_eta_corrects_and_flags_slowdown() -> None:
+    eta = RunningEta()
+    eta.observe(10.0, 30.0)
+    assert eta.factor == 1.0
+
+    eta.observe(40.0, 70.0)
+    assert eta.factor == pytest.approx(2.0)
+    assert eta.slow
+
+    eta.observe(10.0, 1000.0)
+    assert eta.factor == MAX_FACTOR
+    assert remaining_seconds([10.0, 20.0], [6.0], jobs=2, factor=2.0) == 33.0
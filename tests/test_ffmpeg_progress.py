@@ -0,0 +1,75 @@
+from core.ffmpeg_progress import (
+    PROGRESS_ARGS,
+    ProgressReader,
+    with_progress_args,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _block(reader: ProgressReader, out_us: int, speed: str, state: str):
+    result = None
+    for line in (
+        "frame=10",
+        "fps=25.0",
+        "bitrate= 812.4kbits/s",
+        f"out_time_us={out_us}",
+        f"speed={speed}",
+        f"progress={state}",
+    ):
+        result = reader.feed(line + "\n")
+    return result
+
+
+def test_with_progress_args_inserts_once() -> None:
+    cmd = ["ffmpeg", "-y", "-i", "a.mp3", "out.mp4"]
+
+    patched = with_progress_args(cmd)
+
+    assert patched[1:4] == PROGRESS_ARGS
+    assert with_progress_args(patched) == patched
+
+
+def test_reader_parses_block_and_eta() -> None:
+    clock = _Clock()
+    reader = ProgressReader(100.0, interval=0.25, clock=clock)
+
+    snap = _block(reader, 25_000_000, "2.5x", "continue")
+
+    assert snap is not None
+    assert snap.percent == 25.0
+    assert snap.speed == 2.5
+    assert snap.fps == 25.0
+    assert snap.bitrate == "812.4kbits/s"
+    assert snap.eta == 30.0
+
+
+def test_reader_throttles_but_always_reports_end() -> None:
+    clock = _Clock()
+    reader = ProgressReader(10.0, interval=1.0, clock=clock)
+
+    assert _block(reader, 1_000_000, "1x", "continue") is not None
+    clock.now = 0.5
+    assert _block(reader, 2_000_000, "1x", "continue") is None
+    clock.now = 0.6
+    end = _block(reader, 10_000_000, "1x", "end")
+
+    assert end is not None and end.done
+    assert end.percent == 100.0
+
+
+def test_reader_falls_back_to_wall_clock_without_speed() -> None:
+    clock = _Clock()
+    reader = ProgressReader(40.0, clock=clock)
+    clock.now = 5.0
+
+    snap = _block(reader, 10_000_000, "N/A", "continue")
+
+    assert snap is not None
+    assert snap.eta == 15.0
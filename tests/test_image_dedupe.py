@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from core import image_dedupe
+from core.image_dedupe import (
+    BKTree,
+    find_duplicates,
+    group_duplicates,
+    hamming,
+    redundant_images,
+)
+from core.probe_cache import ProbeCache
+
+
+def test_bk_tree_finds_values_within_radius() -> None:
+    tree = BKTree()
+    for index, value in enumerate([0b0000, 0b0001, 0b0111, 0b1111_0000]):
+        tree.add(value, index)
+
+    assert sorted(tree.search(0b0000, 1)) == [0, 1]
+    assert sorted(tree.search(0b0011, 1)) == [1, 2]
+    assert tree.search(0b1111_1111, 2) == []
+    assert hamming(0b1010, 0b0101) == 4
+
+
+def test_group_duplicates_keeps_input_order() -> None:
+    hashes = [0xFF00, 0x1234, 0xFF01, None, 0x1234, 0xFF00]
+
+    assert group_duplicates(hashes, threshold=1) == [[0, 2, 5], [1, 4]]
+    assert group_duplicates(hashes, threshold=0) == [[0, 5], [1, 4]]
+
+
+def test_redundant_images_skips_first_of_each_group() -> None:
+    groups = [["a.jpg", "b.jpg", "c.png"], ["d.jpg", "e.jpg"]]
+
+    assert redundant_images(groups) == {"b.jpg", "c.png", "e.jpg"}
+
+
+def test_find_duplicates_hashes_once(tmp_path: Path, monkeypatch) -> None:
+    images = []
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        image = tmp_path / name
+        image.write_bytes(name.encode())
+        images.append(str(image))
+    values = {"a.jpg": 0xF0F0, "b.jpg": 0xF0F1, "c.jpg": 0x0F0F}
+    calls: list = []
+
+    def _fake_dhash(path):
+        calls.append(path)
+        return values[Path(path).name]
+
+    monkeypatch.setattr(image_dedupe, "_dhash_safely", _fake_dhash)
+    db = tmp_path / "hashes.sqlite3"
+
+    first = find_duplicates(images, cache=ProbeCache(db))
+    again = find_duplicates(images, cache=ProbeCache(db))
+
+    assert first == again == [images[:2]]
+    assert len(calls) == 3
+
+
+def test_dhash_matches_rescaled_copy(tmp_path: Path) -> None:
+    pil = pytest.importorskip("PIL.Image")
+    image = pil.new("L", (64, 48))
+    image.putdata([(x * 4 + y) % 256 for y in range(48) for x in range(64)])
+    image.save(tmp_path / "a.png")
+    image.resize((32, 24)).save(tmp_path / "b.jpg", quality=80)
+    pil.new("L", (64, 48), 128).save(tmp_path / "c.png")
+
+    a, b, c = (
+        image_dedupe.dhash(str(tmp_path / n))
+        for n in ("a.png", "b.jpg", "c.png")
+    )
+
+    assert hamming(a, b) <= image_dedupe.DUPLICATE_THRESHOLD
+    assert hamming(a, c) > image_dedupe.DUPLICATE_THRESHOLD
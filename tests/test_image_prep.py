@@ -0,0 +1,117 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from core import image_prep
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _photo(path: Path, size, orientation: int = 1) -> Path:
+    img = Image.new("RGB", size, (200, 30, 30))
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    img.save(path, format="JPEG", exif=exif.tobytes())
+    return path
+
+
+def test_contain_pads_to_target_size(tmp_path: Path) -> None:
+    src = _photo(tmp_path / "breit.jpg", (4000, 1000))
+
+    [frame] = image_prep.prepare_images(
+        [src], 320, 180, background="#00ff00", root=tmp_path / "prep"
+    )
+
+    with Image.open(frame) as img:
+        assert img.size == (320, 180)
+        top = img.getpixel((160, 2))
+    assert top[1] > 200 and top[0] < 60
+
+
+def test_exif_rotation_and_cover(tmp_path: Path) -> None:
+    # Querformat mit Ausrichtung 6 ist eigentlich ein Hochformat-Foto.
+    src = _photo(tmp_path / "hoch.jpg", (1600, 1200), orientation=6)
+
+    [frame] = image_prep.prepare_images(
+        [src], 90, 160, fit_mode="cover", root=tmp_path / "prep"
+    )
+
+    with Image.open(frame) as img:
+        assert img.size == (90, 160)
+
+
+def test_raw_frame_has_exact_rgb24_size(tmp_path: Path) -> None:
+    src = _photo(tmp_path / "gross.jpg", (3000, 2000))
+
+    [frame] = image_prep.prepare_images(
+        [src], 64, 36, root=tmp_path / "prep", suffix=image_prep.RAW_SUFFIX
+    )
+
+    assert frame.suffix == image_prep.RAW_SUFFIX
+    assert frame.stat().st_size == 64 * 36 * 3
+
+
+def test_results_are_cached_and_failures_fall_back(tmp_path: Path) -> None:
+    good = _photo(tmp_path / "gut.jpg", (800, 600))
+    broken = tmp_path / "kaputt.jpg"
+    broken.write_bytes(b"kein bild")
+    root = tmp_path / "prep"
+
+    first = image_prep.prepare_images([good, broken], 160, 90, root=root)
+    mtime = first[0].stat().st_mtime_ns
+    second = image_prep.prepare_images([good], 160, 90, root=root)
+
+    assert first[1] == broken
+    assert second[0] == first[0]
+    assert second[0].stat().st_mtime_ns >= mtime
+    assert not list(root.glob("*.part"))
+
+
+def test_process_pool_path(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(image_prep, "POOL_THRESHOLD", 2)
+    images = [_photo(tmp_path / f"b{i}.jpg", (640, 480)) for i in range(3)]
+
+    frames = image_prep.prepare_images(
+        images, 64, 36, root=tmp_path / "prep", max_workers=2
+    )
+
+    assert len(set(frames)) == 3
+    assert all(f.parent == tmp_path / "prep" for f in frames)
+
+
+def test_parallel_jobs_share_one_prepared_frame(
+    tmp_path: Path, monkeypatch
+) -> None:
+    src = _photo(tmp_path / "foto.jpg", (1200, 900))
+    root = tmp_path / "prep"
+    calls: list = []
+    original = image_prep.prepare_image
+
+    def slow_prepare(*args, **kwargs):
+        calls.append(args[1])
+        time.sleep(0.05)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(image_prep, "prepare_image", slow_prepare)
+    results: list = []
+    workers = [
+        threading.Thread(
+            target=lambda: results.append(
+                image_prep.prepare_images(
+                    [src], 64, 36, root=root, suffix=image_prep.RAW_SUFFIX
+                )[0]
+            )
+        )
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=5)
+
+    assert len(calls) == 1
+    assert len(set(results)) == 1 and results[0].parent == root
+    assert results[0].stat().st_size == 64 * 36 * 3
+    assert not list(root.glob("*.part"))
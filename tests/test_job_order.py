@@ -0,0 +1,56 @@
+import pytest
+
+import videobatch_professional
+from core.job_order import (
+    JOB_OVERHEAD_SECONDS,
+    ORDER_LONGEST,
+    ORDER_SHORTEST,
+    ORDER_TABLE,
+    job_cost,
+    order_jobs,
+)
+
+
+def test_job_cost_weights_mode_still_and_renditions() -> None:
+    base = job_cost(100.0, "Standard") - JOB_OVERHEAD_SECONDS
+
+    assert base == pytest.approx(100.0)
+    assert job_cost(100.0, "Video + Audio") > job_cost(100.0, "Slideshow")
+    assert job_cost(100.0, "Standard", still=True) < job_cost(30.0)
+    assert job_cost(100.0, renditions=3) == pytest.approx(
+        2 * base + JOB_OVERHEAD_SECONDS
+    )
+    assert job_cost(0.0) == job_cost(-5.0) == JOB_OVERHEAD_SECONDS
+
+
+def test_order_jobs_policies_are_stable() -> None:
+    jobs = ["a", "b", "c", "d"]
+    costs = {"a": 10.0, "b": 300.0, "c": 10.0, "d": 45.0}
+
+    def cost(job: str) -> float:
+        return costs[job]
+
+    assert order_jobs(jobs, ORDER_LONGEST, cost) == ["b", "d", "a", "c"]
+    assert order_jobs(jobs, ORDER_SHORTEST, cost) == ["a", "c", "d", "b"]
+    assert order_jobs(jobs, ORDER_TABLE, cost) == jobs
+
+
+def test_order_manifest_weights_by_mode(monkeypatch) -> None:
+    probed: list = []
+
+    def _duration(job):
+        probed.append(job["audio"])
+        return {"a.mp3": 60.0, "b.mp3": 100.0, "c.mp3": 90.0}[job["audio"]]
+
+    monkeypatch.setattr(videobatch_professional, "_job_duration", _duration)
+    jobs = [
+        {"source": "a.mp4", "audio": "a.mp3", "mode": "video"},
+        {"source": "b.jpg", "audio": "b.mp3", "mode": "slideshow"},
+        {"source": "c.jpg", "audio": "c.mp3", "mode": "slideshow"},
+    ]
+
+    ordered = videobatch_professional.order_manifest(jobs, ORDER_LONGEST)
+
+    assert [j["audio"] for j in ordered] == ["b.mp3", "c.mp3", "a.mp3"]
+    assert sorted(probed) == ["a.mp3", "b.mp3", "c.mp3"]
+    assert videobatch_professional.order_manifest(jobs, ORDER_TABLE) == jobs
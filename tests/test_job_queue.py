@@ -0,0 +1,115 @@
+import threading
+from pathlib import Path
+
+from core.job_queue import (
+    DONE,
+    FAILED,
+    PENDING,
+    RUNNING,
+    JobQueue,
+    LeaseKeeper,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_claim_complete_and_results(tmp_path: Path) -> None:
+    queue = JobQueue(tmp_path / "q.sqlite3")
+    queue.enqueue("b1", [{"n": 1}, {"n": 2}])
+
+    first = queue.claim("w1", "b1")
+    second = queue.claim("w2", "b1")
+
+    assert first is not None and second is not None
+    assert (first.payload, second.payload) == ({"n": 1}, {"n": 2})
+    assert queue.claim("w3", "b1") is None
+    assert not queue.complete(first.id, "w2", {"ok": True})
+    assert queue.complete(first.id, "w1", {"ok": True})
+    assert queue.complete(second.id, "w2", {"ok": False}, ok=False)
+    assert queue.counts("b1") == {PENDING: 0, RUNNING: 0, DONE: 1, FAILED: 1}
+    assert queue.results("b1") == [{"ok": True}, {"ok": False}]
+
+
+def test_expired_lease_is_reclaimed(tmp_path: Path) -> None:
+    clock = _Clock()
+    queue = JobQueue(tmp_path / "q.sqlite3", lease_seconds=10, clock=clock)
+    queue.enqueue("b1", [{"n": 1}])
+    job = queue.claim("w1", "b1")
+    assert job is not None
+
+    clock.now += 5
+    assert queue.heartbeat(job.id, "w1")
+    clock.now += 9
+    assert queue.claim("w2", "b1") is None
+
+    clock.now += 2
+    retry = queue.claim("w2", "b1")
+    assert retry is not None
+    assert retry.attempts == 2
+    assert not queue.heartbeat(job.id, "w1")
+    assert not queue.complete(job.id, "w1", {"ok": True})
+
+
+def test_job_fails_after_max_attempts(tmp_path: Path) -> None:
+    clock = _Clock()
+    queue = JobQueue(
+        tmp_path / "q.sqlite3", lease_seconds=1, max_attempts=2, clock=clock
+    )
+    queue.enqueue("b1", [{"n": 1}])
+    assert queue.claim("w1", "b1") is not None
+    clock.now += 2
+    assert queue.claim("w2", "b1") is not None
+    clock.now += 2
+
+    assert queue.claim("w3", "b1") is None
+    assert queue.counts("b1")[FAILED] == 1
+
+
+def test_parallel_workers_never_share_a_job(tmp_path: Path) -> None:
+    db = tmp_path / "q.sqlite3"
+    JobQueue(db).enqueue("b1", [{"n": i} for i in range(40)])
+    claimed = []
+    lock = threading.Lock()
+
+    def _worker(name: str) -> None:
+        queue = JobQueue(db)
+        while True:
+            job = queue.claim(name, "b1")
+            if job is None:
+                break
+            with lock:
+                claimed.append(job.payload["n"])
+            queue.complete(job.id, name, {"ok": True})
+        queue.close()
+
+    threads = [
+        threading.Thread(target=_worker, args=(f"w{i}",)) for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == list(range(40))
+
+
+def test_lease_keeper_reports_lost_lease(tmp_path: Path) -> None:
+    clock = _Clock()
+    queue = JobQueue(tmp_path / "q.sqlite3", lease_seconds=3, clock=clock)
+    queue.enqueue("b1", [{"n": 1}])
+    job = queue.claim("w1", "b1")
+    assert job is not None
+    clock.now += 10
+    assert queue.claim("w2", "b1") is not None
+    lost = threading.Event()
+
+    with LeaseKeeper(queue, job, lost.set) as lease:
+        assert lost.wait(timeout=5)
+
+    assert lease.lost
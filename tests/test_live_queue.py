@@ -0,0 +1,73 @@
+import threading
+import time
+
+from core.live_queue import LiveQueue
+
+
+def test_take_closes_when_idle_after_last_job() -> None:
+    queue = LiveQueue(["a", "b"])
+
+    assert queue.take() == "a"
+    assert queue.take() == "b"
+    queue.done()
+    queue.done()
+
+    assert queue.take() is None
+    assert queue.closed
+    assert queue.put("c") is False
+
+
+def test_items_added_while_busy_are_picked_up() -> None:
+    queue = LiveQueue(["a"])
+    assert queue.take() == "a"
+    got: list = []
+    consumer = threading.Thread(target=lambda: got.append(queue.take()))
+    consumer.start()
+
+    # Ein Job laeuft noch: der zweite Worker wartet statt aufzugeben.
+    time.sleep(0.05)
+    assert consumer.is_alive()
+    assert queue.put("b")
+    consumer.join(timeout=2)
+
+    assert got == ["b"]
+
+
+def test_cancel_and_move_to_front_use_identity() -> None:
+    first, second, third = [1], [1], [2]
+    queue = LiveQueue([first, second, third])
+
+    assert queue.move_to_front(third)
+    assert queue.cancel(second)
+    assert not queue.cancel(second)
+
+    assert [id(x) for x in queue.pending()] == [id(third), id(first)]
+    assert queue.take() is third
+
+
+def test_keep_open_waits_until_released() -> None:
+    queue: LiveQueue[str] = LiveQueue(close_when_idle=False)
+    got: list = []
+    consumer = threading.Thread(target=lambda: got.append(queue.take()))
+    consumer.start()
+
+    time.sleep(0.05)
+    assert consumer.is_alive()
+    queue.set_close_when_idle(True)
+    consumer.join(timeout=2)
+
+    assert got == [None]
+    assert queue.closed
+
+
+def test_key_keeps_added_jobs_sorted_behind_pinned() -> None:
+    queue = LiveQueue([30, 10, 20], key=lambda value: -value)
+    assert queue.pending() == [30, 20, 10]
+
+    assert queue.move_to_front(10)
+    queue.extend([25, 99])
+
+    assert queue.pending() == [10, 99, 30, 25, 20]
+    assert queue.take() == 10
+    queue.put(50)
+    assert queue.pending() == [99, 50, 30, 25, 20]
@@ -0,0 +1,95 @@
+import subprocess
+from pathlib import Path
+
+from core.audio_copy import AudioDecision
+from core.loudness import (
+    LoudnessMeasurement,
+    loudnorm_filter,
+    measure_loudness,
+    parse_measurement,
+    with_loudnorm,
+)
+from core.probe_cache import ProbeCache
+
+OUTPUT = """[Parsed_loudnorm_0 @ 0x1]
+{
+	"input_i" : "-21.75",
+	"input_tp" : "-14.46",
+	"input_lra" : "2.10",
+	"input_thresh" : "-31.75",
+	"output_i" : "-16.02",
+	"target_offset" : "0.05"
+}
+"""
+
+
+def _fake_runner(calls, stderr=OUTPUT, code=0):
+    def _run(cmd):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, code, "", stderr)
+
+    return _run
+
+
+def test_parse_measurement_reads_json_block() -> None:
+    measurement = parse_measurement("Eingabe ...\n" + OUTPUT)
+
+    assert measurement == LoudnessMeasurement(-21.75, 2.1, -14.46, -31.75, 0.05)
+    assert parse_measurement("keine Messung") is None
+    assert parse_measurement(OUTPUT.replace('"-21.75"', '"-inf"')) is None
+
+
+def test_loudnorm_filter_uses_measured_values_linear() -> None:
+    text = loudnorm_filter(
+        LoudnessMeasurement(-21.75, 2.1, -14.46, -31.75, 0.05), 44100
+    )
+
+    assert text.startswith("loudnorm=I=-16:LRA=11:TP=-1.5:measured_I=-21.75")
+    assert ":offset=0.05:linear=true" in text
+    assert text.endswith(",aresample=44100")
+
+
+def test_measure_loudness_runs_analysis_once(tmp_path: Path) -> None:
+    audio = tmp_path / "ton.m4a"
+    audio.write_bytes(b"audio")
+    db = tmp_path / "loudness.sqlite3"
+    calls: list = []
+
+    first = measure_loudness(str(audio), ProbeCache(db), _fake_runner(calls))
+    again = measure_loudness(str(audio), ProbeCache(db), _fake_runner(calls))
+
+    assert first is not None and again == first
+    assert len(calls) == 1
+    assert "print_format=json" in calls[0][calls[0].index("-af") + 1]
+
+
+def test_measure_loudness_remembers_silence_and_skips_errors(
+    tmp_path: Path,
+) -> None:
+    audio = tmp_path / "stille.wav"
+    audio.write_bytes(b"audio")
+    cache = ProbeCache(tmp_path / "loudness.sqlite3")
+    calls: list = []
+    silent = OUTPUT.replace('"-21.75"', '"-inf"')
+
+    assert (
+        measure_loudness(str(audio), cache, _fake_runner(calls, code=1)) is None
+    )
+    assert (
+        measure_loudness(str(audio), cache, _fake_runner(calls, silent)) is None
+    )
+    assert measure_loudness(str(audio), cache, _fake_runner(calls)) is None
+    assert len(calls) == 2
+
+
+def test_with_loudnorm_appends_filter(monkeypatch) -> None:
+    monkeypatch.setattr(
+        "core.loudness.normalize_filter",
+        lambda audio, runner=None: f"loudnorm:{audio}",
+    )
+    decision = AudioDecision(["-c:a", "aac"], False, "Audiofilter aktiv")
+
+    result = with_loudnorm(decision, "ton.m4a")
+
+    assert result.args == ["-c:a", "aac", "-af", "loudnorm:ton.m4a"]
+    assert decision.args == ["-c:a", "aac"]
@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+
+from core.output_cache import (
+    OutputCache,
+    link_or_copy,
+    normalize_command,
+    unlink_shared,
+)
+
+
+def test_normalize_command_ignores_paths_and_volatile_args() -> None:
+    cmd = [
+        "ffmpeg",
+        "-progress",
+        "pipe:1",
+        "-y",
+        "-i",
+        "/a/bild.jpg",
+        "-crf",
+        "23",
+        "/out/x_20250101.mp4",
+    ]
+
+    normalized = normalize_command(
+        cmd, {"/a/bild.jpg": "{image}", "/out/x_20250101.mp4": "{output}"}
+    )
+
+    assert normalized == ["-i", "{image}", "-crf", "23", "{output}"]
+
+
+def test_key_depends_on_content_not_path(tmp_path: Path) -> None:
+    first = tmp_path / "a.mp3"
+    second = tmp_path / "kopie.mp3"
+    first.write_bytes(b"gleich")
+    second.write_bytes(b"gleich")
+    cache = OutputCache(tmp_path / "cache")
+
+    def _key(path: Path, crf: str = "23") -> str:
+        cmd = ["ffmpeg", "-i", str(path), "-crf", crf, "out.mp4"]
+        return cache.key_for([str(path)], cmd, {str(path): "{audio}"})
+
+    assert _key(first) == _key(second)
+    assert _key(first) != _key(first, crf="28")
+
+
+def test_store_fetch_and_lru_eviction(tmp_path: Path) -> None:
+    cache = OutputCache(tmp_path / "cache", max_bytes=10)
+    old = tmp_path / "alt.mp4"
+    new = tmp_path / "neu.mp4"
+    old.write_bytes(b"123456")
+    new.write_bytes(b"abcdef")
+
+    cache.store("aa11", old)
+    stored = cache.path_for("aa11", ".mp4")
+    old.unlink()
+    os.utime(stored.with_name(stored.name + ".used"), (1, 1))
+    cache.store("bb22", new)
+    new.unlink()
+    cache.evict()
+
+    assert not stored.exists()
+    assert not stored.with_name(stored.name + ".used").exists()
+    target = tmp_path / "out" / "ziel.mp4"
+    assert cache.fetch("bb22", target) is not None
+    assert target.read_bytes() == b"abcdef"
+    assert cache.fetch("aa11", tmp_path / "out" / "fehlt.mp4") is None
+
+
+def test_link_or_copy_replaces_existing_target(tmp_path: Path) -> None:
+    src = tmp_path / "src.mp4"
+    dst = tmp_path / "dst.mp4"
+    src.write_bytes(b"neu")
+    dst.write_bytes(b"alt")
+
+    assert link_or_copy(src, dst) in {"Hardlink", "Reflink", "Kopie"}
+    assert dst.read_bytes() == b"neu"
+
+
+def test_fetch_keeps_linked_outputs_untouched(tmp_path: Path) -> None:
+    cache = OutputCache(tmp_path / "cache")
+    first = tmp_path / "erste.mp4"
+    first.write_bytes(b"video")
+    cache.store("cc33", first)
+    second = tmp_path / "zweite.mp4"
+
+    assert cache.fetch("cc33", second) is not None
+    os.utime(second, (1000, 1000))
+    assert cache.fetch("cc33", tmp_path / "dritte.mp4") is not None
+    # Hardlinks teilen die mtime: der Treffer darf sie nicht aendern.
+    assert second.stat().st_mtime == 1000
+    # Noch verlinkte Eintraege belegen keinen eigenen Platz.
+    cache.max_bytes = 1
+    assert cache.evict() == 0
+    assert cache.path_for("cc33", ".mp4").exists()
+
+
+def test_overwritten_output_keeps_cache_entry(tmp_path: Path) -> None:
+    cache = OutputCache(tmp_path / "cache")
+    output = tmp_path / "out.mp4"
+    output.write_bytes(b"video")
+    cache.store("dd44", output)
+    again = tmp_path / "again.mp4"
+    cache.fetch("dd44", again)
+
+    # Wie ffmpeg -y: an Ort und Stelle ueberschreiben.
+    with output.open("r+b") as handle:
+        handle.truncate(0)
+    unlink_shared(again)
+    again.write_bytes(b"neu")
+
+    assert cache.path_for("dd44", ".mp4").read_bytes() == b"video"
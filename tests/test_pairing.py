@@ -0,0 +1,74 @@
+import time
+
+from core.pairing import (
+    NUMBER_CONFIDENCE,
+    name_key,
+    pair_by_name,
+)
+
+
+def test_name_key_normalizes_case_numbers_and_roles() -> None:
+    assert name_key("/bilder/Lied 01 (Cover).JPG") == name_key("lied_1.mp3")
+    assert name_key("Intro.jpg").text == "intro"
+    assert name_key("Track 07 - Final.png").numbers == (7,)
+    assert name_key("cover.jpg").text == "cover"
+
+
+def test_pair_by_name_ignores_list_position() -> None:
+    images = ["a/Lied 01.jpg", "a/Lied 02.jpg", "a/Lied 03.jpg"]
+    audios = ["b/lied_3.mp3", "b/lied_1.mp3"]
+
+    result = pair_by_name(images, audios)
+
+    assert [(m.image, m.audio) for m in result.matches] == [
+        ("a/Lied 01.jpg", "b/lied_1.mp3"),
+        ("a/Lied 03.jpg", "b/lied_3.mp3"),
+    ]
+    assert all(m.confidence == 1.0 for m in result.matches)
+    assert result.unmatched_images == ["a/Lied 02.jpg"]
+    assert result.unmatched_audios == []
+
+
+def test_pair_by_name_fuzzy_reports_confidence() -> None:
+    images = ["Sommerregen final.jpg", "Herbstwind.jpg", "Morgenrot.jpg"]
+    audios = ["Herbstwind v2.wav", "Sommer Regen.wav", "Unbekannt.wav"]
+
+    result = pair_by_name(images, audios)
+
+    pairs = {m.image: (m.audio, m.confidence) for m in result.matches}
+    assert pairs["Sommerregen final.jpg"][0] == "Sommer Regen.wav"
+    assert pairs["Herbstwind.jpg"][0] == "Herbstwind v2.wav"
+    assert all(0 < conf < 1.0 for _, conf in pairs.values())
+    assert result.fuzzy == 2
+    assert result.unmatched_images == ["Morgenrot.jpg"]
+    assert result.unmatched_audios == ["Unbekannt.wav"]
+
+
+def test_pair_by_name_never_mixes_numbers() -> None:
+    result = pair_by_name(["track_12.jpg"], ["track_13.mp3"])
+
+    assert result.matches == []
+
+
+def test_pair_by_name_falls_back_to_unique_numbers() -> None:
+    images = ["IMG_0001.jpg", "IMG_0002.jpg"]
+    audios = ["Aufnahme 2.m4a", "Aufnahme 1.m4a"]
+
+    result = pair_by_name(images, audios)
+
+    assert [(m.audio, m.confidence) for m in result.matches] == [
+        ("Aufnahme 1.m4a", NUMBER_CONFIDENCE),
+        ("Aufnahme 2.m4a", NUMBER_CONFIDENCE),
+    ]
+
+
+def test_pair_by_name_scales_to_large_drops() -> None:
+    images = [f"bilder/Song {i:05d}_cover.jpg" for i in range(10000)]
+    audios = [f"audio/song_{i}.mp3" for i in reversed(range(10000))]
+
+    start = time.perf_counter()
+    result = pair_by_name(images, audios)
+
+    assert time.perf_counter() - start < 5
+    assert len(result.matches) == 10000
+    assert result.matches[42].audio == "audio/song_42.mp3"
@@ -0,0 +1,131 @@
+import threading
+
+from core import parallelism
+from core.parallelism import (
+    COPY,
+    ENCODE,
+    AdaptiveScheduler,
+    job_kind,
+    with_thread_args,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_job_kind_and_thread_args() -> None:
+    encode = ["ffmpeg", "-i", "a", "-c:v", "libx264", "-c:a", "copy", "o.mp4"]
+    copy = ["ffmpeg", "-i", "a", "-c:v", "copy", "o.mp4"]
+
+    assert job_kind(encode) == ENCODE
+    assert job_kind(copy) == COPY
+    assert with_thread_args(encode, 4)[3:7] == [
+        "-c:v",
+        "libx264",
+        "-threads",
+        "4",
+    ]
+    assert with_thread_args(copy, 0) == copy
+    assert with_thread_args(copy, 2)[-3:] == ["-threads", "2", "o.mp4"]
+
+
+def test_thread_args_apply_to_every_output() -> None:
+    ladder = [
+        "ffmpeg",
+        "-i",
+        "a",
+        "-map",
+        "[v0]",
+        "-c:v",
+        "libx264",
+        "a.mp4",
+        "-c:v",
+        "libx264",
+        "b.mp4",
+    ]
+
+    result = with_thread_args(ladder, 3)
+
+    assert result.count("-threads") == 2
+    assert result[-1] == "b.mp4"
+    assert result[result.index("a.mp4") - 2 :][:2] == ["-threads", "3"]
+
+
+def test_fixed_mode_shares_cores_between_jobs() -> None:
+    scheduler = AdaptiveScheduler(fixed=4, cpus=16)
+    stop = threading.Event()
+
+    tokens = [scheduler.acquire(ENCODE) for _ in range(4)]
+    stop.set()
+
+    assert scheduler.threads_for(ENCODE) == 4
+    assert scheduler.acquire(COPY, stop) is None
+    first = tokens[0]
+    assert first is not None
+    scheduler.release(first, ENCODE)
+    assert scheduler.acquire(COPY, stop) is not None
+
+
+def test_auto_mode_has_separate_copy_cap() -> None:
+    scheduler = AdaptiveScheduler(cpus=8, load=lambda: 0.0)
+    stop = threading.Event()
+    stop.set()
+
+    assert scheduler.encode_target == 2
+    assert scheduler.acquire(ENCODE) and scheduler.acquire(ENCODE)
+    assert scheduler.acquire(ENCODE, stop) is None
+    assert all(scheduler.acquire(COPY, stop) for _ in range(8))
+    assert scheduler.threads_for(COPY) == 0
+
+
+def test_auto_mode_scales_with_load_and_throughput() -> None:
+    clock = _Clock()
+    load = {"value": 1.0}
+    scheduler = AdaptiveScheduler(
+        cpus=8, load=lambda: load["value"], clock=clock
+    )
+    first = scheduler.acquire(ENCODE)
+    second = scheduler.acquire(ENCODE)
+    assert first is not None and second is not None
+
+    scheduler.report_speed(second, 1.0)
+    clock.now += parallelism.ADJUST_INTERVAL
+    scheduler.report_speed(first, 1.0)
+    assert scheduler.encode_target == 3
+
+    third = scheduler.acquire(ENCODE)
+    assert third is not None
+    scheduler.report_speed(second, 0.7)
+    scheduler.report_speed(third, 0.6)
+    clock.now += parallelism.ADJUST_INTERVAL
+    # Kein Gewinn durch den dritten Job: zurueck auf zwei.
+    scheduler.report_speed(first, 0.7)
+    assert scheduler.encode_target == 2
+
+    load["value"] = 20.0
+    clock.now += parallelism.ADJUST_INTERVAL
+    scheduler.report_speed(first, 1.0)
+    assert scheduler.encode_target == 1
+
+
+def test_silent_jobs_do_not_count_as_slowdown() -> None:
+    clock = _Clock()
+    scheduler = AdaptiveScheduler(cpus=8, load=lambda: 1.0, clock=clock)
+    first = scheduler.acquire(ENCODE)
+    second = scheduler.acquire(ENCODE)
+    assert first is not None and second is not None
+    scheduler.report_speed(second, 1.0)
+    clock.now += parallelism.ADJUST_INTERVAL
+    scheduler.report_speed(first, 1.0)
+    assert scheduler.encode_target == 3
+
+    # Ein Abschnitts-Job ohne -progress meldet nie ein Tempo.
+    assert scheduler.acquire(ENCODE) is not None
+    clock.now += parallelism.ADJUST_INTERVAL
+    scheduler.report_speed(first, 1.0)
+    assert scheduler.encode_target == 4
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from core.preview import (
+    PreviewSpec,
+    preview_settings,
+    preview_size,
+    preview_windows,
+    read_concat_list,
+    render_preview,
+    window_command,
+)
+from core.segments import write_list
+
+
+def test_preview_size_keeps_aspect_and_even_width() -> None:
+    assert preview_size(1920, 1080) == (640, 360)
+    assert preview_size(1000, 750) == (480, 360)
+    assert preview_size(320, 240) == (320, 240)
+
+
+def test_preview_settings_are_small_fast_and_throwaway(tmp_path: Path) -> None:
+    settings = preview_settings(
+        {"width": 1920, "height": 1080, "crf": 18, "preset": "slow"}, tmp_path
+    )
+
+    assert (settings["width"], settings["height"]) == (640, 360)
+    assert settings["preset"] == "ultrafast"
+    assert settings["out_dir"] == str(tmp_path)
+    assert not settings["output_cache"] and not settings["resume"]
+
+
+def test_preview_windows_spread_over_duration() -> None:
+    assert preview_windows(600.0, PreviewSpec(10.0, 1)) == [(0.0, 10.0)]
+    assert preview_windows(5.0, PreviewSpec(10.0, 3)) == [(0.0, 5.0)]
+    assert preview_windows(600.0, PreviewSpec(10.0, 3)) == [
+        (0.0, 10.0),
+        (295.0, 10.0),
+        (590.0, 10.0),
+    ]
+
+
+def test_window_command_seeks_inputs_but_not_still_loops(
+    tmp_path: Path,
+) -> None:
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-loop",
+        "1",
+        "-i",
+        "bild.jpg",
+        "-i",
+        "ton.m4a",
+        "-shortest",
+        "out.mp4",
+    ]
+
+    result = window_command(cmd, 30.0, 5.0, "vorschau.mp4", tmp_path)
+
+    assert result[2:6] == ["-loop", "1", "-i", "bild.jpg"]
+    assert result[6:10] == ["-ss", "30.000", "-i", "ton.m4a"]
+    assert "-shortest" not in result
+    assert result[-3:] == ["-t", "5.000", "vorschau.mp4"]
+
+
+def test_window_command_clips_slideshow_list(tmp_path: Path) -> None:
+    slides = write_list(
+        [("a.jpg", 20.0), ("b.jpg", 20.0), ("b.jpg", None)], tmp_path
+    )
+    cmd = ["ffmpeg", "-f", "concat", "-safe", "0", "-i", str(slides), "o.mp4"]
+
+    result = window_command(cmd, 25.0, 5.0, "v.mp4", tmp_path)
+
+    assert "-ss" not in result
+    clipped = read_concat_list(Path(result[result.index("-i") + 1]))
+    assert clipped == [("b.jpg", 5.0 - 0.04), ("b.jpg", None)]
+
+
+def test_render_preview_joins_windows_and_removes_clips(
+    tmp_path: Path,
+) -> None:
+    calls: list = []
+
+    def runner(cmd):
+        calls.append(cmd)
+        Path(cmd[-1]).write_bytes(b"clip")
+        return 0
+
+    target = tmp_path / "vorschau.mp4"
+    cmd = ["ffmpeg", "-i", "bild.jpg", "-i", "ton.m4a", str(target)]
+
+    code = render_preview(cmd, 300.0, PreviewSpec(5.0, 3), runner)
+
+    assert code == 0
+    assert len(calls) == 4
+    assert calls[-1][calls[-1].index("-c") + 1] == "copy"
+    assert sorted(p.name for p in tmp_path.glob("*.mp4")) == ["vorschau.mp4"]
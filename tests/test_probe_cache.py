@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+
+from core import media_info
+from core.probe_cache import ProbeCache
+
+
+def test_lookup_probes_once_and_persists(tmp_path: Path) -> None:
+    audio = tmp_path / "ton.mp3"
+    audio.write_bytes(b"demo")
+    db = tmp_path / "probe.sqlite3"
+    calls = []
+
+    def _prober(path):
+        calls.append(path)
+        return {"duration": 42.0}
+
+    cache = ProbeCache(db)
+    assert cache.lookup(str(audio), _prober) == {"duration": 42.0}
+    assert cache.lookup(str(audio), _prober) == {"duration": 42.0}
+    cache.close()
+
+    reopened = ProbeCache(db)
+    assert reopened.lookup(str(audio), _prober) == {"duration": 42.0}
+    assert len(calls) == 1
+
+
+def test_lookup_reprobes_changed_file(tmp_path: Path) -> None:
+    audio = tmp_path / "ton.mp3"
+    audio.write_bytes(b"demo")
+    cache = ProbeCache(tmp_path / "probe.sqlite3")
+    results = iter([{"duration": 1.0}, {"duration": 2.0}])
+
+    assert cache.lookup(str(audio), lambda _: next(results))["duration"] == 1
+    stat = audio.stat()
+    os.utime(audio, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert cache.lookup(str(audio), lambda _: next(results))["duration"] == 2
+
+
+def test_failed_probe_is_not_cached(tmp_path: Path) -> None:
+    audio = tmp_path / "ton.mp3"
+    audio.write_bytes(b"demo")
+    cache = ProbeCache(tmp_path / "probe.sqlite3")
+
+    assert cache.lookup(str(audio), lambda _: {}) == {}
+    assert cache.lookup(str(audio), lambda _: {"duration": 3.0}) == {
+        "duration": 3.0
+    }
+
+
+def test_probe_media_uses_cache(tmp_path: Path, monkeypatch) -> None:
+    audio = tmp_path / "ton.m4a"
+    audio.write_bytes(b"demo")
+    calls = []
+
+    def _fake_probe(path):
+        calls.append(path)
+        return {
+            "format": {"duration": "5.0"},
+            "streams": [{"codec_type": "audio", "codec_name": "aac"}],
+        }
+
+    monkeypatch.setattr(media_info.ffmpeg, "probe", _fake_probe)
+    cache = ProbeCache(tmp_path / "probe.sqlite3")
+
+    first = media_info.probe_media(str(audio), cache)
+    second = media_info.probe_media(str(audio), cache)
+
+    assert first == second
+    assert first.duration == 5.0
+    assert first.audio_codec == "aac"
+    assert len(calls) == 1
+
+
+def test_probe_worker_count_is_bounded() -> None:
+    assert media_info.probe_worker_count(1) == media_info.PROBE_WORKERS_MIN
+    assert media_info.probe_worker_count(4) == 4
+    assert media_info.probe_worker_count(64) == media_info.PROBE_WORKERS_MAX
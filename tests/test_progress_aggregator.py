@@ -0,0 +1,76 @@
+import threading
+
+from core.progress_aggregator import ProgressAggregator
+
+
+def test_take_reports_dirty_range_once() -> None:
+    agg = ProgressAggregator(10)
+    agg.touch(7)
+    agg.touch(2)
+    agg.touch(4)
+
+    flush = agg.take()
+
+    assert flush is not None
+    assert (flush.first_row, flush.last_row) == (2, 7)
+    assert agg.take() is None
+
+
+def test_finish_keeps_running_counters() -> None:
+    agg = ProgressAggregator(4)
+    agg.finish(0, "FERTIG")
+    agg.finish(1, "FEHLER")
+    agg.finish(2, "ABGEBROCHEN")
+
+    flush = agg.take()
+
+    assert flush is not None
+    assert (flush.done, flush.failed, flush.aborted) == (1, 1, 1)
+    assert flush.processed == 3
+    assert flush.percent == 75.0
+
+
+def test_concurrent_updates_are_counted() -> None:
+    agg = ProgressAggregator(400)
+
+    def _work(offset: int) -> None:
+        for row in range(offset, offset + 100):
+            agg.touch(row)
+            agg.finish(row, "FERTIG")
+
+    threads = [
+        threading.Thread(target=_work, args=(i * 100,)) for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    flush = agg.take()
+    assert flush is not None
+    assert flush.done == 400
+    assert (flush.first_row, flush.last_row) == (0, 399)
+
+
+def test_progress_total_grows_with_added_jobs() -> None:
+    agg = ProgressAggregator(2)
+    agg.finish(0, "FERTIG")
+    agg.add_jobs(2)
+
+    flush = agg.take()
+
+    assert flush is not None
+    assert (flush.processed, flush.total) == (1, 4)
+
+
+def test_rows_outside_the_table_are_ignored() -> None:
+    agg = ProgressAggregator(3)
+    agg.touch(-1)
+    agg.touch(5)
+    agg.finish(-1, "FERTIG")
+
+    flush = agg.take()
+
+    assert flush is not None
+    assert (flush.first_row, flush.last_row) == (5, 5)
+    assert flush.done == 1
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+
+from core.renditions import (
+    build_ladder_command,
+    ladder_filter,
+    parse_ladder,
+    tee_outputs,
+)
+from core.utils import build_out_name
+
+
+def test_parse_ladder_sorts_largest_first_and_drops_duplicates() -> None:
+    ladder = parse_ladder("480p, 1080p;720p 1920x1080")
+
+    assert [r.name for r in ladder] == ["1080p", "720p", "480p"]
+    assert ladder[2].size == "854x480"
+    assert parse_ladder("") == []
+
+
+@pytest.mark.parametrize("text", ["4k", "1281x720", "8x8"])
+def test_parse_ladder_rejects_unknown_or_odd_sizes(text: str) -> None:
+    with pytest.raises(ValueError):
+        parse_ladder(text)
+
+
+def test_ladder_filter_decodes_once_and_splits() -> None:
+    graph = ladder_filter(parse_ladder("720p,360p"), "tpad=stop_duration=2")
+
+    assert graph.startswith("[0:v]tpad=stop_duration=2,split=2[s0][s1];")
+    assert "[s1]scale=640:360" in graph
+    assert graph.endswith("[v1]")
+
+
+def test_tee_outputs_escape_special_characters() -> None:
+    spec = tee_outputs(["a|b.mp4", "it's.mp4"])
+
+    assert spec.split("|[")[0].endswith("a\\|b.mp4")
+    assert "select=\\'v:1,a\\'" in spec
+    assert spec.endswith("it\\'s.mp4")
+
+
+def test_ladder_command_maps_audio_once_into_tee() -> None:
+    ladder = parse_ladder("1080p,480p")
+    cmd = build_ladder_command(
+        ["-loop", "1", "-i", "bild.jpg"],
+        "ton.m4a",
+        ladder,
+        ["gross.mp4", "klein.mp4"],
+        ["-c:v", "libx264"],
+        ["-c:a", "aac"],
+    )
+
+    assert cmd.count("-filter_complex") == 1
+    assert cmd.count("-c:a") == 1
+    assert "1:a:0" in cmd
+    assert cmd[-3:-1] == ["-f", "tee"]
+    with pytest.raises(ValueError):
+        build_ladder_command([], "ton.m4a", ladder, ["x.mp4"], [], [])
+
+
+def test_build_out_name_adds_rendition_without_size_placeholder() -> None:
+    out_dir = Path("/tmp/out")
+
+    plain = build_out_name(
+        "musik.mp3", out_dir, "{audio_name}.mp4", rendition="720p"
+    )
+    sized = build_out_name(
+        "musik.mp3",
+        out_dir,
+        "{audio_name}_{abmasse}.mp4",
+        resolution="1280x720",
+        rendition="720p",
+    )
+
+    assert plain == out_dir / "musik_720p.mp4"
+    assert sized == out_dir / "musik_1280x720.mp4"
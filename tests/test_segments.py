@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from core.segments import (
+    Segment,
+    SegmentedEncoder,
+    SegmentError,
+    build_concat_mux_command,
+    plan_segments,
+    segment_command,
+    segment_job,
+    slideshow_window,
+    write_list,
+)
+
+
+def _fake_runner(calls, fail_on=None):
+    lock = threading.Lock()
+
+    def _run(cmd):
+        with lock:
+            calls.append(cmd)
+        if fail_on is not None and fail_on in cmd:
+            return 1
+        Path(cmd[-1]).write_bytes(b"segment")
+        return 0
+
+    return _run
+
+
+def test_plan_segments_covers_timeline() -> None:
+    segments = plan_segments(700.0, 300.0)
+
+    assert [(s.start, s.duration) for s in segments] == [
+        (0.0, 300.0),
+        (300.0, 300.0),
+        (600.0, 100.0),
+    ]
+    assert plan_segments(0.0) == []
+
+
+def test_slideshow_window_clips_and_ends_one_frame_early() -> None:
+    frames = ["a.jpg", "b.jpg", "c.jpg"]
+
+    entries = slideshow_window(frames, 100.0, Segment(1, 50.0, 100.0), 25)
+
+    assert entries == [("a.jpg", 50.0), ("b.jpg", 50.0 - 0.04), ("b.jpg", None)]
+
+
+def test_reused_list_survives_pruning(tmp_path: Path) -> None:
+    entries = [("a.jpg", 2.0), ("a.jpg", None)]
+    first = write_list(entries, tmp_path)
+    old = time.time() - 30 * 86400
+    os.utime(first, (old, old))
+
+    again = write_list(entries, tmp_path)
+    jobs = [segment_job(["ffmpeg", "-i", str(again), "-c:v", "libx264"])]
+    SegmentedEncoder(_fake_runner([]), root=tmp_path).run(jobs)
+
+    assert again == first
+    assert again.is_file()
+
+
+def test_changed_input_at_same_path_changes_the_key(tmp_path: Path) -> None:
+    image = tmp_path / "bild.jpg"
+    image.write_bytes(b"alt")
+    cmd = ["ffmpeg", "-loop", "1", "-i", str(image), "-c:v", "libx264"]
+    before = segment_job(cmd, [str(image)])
+
+    image.write_bytes(b"neu und laenger")
+
+    assert segment_job(cmd, [str(image)]).key != before.key
+
+
+def test_prune_spares_locked_and_recent_entries(tmp_path: Path) -> None:
+    encoder = SegmentedEncoder(_fake_runner([]), root=tmp_path)
+    old = time.time() - 30 * 86400
+    names = ["alt.mp4", "busy.mp4", "busy.lock", "busy.part", "neu.mp4"]
+    for name in names:
+        (tmp_path / name).write_bytes(b"x")
+        if name != "neu.mp4":
+            os.utime(tmp_path / name, (old, old))
+
+    assert encoder.prune() == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(names[1:])
+
+
+def test_identical_segments_share_one_job() -> None:
+    video = ["-vf", "scale=64:36", "-c:v", "libx264"]
+    first, second, tail = (
+        segment_job(segment_command(["-i", "frame.rgb"], seg, video))
+        for seg in plan_segments(700.0, 300.0)
+    )
+
+    assert first.key == second.key
+    assert tail.key != first.key
+    assert "-ss" not in first.command
+
+
+def test_encoder_encodes_unique_segments_once_and_reuses(
+    tmp_path: Path,
+) -> None:
+    calls: list = []
+    encoder = SegmentedEncoder(_fake_runner(calls), root=tmp_path)
+    jobs = [
+        segment_job(segment_command(["-i", "x"], seg, ["-c:v", "libx264"]))
+        for seg in plan_segments(700.0, 300.0)
+    ]
+    progress: list = []
+
+    list_path = encoder.run(jobs, lambda ready, total: progress.append(ready))
+    encoder.run(jobs)
+
+    assert len(calls) == 2
+    assert progress[-1] == 2
+    lines = list_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert lines[0] == lines[1]
+    assert not list(tmp_path.glob("*.lock"))
+
+
+def test_failed_segment_keeps_finished_ones(tmp_path: Path) -> None:
+    jobs = [
+        segment_job(["ffmpeg", "-y", "-i", name, "-c:v", "libx264"])
+        for name in ("a", "b")
+    ]
+    calls: list = []
+    encoder = SegmentedEncoder(
+        _fake_runner(calls, fail_on="b"), root=tmp_path, max_workers=1
+    )
+
+    with pytest.raises(SegmentError):
+        encoder.run(jobs)
+    assert encoder.path_for(jobs[0].key).is_file()
+
+    calls.clear()
+    SegmentedEncoder(_fake_runner(calls), root=tmp_path).run(jobs)
+    assert [c[3] for c in calls] == ["b"]
+
+
+def test_foreign_lock_is_respected_until_stale(tmp_path: Path) -> None:
+    job = segment_job(["ffmpeg", "-i", "a", "-c:v", "libx264"])
+    encoder = SegmentedEncoder(
+        _fake_runner([]), root=tmp_path, stale_seconds=60
+    )
+    lock = tmp_path / f"{job.key}.lock"
+    lock.write_text("anderer-rechner:1")
+
+    assert encoder._claim(job.key) is False
+
+    old = time.time() - 120
+    os.utime(lock, (old, old))
+    assert encoder._claim(job.key) is True
+
+
+def test_concat_mux_copies_video_and_adds_audio_once() -> None:
+    cmd = build_concat_mux_command(
+        Path("list.txt"), "ton.m4a", "out.mp4", ["-c:a", "aac"], 1860.0
+    )
+
+    assert cmd[cmd.index("-c:v") + 1] == "copy"
+    assert cmd[cmd.index("-t") + 1] == "1860.000"
+    assert cmd[-1] == "out.mp4"
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from core.still_cache import (
+    StillSegmentCache,
+    build_mux_command,
+    is_still_image,
+    still_segment_key,
+)
+
+
+def _fake_runner(calls):
+    def _run(cmd):
+        calls.append(cmd)
+        Path(cmd[-1]).write_bytes(b"segment")
+        return 0
+
+    return _run
+
+
+def test_still_segment_key_depends_on_settings(tmp_path: Path) -> None:
+    image = tmp_path / "cover.png"
+    image.write_bytes(b"demo")
+
+    base = still_segment_key(str(image), 1920, 1080, 23, "fast")
+
+    assert base == still_segment_key(str(image), 1920, 1080, 23, "fast")
+    assert base != still_segment_key(str(image), 1280, 720, 23, "fast")
+    assert base != still_segment_key(str(image), 1920, 1080, 18, "fast")
+    assert base != still_segment_key(str(image), 1920, 1080, 23, "slow")
+
+
+def test_cache_encodes_segment_only_once(tmp_path: Path) -> None:
+    image = tmp_path / "cover.jpg"
+    image.write_bytes(b"demo")
+    cache = StillSegmentCache(tmp_path / "cache")
+    calls: list = []
+
+    first = cache.ensure(str(image), 640, 360, 23, "fast", _fake_runner(calls))
+    second = cache.ensure(str(image), 640, 360, 23, "fast", _fake_runner(calls))
+
+    assert first == second
+    assert first.read_bytes() == b"segment"
+    assert len(calls) == 1
+    assert "loop=loop=-1:size=1" in " ".join(calls[0])
+    assert "scale=640:360" in " ".join(calls[0])
+
+
+def test_cache_raises_and_cleans_up_on_failure(tmp_path: Path) -> None:
+    image = tmp_path / "cover.jpg"
+    image.write_bytes(b"demo")
+    cache = StillSegmentCache(tmp_path / "cache")
+
+    def _failing(cmd):
+        Path(cmd[-1]).write_bytes(b"kaputt")
+        return 1
+
+    with pytest.raises(RuntimeError):
+        cache.ensure(str(image), 640, 360, 23, "fast", _failing)
+
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_build_mux_command_copies_video_and_limits_loop() -> None:
+    cmd = build_mux_command(
+        Path("/tmp/seg.mp4"),
+        "ton.mp3",
+        "out.mp4",
+        ["-c:a", "aac", "-b:a", "192k"],
+        duration=61.5,
+    )
+
+    assert cmd[cmd.index("-stream_loop") + 1] == "-1"
+    assert cmd[cmd.index("-t") + 1] == "61.500"
+    assert cmd[cmd.index("-c:v") + 1] == "copy"
+    assert "libx264" not in cmd
+    assert cmd[-1] == "out.mp4"
+
+
+def test_is_still_image_rejects_videos() -> None:
+    assert is_still_image("bild.JPG")
+    assert not is_still_image("clip.mp4")
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from core.still_cache import build_segment_command, still_segment_key
+from core.still_mode import (
+    STILL_KEYFRAME_SECONDS,
+    STILL_OUTPUT_FPS,
+    still_source,
+    still_video_args,
+)
+
+
+def test_still_source_prescales_once_to_raw_frame(
+    tmp_path: Path, monkeypatch
+) -> None:
+    image = tmp_path / "photo.jpg"
+    image.write_bytes(b"demo")
+    prepared = tmp_path / "prepared.rgb"
+    calls: list = []
+
+    def fake_prepare(images, width, height, suffix=".jpg"):
+        calls.append((list(images), width, height, suffix))
+        return [prepared]
+
+    monkeypatch.setattr("core.still_mode.prepare_images", fake_prepare)
+
+    source = still_source(str(image), 640, 360, STILL_OUTPUT_FPS)
+
+    assert calls == [([image], 640, 360, ".rgb")]
+    assert source.path == str(prepared)
+    assert source.args[:6] == [
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "rgb24",
+        "-video_size",
+        "640x360",
+    ]
+    assert source.args[-4:] == ["-stream_loop", "-1", "-i", str(prepared)]
+    assert "-loop" not in source.args
+    assert source.video_filter.endswith("format=yuv420p")
+
+
+def test_still_source_falls_back_to_input_loop(monkeypatch) -> None:
+    monkeypatch.setattr(
+        "core.still_mode.prepare_images", lambda images, *a, **k: images
+    )
+
+    for source in (
+        still_source("clip.mp4", 640, 360),
+        still_source("photo.jpg", 640, 360),
+        still_source("photo.jpg", 640, 360, prescale=False),
+    ):
+        assert source.args[:2] == ["-loop", "1"]
+        assert source.video_filter.startswith("scale=640:360")
+
+
+def test_still_video_args_constant_rate_and_keyframes() -> None:
+    args = still_video_args()
+
+    assert args[:2] == ["-r", str(STILL_OUTPUT_FPS)]
+    assert "stillimage" in args
+    expr = args[args.index("-force_key_frames") + 1]
+    assert str(STILL_KEYFRAME_SECONDS) in expr
+
+
+def test_still_video_args_variable_rate_for_slideshows() -> None:
+    args = still_video_args(None)
+
+    assert "-r" not in args
+    assert args[:2] == ["-fps_mode", "vfr"]
+
+
+def test_segment_key_and_command_follow_fps(tmp_path: Path) -> None:
+    image = tmp_path / "cover.png"
+    image.write_bytes(b"demo")
+
+    default = still_segment_key(str(image), 640, 360, 23, "fast")
+    still = still_segment_key(str(image), 640, 360, 23, "fast", fps=1)
+    cmd = build_segment_command(
+        str(image), tmp_path / "seg.mp4", 640, 360, 23, "fast", fps=1
+    )
+
+    assert default != still
+    assert cmd[cmd.index("-framerate") + 1] == "1"
@@ -0,0 +1,111 @@
+from dataclasses import replace
+from pathlib import Path
+
+from core.tail_extend import (
+    VideoStream,
+    extend_with_tail,
+    tail_encoder_args,
+    video_stream_info,
+)
+
+STREAM = VideoStream(
+    codec="h264",
+    profile="High",
+    level=40,
+    width=1280,
+    height=720,
+    pix_fmt="yuv420p",
+    frame_rate="30000/1001",
+    time_base="1/30000",
+    sample_aspect_ratio="1:1",
+    duration=10.0,
+)
+
+
+def _fake_runner(calls):
+    def _run(cmd):
+        calls.append(cmd)
+        Path(cmd[-1]).write_bytes(b"frame")
+        return 0
+
+    return _run
+
+
+def test_video_stream_info_reads_first_video_stream() -> None:
+    payload = {
+        "streams": [
+            {"codec_type": "audio", "codec_name": "aac"},
+            {
+                "codec_type": "video",
+                "codec_name": "h264",
+                "profile": "Main",
+                "level": 31,
+                "width": 640,
+                "height": 360,
+                "pix_fmt": "yuv420p",
+                "r_frame_rate": "25/1",
+                "time_base": "1/12800",
+            },
+        ],
+        "format": {"duration": "12.5"},
+    }
+
+    info = video_stream_info(payload)
+
+    assert info is not None
+    assert (info.codec, info.level, info.duration) == ("h264", 31, 12.5)
+    assert video_stream_info({"streams": []}) is None
+
+
+def test_tail_encoder_args_match_original() -> None:
+    args = tail_encoder_args(STREAM, 20, "fast")
+
+    assert args is not None
+    assert args[args.index("-profile:v") + 1] == "high"
+    assert args[args.index("-level:v") + 1] == "4"
+    assert args[args.index("-r") + 1] == "30000/1001"
+    assert args[args.index("-video_track_timescale") + 1] == "30000"
+    assert "repeat-headers=1" in args
+
+
+def test_tail_encoder_args_reject_foreign_formats() -> None:
+    assert tail_encoder_args(replace(STREAM, codec="hevc"), 20, "fast") is None
+    assert (
+        tail_encoder_args(replace(STREAM, pix_fmt="yuv420p10le"), 20, "fast")
+        is None
+    )
+
+
+def test_extend_with_tail_builds_list_and_reuses_tail(tmp_path: Path) -> None:
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+    root = tmp_path / "tails"
+    calls: list = []
+
+    list_path = extend_with_tail(
+        str(video), 27.0, 20, "fast", _fake_runner(calls), root, STREAM
+    )
+    again = extend_with_tail(
+        str(video), 27.0, 20, "fast", _fake_runner(calls), root, STREAM
+    )
+
+    assert list_path is not None and again == list_path
+    assert len(calls) == 2
+    assert calls[1][calls[1].index("-t") + 1] == "17.000"
+    lines = list_path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == f"file '{video.resolve().as_posix()}'"
+    assert lines[1] == "duration 10.000000"
+    assert not list(root.glob("*.png"))
+
+
+def test_extend_with_tail_falls_back_without_gap(tmp_path: Path) -> None:
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+    calls: list = []
+
+    result = extend_with_tail(
+        str(video), 10.01, 20, "fast", _fake_runner(calls), tmp_path, STREAM
+    )
+
+    assert result is None
+    assert calls == []
@@ -1,9 +1,17 @@
+import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
 import pytest
 
-from core.utils import build_out_name, mark_used_filename
+from core.utils import (
+    ProcessGroup,
+    build_out_name,
+    mark_used_filename,
+    run_ffmpeg,
+)
 
 
 def test_build_out_name_template_renders() -> None:
@@ -33,3 +41,25 @@ def test_mark_used_filename_appends_suffix() -> None:
     result = mark_used_filename(Path("Urlaub Foto.PNG"))
 
     assert result == "urlaub_foto_benutzt.png"
+
+
+def test_process_group_terminates_running_commands() -> None:
+    group = ProcessGroup()
+    results: list = []
+
+    def job() -> None:
+        with group.active():
+            cmd = [sys.executable, "-c", "import time; time.sleep(30)"]
+            results.append(run_ffmpeg(cmd))
+
+    worker = threading.Thread(target=job)
+    started = time.monotonic()
+    worker.start()
+    while not group._procs and time.monotonic() - started < 5:
+        time.sleep(0.01)
+    group.terminate()
+    worker.join(timeout=10)
+
+    assert not worker.is_alive()
+    assert results[0].returncode != 0
+    assert time.monotonic() - started < 10
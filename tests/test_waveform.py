@@ -0,0 +1,63 @@
+import builtins
+from array import array
+from pathlib import Path
+
+from core.waveform import cached_peaks, reduce_peaks, waveform_peaks
+
+
+def _pcm(values) -> bytes:
+    samples = array("h", values)
+    return samples.tobytes()
+
+
+def test_reduce_peaks_min_max_per_bin() -> None:
+    pcm = _pcm([0, 32767, -32767, 0, 100, -100, 0, 0])
+
+    assert reduce_peaks(pcm, 2) == [(-127, 127), (0, 0)]
+    assert reduce_peaks(b"", 4) == []
+
+
+def test_reduce_peaks_without_numpy(monkeypatch) -> None:
+    pcm = _pcm([0, 16384, -16384, 0, 0, 0])
+    expected = reduce_peaks(pcm, 3)
+    original = builtins.__import__
+
+    def _no_numpy(name, *args, **kwargs):
+        if name == "numpy":
+            raise ImportError(name)
+        return original(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", _no_numpy)
+
+    assert reduce_peaks(pcm, 3) == expected == [(0, 64), (-64, 0), (0, 0)]
+
+
+def test_waveform_peaks_decodes_once(tmp_path: Path) -> None:
+    audio = tmp_path / "ton.wav"
+    audio.write_bytes(b"audio")
+    root = tmp_path / "waveforms"
+    calls: list = []
+
+    def _decoder(cmd):
+        calls.append(cmd)
+        return _pcm([0, 32767, -32767, 0] * 10)
+
+    first = waveform_peaks(str(audio), 4, root, _decoder)
+    again = waveform_peaks(str(audio), 4, root, _decoder)
+
+    assert first == again == [(-127, 127)] * 4
+    assert cached_peaks(str(audio), 4, root) == first
+    assert len(calls) == 1
+    assert calls[0][calls[0].index("-f") + 1] == "s16le"
+
+
+def test_waveform_peaks_invalidated_by_change(tmp_path: Path) -> None:
+    audio = tmp_path / "ton.wav"
+    audio.write_bytes(b"audio")
+    root = tmp_path / "waveforms"
+
+    waveform_peaks(str(audio), 4, root, lambda cmd: _pcm([1000] * 8))
+    audio.write_bytes(b"laengeres audio")
+
+    assert cached_peaks(str(audio), 4, root) is None
+    assert waveform_peaks(str(audio), 4, root, lambda cmd: None) is None
@@ -15,11 +15,50 @@ import random
 import re
 import sys
 import tempfile
+from dataclasses import replace
 from pathlib import Path
+from subprocess import CompletedProcess
 from typing import List, Optional, Sequence, Tuple
 
 from core import __version__
+from core.audio_copy import describe_decision, plan_audio_args
 from core.config import apply_simple_mode_defaults, cfg
+from core.image_prep import prepare_images
+from core.loudness import normalize_filter, with_loudnorm
+from core.parallelism import with_thread_args
+from core.preview import (
+    PREVIEW_CRF,
+    PREVIEW_PRESET,
+    PREVIEW_SECONDS,
+    PreviewSpec,
+    open_file,
+    preview_size,
+    render_preview,
+    reset_preview_dir,
+)
+from core.segments import (
+    MIN_SEGMENTED_SECONDS,
+    SEGMENT_FPS,
+    SegmentedEncoder,
+    SegmentError,
+    build_concat_mux_command,
+    plan_segments,
+    segment_command,
+    segment_job,
+    segment_workers,
+    slideshow_job,
+)
+from core.still_cache import (
+    StillSegmentCache,
+    build_mux_command,
+    is_still_image,
+)
+from core.still_mode import (
+    STILL_OUTPUT_FPS,
+    still_source,
+    still_video_args,
+)
+from core.tail_extend import extend_with_tail
 from core.utils import build_out_name, human_time, probe_duration, run_ffmpeg
 
 
@@ -121,6 +160,49 @@ def _build_video_filters(
     ]
 
 
+def _segment_encoder(segment_root: Optional[str]) -> SegmentedEncoder:
+    workers = segment_workers()
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    return SegmentedEncoder(
+        lambda cmd: run_ffmpeg(with_thread_args(cmd, threads)).returncode,
+        root=Path(segment_root) if segment_root else None,
+        max_workers=workers,
+    )
+
+
+def _print_segment_progress(ready: int, total: int) -> None:
+    print(f"   Abschnitte fertig: {ready}/{total}")
+
+
+def _run_output(
+    cmd: List[str], audio: str, preview: Optional[PreviewSpec] = None
+) -> CompletedProcess[str]:
+    """Fuehrt den fertigen Befehl aus, bei Vorschau nur die Ausschnitte."""
+    if preview is None:
+        return run_ffmpeg(cmd)
+    results: List[CompletedProcess[str]] = []
+
+    def runner(part: List[str]) -> int:
+        results.append(run_ffmpeg(part))
+        return results[-1].returncode
+
+    render_preview(cmd, probe_duration(audio), preview, runner)
+    return results[-1]
+
+
+def _finish_preview(code: int, preview: Optional[PreviewSpec], out: str) -> int:
+    if preview is None or code != 0:
+        return code
+    outputs = sorted(Path(out).glob("*.mp4"))
+    if not outputs:
+        return code
+    target = outputs[0] if len(outputs) == 1 else Path(out)
+    print(f"Vorschau: {target}")
+    if not open_file(target):
+        print("Hinweis: Vorschau bitte manuell öffnen.")
+    return code
+
+
 def cli_single(
     images: List[str],
     audios: List[str],
@@ -130,6 +212,12 @@ def cli_single(
     crf: int = 23,
     preset: str = "ultrafast",
     abitrate: str = "192k",
+    still_optimized: bool = False,
+    prescale: bool = True,
+    segmented: bool = False,
+    segment_root: Optional[str] = None,
+    preview: Optional[PreviewSpec] = None,
+    audio_normalize: bool = False,
 ) -> int:
     out_dir_p = Path(out_dir)
     out_dir_p.mkdir(parents=True, exist_ok=True)
@@ -143,29 +231,34 @@ def cli_single(
             print(f"[{i}/{total}] FEHLT: {img} / {aud}")
             continue
         out_file = build_out_name(aud, out_dir_p)
+        audio = plan_audio_args(aud, abitrate, has_filters=audio_normalize)
+        if audio_normalize:
+            audio = with_loudnorm(audio, aud, run_ffmpeg)
+        print(f"[{i}/{total}] {describe_decision(audio)}")
+        source = still_source(
+            img,
+            width,
+            height,
+            STILL_OUTPUT_FPS if still_optimized else None,
+            prescale,
+        )
+        video = (
+            still_video_args(duration=probe_duration(aud) or None)
+            if still_optimized
+            else ["-tune", "stillimage"]
+        )
         cmd = [
             "ffmpeg",
             "-y",
-            "-loop",
-            "1",
-            "-i",
-            img,
+            *source.args,
             "-i",
             aud,
             "-c:v",
             "libx264",
-            "-tune",
-            "stillimage",
+            *video,
             "-vf",
-            (
-                "scale="
-                f"{width}:{height}:force_original_aspect_ratio=decrease,"
-                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
-            ),
-            "-c:a",
-            "aac",
-            "-b:a",
-            abitrate,
+            source.video_filter,
+            *audio.args,
             "-shortest",
             "-preset",
             preset,
@@ -173,7 +266,44 @@ def cli_single(
             str(crf),
             str(out_file),
         ]
-        res = run_ffmpeg(cmd)
+        total_seconds = probe_duration(aud) if segmented else 0.0
+        if (
+            segmented
+            and not still_optimized
+            and total_seconds >= MIN_SEGMENTED_SECONDS
+        ):
+            encoder = _segment_encoder(segment_root)
+            video_args = [
+                "-vf",
+                source.video_filter,
+                "-r",
+                str(SEGMENT_FPS),
+                "-c:v",
+                "libx264",
+                "-tune",
+                "stillimage",
+                "-preset",
+                preset,
+                "-crf",
+                str(crf),
+            ]
+            jobs = [
+                segment_job(
+                    segment_command(source.args, seg, video_args),
+                    [source.path],
+                )
+                for seg in plan_segments(total_seconds)
+            ]
+            print(f"[{i}/{total}] Segmentiert: {len(jobs)} Abschnitte")
+            try:
+                list_path = encoder.run(jobs, _print_segment_progress)
+            except SegmentError as e:
+                print("Fehler:", e)
+                continue
+            cmd = build_concat_mux_command(
+                list_path, aud, str(out_file), audio.args, total_seconds
+            )
+        res = _run_output(cmd, aud, preview)
         if res.returncode == 0:
             done += 1
         else:
@@ -193,17 +323,70 @@ def cli_multi_audio(
     crf: int = 23,
     preset: str = "ultrafast",
     abitrate: str = "192k",
+    still_optimized: bool = False,
+    prescale: bool = True,
+    preview: Optional[PreviewSpec] = None,
+    audio_normalize: bool = False,
 ) -> int:
-    return cli_single(
-        [image] * len(audios),
-        audios,
-        out_dir,
-        width,
-        height,
-        crf,
-        preset,
-        abitrate,
-    )
+    if not is_still_image(image):
+        return cli_single(
+            [image] * len(audios),
+            audios,
+            out_dir,
+            width,
+            height,
+            crf,
+            preset,
+            abitrate,
+            still_optimized,
+            prescale,
+            preview=preview,
+            audio_normalize=audio_normalize,
+        )
+    if not verify_files(image):
+        return 1
+    out_dir_p = Path(out_dir)
+    out_dir_p.mkdir(parents=True, exist_ok=True)
+    try:
+        segment = StillSegmentCache().ensure(
+            image,
+            width,
+            height,
+            crf,
+            preset,
+            lambda cmd: run_ffmpeg(cmd).returncode,
+            **({"fps": STILL_OUTPUT_FPS} if still_optimized else {}),
+        )
+    except RuntimeError as exc:
+        print("FFmpeg-Fehler:", exc)
+        return 1
+    total = len(audios)
+    done = 0
+    for i, aud in enumerate(audios, 1):
+        if not verify_files(aud):
+            print(f"[{i}/{total}] FEHLT: {aud}")
+            continue
+        out_file = build_out_name(aud, out_dir_p)
+        audio = plan_audio_args(aud, abitrate, has_filters=audio_normalize)
+        if audio_normalize:
+            audio = with_loudnorm(audio, aud, run_ffmpeg)
+        print(f"[{i}/{total}] {describe_decision(audio)}")
+        cmd = build_mux_command(
+            segment,
+            aud,
+            str(out_file),
+            audio.args,
+            probe_duration(aud),
+        )
+        res = _run_output(cmd, aud, preview)
+        if res.returncode == 0:
+            done += 1
+        else:
+            err = res.stderr.strip().splitlines()
+            msg = err[-1] if err else "unbekannt"
+            print("FFmpeg-Fehler:", msg)
+    print(f"Fertig: {done}/{total}")
+    return 0
 
 
 def cli_video(
@@ -213,38 +396,61 @@ def cli_video(
     crf: int = 23,
     preset: str = "ultrafast",
     abitrate: str = "192k",
+    output: Optional[str] = None,
+    preview: Optional[PreviewSpec] = None,
+    audio_normalize: bool = False,
 ) -> int:
     out_dir_p = Path(out_dir)
     out_dir_p.mkdir(parents=True, exist_ok=True)
     if not verify_files(video, audio):
         return 1
-    out_file = build_out_name(audio, out_dir_p)
+    out_file = Path(output) if output else build_out_name(audio, out_dir_p)
     vdur = probe_duration(video)
     adur = probe_duration(audio)
     extra = max(0.0, adur - vdur)
-    cmd = ["ffmpeg", "-y", "-i", video, "-i", audio]
-    if extra > 0:
+    audio_plan = plan_audio_args(audio, abitrate, has_filters=audio_normalize)
+    if audio_normalize:
+        audio_plan = with_loudnorm(audio_plan, audio, run_ffmpeg)
+    print(describe_decision(audio_plan))
+    tail_list = None
+    if extra > 0 and preview is None:
+        tail_list = extend_with_tail(
+            video, adur, crf, preset, lambda c: run_ffmpeg(c).returncode
+        )
+        if tail_list is None:
+            print(
+                "Hinweis: Schlussbild nicht anhängbar – Video wird neu kodiert"
+            )
+        else:
+            print(f"Videoende um {extra:.1f}s verlängert, Rest kopiert")
+    if tail_list is not None:
+        cmd = build_concat_mux_command(
+            tail_list, audio, str(out_file), audio_plan.args, adur
+        )
+    else:
+        cmd = ["ffmpeg", "-y", "-i", video, "-i", audio]
+        if extra > 0:
+            cmd += [
+                "-vf",
+                f"tpad=stop_mode=clone:stop_duration={extra}",
+                "-c:v",
+                "libx264",
+            ]
+        else:
+            cmd += ["-c:v", "copy"]
         cmd += [
-            "-vf",
-            f"tpad=stop_mode=clone:stop_duration={extra}",
-            "-c:v",
-            "libx264",
+            *audio_plan.args,
+            "-shortest",
+            "-preset",
+            preset,
+            "-crf",
+            str(crf),
+            str(out_file),
         ]
-    else:
-        cmd += ["-c:v", "copy"]
-    cmd += [
-        "-c:a",
-        "aac",
-        "-b:a",
-        abitrate,
-        "-shortest",
-        "-preset",
-        preset,
-        "-crf",
-        str(crf),
-        str(out_file),
-    ]
-    res = run_ffmpeg(cmd)
+    # Hinter dem Videoende gaebe es nur Ton; der Anfang genuegt.
+    res = _run_output(
+        cmd, audio, replace(preview, windows=1) if preview else None
+    )
     if res.returncode != 0:
         err = res.stderr.strip().splitlines()
         msg = err[-1] if err else "unbekannt"
@@ -290,6 +496,12 @@ def cli_slideshow(
     audio_sample_rate: Optional[int] = None,
     audio_channels: Optional[int] = None,
     audio_normalize: bool = False,
+    output: Optional[str] = None,
+    prescale: bool = True,
+    still_optimized: bool = False,
+    segmented: bool = False,
+    segment_root: Optional[str] = None,
+    preview: Optional[PreviewSpec] = None,
 ) -> int:
     d = Path(img_dir)
     audio_path = Path(audio)
@@ -400,7 +612,7 @@ def cli_slideshow(
     if audio_filter:
         print(" - Zusätzlicher Audio-Filter aktiv")
     if audio_normalize:
-        print(" - Audio-Normalisierung: lautheitsgeregelt (loudnorm)")
+        print(" - Audio-Normalisierung: zwei Durchgänge (Messung im Cache)")
     if fade_used > 0:
         print(f" - Audio-Fade in/out: {fade_used:.2f}s")
     if shuffle:
@@ -428,6 +640,14 @@ def cli_slideshow(
         print(f" - Audio-Samplerate: {audio_sample_rate} Hz")
     if audio_channels:
         print(f" - Audiokanäle: {audio_channels}")
+    if still_optimized and video_codec != "libx264":
+        print("Hinweis: Standbild-Modus nur mit libx264 – wird ignoriert")
+        still_optimized = False
+    if still_optimized:
+        print(" - Standbild-optimiert: ein Bild pro Dia (VFR), lange GOPs")
+    if prescale:
+        images = prepare_images(images, width, height, fit_mode, background)
+        print(f" - Bilder vorbereitet: {len(images)} × {width}x{height}")
     with tempfile.NamedTemporaryFile(
         delete=False, mode="w", suffix=".txt"
     ) as f:
@@ -438,19 +658,41 @@ def cli_slideshow(
         list_path = f.name
     out_dir_p = Path(out_dir)
     out_dir_p.mkdir(parents=True, exist_ok=True)
-    out_file = build_out_name(audio, out_dir_p)
+    out_file = Path(output) if output else build_out_name(audio, out_dir_p)
     video_filters = _build_video_filters(width, height, background, fit_mode)
     if video_filter:
         video_filters.append(video_filter)
     audio_filters: List[str] = []
     if audio_normalize:
-        audio_filters.append("loudnorm=I=-16:LRA=11:TP=-1.5")
+        audio_filters.append(normalize_filter(audio, runner=run_ffmpeg))
     if audio_filter:
         audio_filters.append(audio_filter)
     if fade_used > 0:
         audio_filters.append(f"afade=in:st=0:d={fade_used:.3f}")
         out_start = max(dur - fade_used, 0)
         audio_filters.append(f"afade=out:st={out_start:.3f}:d={fade_used:.3f}")
+    video_args = ["-c:v", video_codec, "-vf", ",".join(video_filters)]
+    if still_optimized:
+        video_args += still_video_args(None, dur or None)
+    else:
+        video_args += ["-r", str(fps)]
+    if video_tune and video_tune.lower() != "none" and not still_optimized:
+        video_args += ["-tune", video_tune]
+    if video_bitrate:
+        video_args += ["-b:v", video_bitrate]
+    if maxrate:
+        video_args += ["-maxrate", maxrate]
+    if bufsize:
+        video_args += ["-bufsize", bufsize]
+    if pix_fmt and pix_fmt.lower() != "none" and not still_optimized:
+        video_args += ["-pix_fmt", pix_fmt]
+    if video_profile:
+        video_args += ["-profile:v", video_profile]
+    if video_level:
+        video_args += ["-level:v", video_level]
+    if gop_size and not still_optimized:
+        video_args += ["-g", str(gop_size)]
+    video_args += ["-preset", preset, "-crf", str(crf)]
     cmd = [
         "ffmpeg",
         "-y",
@@ -462,53 +704,51 @@ def cli_slideshow(
         list_path,
         "-i",
         audio,
-        "-c:v",
-        video_codec,
-        "-vf",
-        ",".join(video_filters),
-        "-r",
-        str(fps),
+        *video_args,
     ]
-    if video_tune and video_tune.lower() != "none":
-        cmd += ["-tune", video_tune]
-    if video_bitrate:
-        cmd += ["-b:v", video_bitrate]
-    if maxrate:
-        cmd += ["-maxrate", maxrate]
-    if bufsize:
-        cmd += ["-bufsize", bufsize]
-    if pix_fmt and pix_fmt.lower() != "none":
-        cmd += ["-pix_fmt", pix_fmt]
-    if video_profile:
-        cmd += ["-profile:v", video_profile]
-    if video_level:
-        cmd += ["-level:v", video_level]
-    if gop_size:
-        cmd += ["-g", str(gop_size)]
-    cmd += [
-        "-c:a",
-        audio_codec,
-        "-b:a",
+    audio_plan = plan_audio_args(
+        audio,
         abitrate,
-    ]
-    if audio_sample_rate:
-        cmd += ["-ar", str(audio_sample_rate)]
-    if audio_channels:
-        cmd += ["-ac", str(audio_channels)]
-    cmd += [
-        "-shortest",
-        "-preset",
-        preset,
-        "-crf",
-        str(crf),
-    ]
+        codec=audio_codec,
+        has_filters=bool(audio_filters),
+        sample_rate=audio_sample_rate,
+        channels=audio_channels,
+    )
+    print(f" - {describe_decision(audio_plan)}")
+    audio_args = list(audio_plan.args)
+    if audio_sample_rate and not audio_plan.copy:
+        audio_args += ["-ar", str(audio_sample_rate)]
+    if audio_channels and not audio_plan.copy:
+        audio_args += ["-ac", str(audio_channels)]
+    if audio_filters:
+        audio_args += ["-af", ",".join(audio_filters)]
+    cmd += [*audio_args, "-shortest"]
     if movflags and movflags.lower() != "none":
         cmd += ["-movflags", movflags]
-    if audio_filters:
-        cmd += ["-af", ",".join(audio_filters)]
     cmd.append(str(out_file))
+    if (
+        segmented
+        and not still_optimized
+        and total_video >= MIN_SEGMENTED_SECONDS
+    ):
+        encoder = _segment_encoder(segment_root)
+        names = [str(img) for img in images]
+        jobs = [
+            slideshow_job(names, per, seg, video_args, encoder.root, fps)
+            for seg in plan_segments(total_video)
+        ]
+        print(f" - Segmentiert: {len(jobs)} Abschnitte")
+        try:
+            segment_list = encoder.run(jobs, _print_segment_progress)
+        except SegmentError as e:
+            os.unlink(list_path)
+            print("Fehler:", e)
+            return 1
+        cmd = build_concat_mux_command(
+            segment_list, audio, str(out_file), audio_args, dur
+        )
     try:
-        res = run_ffmpeg(cmd)
+        res = _run_output(cmd, audio, preview)
     finally:
         try:
             os.unlink(list_path)
@@ -623,7 +863,48 @@ def main() -> None:
     parser.add_argument("--video-bufsize")
     parser.add_argument("--audio-sample-rate", type=int)
     parser.add_argument("--audio-channels", type=int)
-    parser.add_argument("--audio-normalize", action="store_true")
+    parser.add_argument(
+        "--audio-normalize",
+        action="store_true",
+        help="Lautheit angleichen (-16 LUFS, zwei Durchgänge, Messung im Cache)",
+    )
+    parser.add_argument(
+        "--still-optimized",
+        action="store_true",
+        help="Standbild-Ausgabe mit 1 fps bzw. einem Bild pro Dia (VFR)",
+    )
+    parser.add_argument(
+        "--segmented",
+        action="store_true",
+        help="Lange Einträge (ab 30 min) in Abschnitten parallel kodieren",
+    )
+    parser.add_argument(
+        "--segment-dir",
+        default=None,
+        help="Ordner für Abschnitte; auf einem gemeinsamen Laufwerk helfen "
+        "andere Rechner mit demselben Befehl mit",
+    )
+    parser.add_argument(
+        "--preview",
+        nargs="?",
+        type=float,
+        const=PREVIEW_SECONDS,
+        default=None,
+        metavar="SEKUNDEN",
+        help="nur eine kurze Vorschau in kleiner Auflösung rendern und öffnen",
+    )
+    parser.add_argument(
+        "--preview-windows",
+        type=int,
+        default=1,
+        help="Zahl der Vorschau-Ausschnitte, gleichmäßig über die Laufzeit",
+    )
+    parser.add_argument(
+        "--no-prescale",
+        dest="prescale",
+        action="store_false",
+        help="Bilder nicht vorab skalieren (ffmpeg skaliert selbst)",
+    )
     parser.add_argument(
         "--order",
         choices=["natural", "name", "mtime"],
@@ -662,41 +943,77 @@ def main() -> None:
 
     if args.selftest:
         sys.exit(run_selftests())
+    preview = None
+    if args.preview is not None:
+        preview = PreviewSpec(args.preview, max(1, args.preview_windows))
+        args.width, args.height = preview_size(args.width, args.height)
+        args.preset = PREVIEW_PRESET
+        args.crf = max(args.crf, PREVIEW_CRF)
+        args.segmented = False
+        args.out = str(reset_preview_dir())
+        print(
+            f"Vorschau: {preview.windows} × {preview.seconds:g} s, "
+            f"{args.width}x{args.height}, Ordner {args.out}"
+        )
     if args.mode == "single" and args.img and args.aud:
         sys.exit(
-            cli_single(
-                args.img,
-                args.aud,
+            _finish_preview(
+                cli_single(
+                    args.img,
+                    args.aud,
+                    args.out,
+                    args.width,
+                    args.height,
+                    args.crf,
+                    args.preset,
+                    args.abitrate,
+                    args.still_optimized,
+                    args.prescale,
+                    args.segmented,
+                    args.segment_dir,
+                    preview=preview,
+                    audio_normalize=args.audio_normalize,
+                ),
+                preview,
                 args.out,
-                args.width,
-                args.height,
-                args.crf,
-                args.preset,
-                args.abitrate,
             )
         )
     if args.mode == "multi-audio" and args.img and args.aud:
         sys.exit(
-            cli_multi_audio(
-                args.img[0],
-                args.aud,
+            _finish_preview(
+                cli_multi_audio(
+                    args.img[0],
+                    args.aud,
+                    args.out,
+                    args.width,
+                    args.height,
+                    args.crf,
+                    args.preset,
+                    args.abitrate,
+                    args.still_optimized,
+                    args.prescale,
+                    preview=preview,
+                    audio_normalize=args.audio_normalize,
+                ),
+                preview,
                 args.out,
-                args.width,
-                args.height,
-                args.crf,
-                args.preset,
-                args.abitrate,
             )
         )
     if args.mode == "video" and args.img and args.aud:
         sys.exit(
-            cli_video(
-                args.img[0],
-                args.aud[0],
+            _finish_preview(
+                cli_video(
+                    args.img[0],
+                    args.aud[0],
+                    args.out,
+                    args.crf,
+                    args.preset,
+                    args.abitrate,
+                    preview=preview,
+                    audio_normalize=args.audio_normalize,
+                ),
+                preview,
                 args.out,
-                args.crf,
-                args.preset,
-                args.abitrate,
             )
         )
     if args.mode == "slideshow" and args.img and args.aud:
@@ -706,42 +1023,51 @@ def main() -> None:
         if not patterns:
             patterns = None
         sys.exit(
-            cli_slideshow(
-                args.img[0],
-                args.aud[0],
+            _finish_preview(
+                cli_slideshow(
+                    args.img[0],
+                    args.aud[0],
+                    args.out,
+                    args.width,
+                    args.height,
+                    args.crf,
+                    args.preset,
+                    args.abitrate,
+                    args.image_duration,
+                    args.min_image_duration,
+                    args.framerate,
+                    args.background,
+                    args.video_filter,
+                    args.audio_fade,
+                    args.audio_filter,
+                    args.order,
+                    args.reverse,
+                    args.shuffle,
+                    args.shuffle_seed,
+                    args.image_fit,
+                    patterns,
+                    args.video_codec,
+                    args.audio_codec,
+                    args.pix_fmt,
+                    args.movflags,
+                    args.video_bitrate,
+                    args.video_tune,
+                    args.video_profile,
+                    args.video_level,
+                    args.gop_size,
+                    args.video_maxrate,
+                    args.video_bufsize,
+                    args.audio_sample_rate,
+                    args.audio_channels,
+                    args.audio_normalize,
+                    prescale=args.prescale,
+                    still_optimized=args.still_optimized,
+                    segmented=args.segmented,
+                    segment_root=args.segment_dir,
+                    preview=preview,
+                ),
+                preview,
                 args.out,
-                args.width,
-                args.height,
-                args.crf,
-                args.preset,
-                args.abitrate,
-                args.image_duration,
-                args.min_image_duration,
-                args.framerate,
-                args.background,
-                args.video_filter,
-                args.audio_fade,
-                args.audio_filter,
-                args.order,
-                args.reverse,
-                args.shuffle,
-                args.shuffle_seed,
-                args.image_fit,
-                patterns,
-                args.video_codec,
-                args.audio_codec,
-                args.pix_fmt,
-                args.movflags,
-                args.video_bitrate,
-                args.video_tune,
-                args.video_profile,
-                args.video_level,
-                args.gop_size,
-                args.video_maxrate,
-                args.video_bufsize,
-                args.audio_sample_rate,
-                args.audio_channels,
-                args.audio_normalize,
             )
         )
     print("GUI starten: python3 videobatch_launcher.py")
@@ -15,20 +15,95 @@ import subprocess
 import sys
 import tempfile
 import threading
+import time
 import urllib.parse
-from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
-from dataclasses import dataclass, field
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from PySide6 import QtCore, QtGui, QtMultimedia, QtWidgets
 from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import QHeaderView
 
+from core.audio_copy import describe_decision, plan_audio_args
+from core.batch_journal import OUTPUT_SETTING_KEYS, BatchJournal, job_key
+from core.deadline import (
+    PRESETS,
+    choose_preset,
+    next_deadline,
+    preset_seconds,
+)
+from core.encode_history import (
+    EncodeHistory,
+    EncodeProfile,
+    EncodeRecord,
+    EtaPredictor,
+    RunningEta,
+    current_load,
+    remaining_seconds,
+)
+from core.ffmpeg_progress import ProgressReader, with_progress_args
+from core.preview import (
+    PREVIEW_SECONDS,
+    PreviewSpec,
+    preview_settings,
+    render_preview,
+    reset_preview_dir,
+)
+from core.progress_aggregator import ProgressAggregator, ProgressFlush
+from core.image_dedupe import find_duplicates, redundant_images
+from core.image_prep import prepare_images
+from core.job_order import (
+    ORDER_LABELS,
+    ORDER_TABLE,
+    ORDERS,
+    job_cost,
+    order_key,
+)
+from core.live_queue import LiveQueue
+from core.loudness import one_pass_filter, with_loudnorm
+from core.media_info import probe_worker_count
+from core.output_cache import OutputCache, unlink_shared
+from core.pairing import pair_by_name
+from core.parallelism import (
+    ENCODE,
+    AdaptiveScheduler,
+    job_kind,
+    with_thread_args,
+)
 from core.paths import config_dir, log_dir, user_data_dir
 from core.plugins import PluginManager
+from core.renditions import Rendition, build_ladder_command, parse_ladder
+from core.segments import (
+    MIN_SEGMENTED_SECONDS,
+    SEGMENT_FPS,
+    Segment,
+    SegmentedEncoder,
+    SegmentError,
+    SegmentJob,
+    build_concat_mux_command,
+    concat_input,
+    plan_segments,
+    segment_command,
+    segment_job,
+    slideshow_job,
+)
+from core.still_cache import (
+    StillSegmentCache,
+    build_mux_command,
+    is_still_image,
+    scale_pad_filter,
+)
+from core.still_mode import (
+    STILL_OUTPUT_FPS,
+    still_source,
+    still_video_args,
+)
+from core.tail_extend import extend_with_tail
 from core.themes import load_themes
 from core.ui_profiles import resolve_interface_profile, resolve_spacing_profile
 from core.ui_texts import load_ui_texts, text_with_fallback
@@ -39,6 +114,13 @@ from core.utils import (
     probe_duration,
 )
 from core.validation import normalize_audio_bitrate, validate_output_template
+from core.waveform import (
+    WAVEFORM_BINS,
+    WAVEFORM_WORKERS,
+    Peaks,
+    cached_peaks,
+    waveform_peaks,
+)
 from core.fallback_media import (
     dumps_audio_list,
     loads_audio_list,
@@ -85,6 +167,10 @@ AUDIO_EXTENSIONS = (".mp3", ".wav", ".flac", ".m4a", ".aac")
 SLIDESHOW_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
 OUTPUT_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov")
 MAX_PREVIEW_CACHE_ITEMS = 180
+# Tabellenfortschritt wird gebuendelt mit 10 Hz neu gezeichnet.
+PROGRESS_FLUSH_MS = 100
+# Restzeit-Anzeige hoechstens so oft neu berechnen.
+ETA_REFRESH_MS = 1000
 
 
 def which(p: str):
@@ -156,6 +242,29 @@ def make_thumb(path: str, size: Tuple[int, int] = (160, 90)) -> QtGui.QPixmap:
         return pix
 
 
+def waveform_pixmap(
+    peaks: Peaks, width: int, height: int, color: QtGui.QColor
+) -> QtGui.QPixmap:
+    pix = QtGui.QPixmap(width, height)
+    pix.fill(Qt.transparent)
+    if not peaks:
+        return pix
+    painter = QtGui.QPainter(pix)
+    painter.setPen(color)
+    middle = height / 2
+    # Auf den lautesten Abschnitt skaliert, damit auch leise Dateien lesbar
+    # bleiben; der Verlauf innerhalb der Datei bleibt erhalten.
+    loudest = max(max(-low, high) for low, high in peaks) or 1
+    scale = (height / 2 - 1) / loudest
+    for x in range(width):
+        low, high = peaks[x * len(peaks) // width]
+        painter.drawLine(
+            x, round(middle - high * scale), x, round(middle - low * scale)
+        )
+    painter.end()
+    return pix
+
+
 class PreviewLabel(QtWidgets.QLabel):
     zoom_changed = Signal(float)
 
@@ -185,8 +294,12 @@ class FilePickerDialog(QtWidgets.QDialog):
         self._mode = mode
         self._selection_order: List[str] = []
         self._zoom = 1.0
-        self._audio_probe_cache: Dict[str, float] = {}
         self._image_preview_cache: Dict[str, QtGui.QPixmap] = {}
+        self._waveforms: Optional[WaveformScheduler] = None
+        if mode == "audio":
+            self._waveforms = WaveformScheduler(parent=self)
+            self._waveforms.ready.connect(self._on_waveform)
+            self.finished.connect(self._waveforms.shutdown)
 
         self.current_dir = start_dir if start_dir.exists() else Path.home()
 
@@ -445,12 +558,17 @@ class FilePickerDialog(QtWidgets.QDialog):
         path = Path(current.data(0, Qt.UserRole))
         info = [f"Datei: {path.name}", f"Pfad: {path}"]
         if self._mode == "audio":
-            if str(path) not in self._audio_probe_cache:
-                self._audio_probe_cache[str(path)] = probe_duration(str(path))
-            dur = self._audio_probe_cache[str(path)]
+            dur = probe_duration(str(path))
             info.append(f"Dauer: {human_time(max(0.0, dur))}")
-            self.preview_label.setText("Audio-Vorschau: Doppelklick in Liste")
-            self.preview_label.setPixmap(QtGui.QPixmap())
+            info.append("Audio-Vorschau: Doppelklick in Liste")
+            peaks = cached_peaks(str(path))
+            if peaks is not None:
+                self._show_waveform(peaks)
+            else:
+                self.preview_label.setPixmap(QtGui.QPixmap())
+                self.preview_label.setText("Wellenform wird berechnet …")
+                if self._waveforms is not None:
+                    self._waveforms.request([str(path)])
         else:
             if str(path) not in self._image_preview_cache:
                 self._cache_image_preview(
@@ -471,6 +589,26 @@ class FilePickerDialog(QtWidgets.QDialog):
             self.preview_label.setText("")
         self.preview_info.setPlainText("\n".join(info))
 
+    def _show_waveform(self, peaks: Peaks) -> None:
+        self.preview_label.setText("")
+        self.preview_label.setPixmap(
+            waveform_pixmap(
+                peaks,
+                int(640 * self._zoom),
+                int(160 * self._zoom),
+                QtGui.QColor("#4FC3F7"),
+            )
+        )
+
+    def _on_waveform(self, path: str, peaks: Optional[Peaks]) -> None:
+        current = self.file_list.currentItem()
+        if current is None or current.data(0, Qt.UserRole) != path:
+            return
+        if peaks is None:
+            self.preview_label.setText("Keine Wellenform verfügbar")
+        else:
+            self._show_waveform(peaks)
+
     def selected_files(self) -> List[str]:
         return list(self._selection_order)
 
@@ -496,9 +634,12 @@ class PairItem:
     output: str = ""
     status: str = "WARTET"
     progress: float = 0.0
+    speed: float = 0.0
+    eta: float = 0.0
     thumb: Optional[QtGui.QPixmap] = field(default=None, repr=False)
     valid: bool = True
     validation_msg: str = ""
+    probing: bool = False
 
     def update_duration(self):
         if self.audio_path:
@@ -558,6 +699,13 @@ class PairTableModel(QAbstractTableModel):
     def __init__(self, pairs: List[PairItem]):
         super().__init__()
         self.pairs = pairs
+        # Geschaetzte Kodierdauer je Paar aus dem Verlauf (optional).
+        self.estimate: Optional[Callable[[PairItem], Optional[float]]] = None
+        # Dauer im Hintergrund ermitteln (ProbeScheduler.submit); ohne
+        # Hook wie bisher direkt.
+        self.probe: Optional[Callable[[List[PairItem]], int]] = None
+        # Zeile je Paar (Objekt-Identitaet); nach Entfernen neu aufgebaut.
+        self._rows: Optional[Dict[int, int]] = None
 
     def rowCount(self, parent=QModelIndex()):
         return len(self.pairs)
@@ -583,11 +731,22 @@ class PairTableModel(QAbstractTableModel):
             if col == 3:
                 return item.audio_path or "—"
             if col == 4:
+                if item.probing:
+                    return "prüfe…"
                 return human_time(item.duration) if item.duration else "?"
             if col == 5:
                 return item.output or "—"
             if col == 6:
-                return f"{int(item.progress)}%"
+                text = f"{int(item.progress)}%"
+                if item.status == "ENCODIERE" and item.speed:
+                    text += f" · {item.speed:.1f}x"
+                    if item.eta:
+                        text += f" · noch {human_time(item.eta)}"
+                elif item.status == "WARTET" and self.estimate is not None:
+                    seconds = self.estimate(item)
+                    if seconds is not None:
+                        text += f" · ca. {human_time(seconds)}"
+                return text
             if col == 7:
                 return item.status
         if role == Qt.DecorationRole and col == 1:
@@ -624,7 +783,11 @@ class PairTableModel(QAbstractTableModel):
             item.thumb = None
         elif col == 3:
             item.audio_path = value
-            item.update_duration()
+            if self.probe is not None:
+                item.duration = 0.0
+                self.probe([item])
+            else:
+                item.update_duration()
         elif col == 5:
             item.output = value
         else:
@@ -633,11 +796,47 @@ class PairTableModel(QAbstractTableModel):
         self.dataChanged.emit(idx, idx)
         return True
 
+    def row_of(self, item: PairItem) -> int:
+        if self._rows is None:
+            self._rows = {id(pair): row for row, pair in enumerate(self.pairs)}
+        row = self._rows.get(id(item), -1)
+        if 0 <= row < len(self.pairs) and self.pairs[row] is item:
+            return row
+        if row >= 0:
+            # Veralteter Index (z. B. parallel aus dem Worker aufgebaut).
+            rows = {id(pair): i for i, pair in enumerate(self.pairs)}
+            self._rows = rows
+            row = rows.get(id(item), -1)
+            if 0 <= row < len(self.pairs) and self.pairs[row] is item:
+                return row
+        return -1
+
+    def refresh_row(self, row: int) -> None:
+        self.refresh_rows(row, row)
+
+    def refresh_rows(
+        self,
+        first: int,
+        last: int,
+        first_col: int = 0,
+        last_col: int = len(COLUMNS) - 1,
+    ) -> None:
+        first = max(0, first)
+        last = min(last, len(self.pairs) - 1)
+        if first <= last:
+            self.dataChanged.emit(
+                self.index(first, first_col), self.index(last, last_col)
+            )
+
     def add_pairs(self, new_pairs: List[PairItem]):
         self.beginInsertRows(
             QModelIndex(), len(self.pairs), len(self.pairs) + len(new_pairs) - 1
         )
+        start = len(self.pairs)
         self.pairs.extend(new_pairs)
+        if self._rows is not None:
+            for offset, pair in enumerate(new_pairs):
+                self._rows[id(pair)] = start + offset
         self.endInsertRows()
 
     def remove_rows(self, rows: List[int]):
@@ -645,18 +844,154 @@ class PairTableModel(QAbstractTableModel):
             if 0 <= r < len(self.pairs):
                 self.beginRemoveRows(QModelIndex(), r, r)
                 self.pairs.pop(r)
+                self._rows = None
                 self.endRemoveRows()
 
     def clear(self):
         self.beginResetModel()
         self.pairs.clear()
+        self._rows = None
         self.endResetModel()
 
 
+# ---------- Probe ----------
+class ProbeScheduler(QtCore.QObject):
+    """Ermittelt Audiodauern im Hintergrund auf einem begrenzten Pool."""
+
+    # Paar, gepruefter Audiopfad, Dauer
+    probed = Signal(object, str, float)
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=probe_worker_count(),
+            thread_name_prefix="probe",
+        )
+
+    def submit(self, items: List[PairItem]) -> int:
+        count = 0
+        for item in items:
+            if not item.audio_path:
+                continue
+            item.probing = True
+            self._executor.submit(self._probe, item, item.audio_path)
+            count += 1
+        return count
+
+    def _probe(self, item: PairItem, audio_path: str) -> None:
+        try:
+            duration = probe_duration(audio_path)
+        except Exception as e:
+            logger.warning("Dauer konnte nicht ermittelt werden: %s", e)
+            duration = 0.0
+        self.probed.emit(item, audio_path, duration)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class DuplicateScheduler(QtCore.QObject):
+    """Vergleicht neue Bilder im Hintergrund mit der Bildliste.
+
+    Ein Vergleich zur Zeit; das Ergebnis kommt per Signal in den GUI-Thread.
+    """
+
+    # neue Dateien, ueberfluessige Pfade, Dateien noch nicht uebernommen
+    checked = Signal(object, object, bool)
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="dedupe"
+        )
+
+    def submit(
+        self, files: List[str], existing: List[str], pending: bool
+    ) -> None:
+        self._executor.submit(self._check, list(files), existing, pending)
+
+    def _check(
+        self, files: List[str], existing: List[str], pending: bool
+    ) -> None:
+        candidates = [f for f in files if Path(f).is_file()]
+        redundant: Set[str] = set()
+        if len(existing) + len(candidates) >= 2:
+            try:
+                redundant = redundant_images(
+                    find_duplicates(existing + candidates)
+                )
+            except Exception as e:
+                logger.warning("Bildvergleich fehlgeschlagen: %s", e)
+        self.checked.emit(files, redundant, pending)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class WaveformScheduler(QtCore.QObject):
+    """Berechnet Wellenformen im Hintergrund; nur was gerade sichtbar ist."""
+
+    ready = Signal(str, object)
+
+    def __init__(
+        self, bins: int = WAVEFORM_BINS, parent: Optional[QtCore.QObject] = None
+    ):
+        super().__init__(parent)
+        self.bins = bins
+        self._executor = ThreadPoolExecutor(
+            max_workers=WAVEFORM_WORKERS,
+            thread_name_prefix="waveform",
+        )
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+
+    def request(self, paths: List[str]) -> None:
+        """Ersetzt die Warteschlange: weggescrollte Zeilen entfallen."""
+        wanted = set(paths)
+        with self._lock:
+            for path, future in list(self._pending.items()):
+                if path not in wanted and future.cancel():
+                    del self._pending[path]
+            for path in paths:
+                if path not in self._pending:
+                    self._pending[path] = self._executor.submit(
+                        self._compute, path
+                    )
+
+    def _compute(self, path: str) -> None:
+        try:
+            peaks = waveform_peaks(path, self.bins)
+        except Exception as e:
+            logger.warning("Wellenform nicht berechenbar: %s", e)
+            peaks = None
+        with self._lock:
+            self._pending.pop(path, None)
+        self.ready.emit(path, peaks)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def encode_profile(settings: Dict[str, Any]) -> EncodeProfile:
+    ladder = parse_ladder(settings.get("renditions", "") or "")
+    # Bei Aufloesungsstufen bestimmt die groesste Stufe das Tempo.
+    width, height = (
+        (ladder[0].width, ladder[0].height)
+        if ladder
+        else (settings["width"], settings["height"])
+    )
+    return EncodeProfile(
+        settings.get("mode", "Standard"),
+        int(width),
+        int(height),
+        settings["preset"],
+        int(settings["crf"]),
+        bool(settings.get("still_optimized")),
+    )
+
+
 # ---------- Worker ----------
 class EncodeWorker(QtCore.QObject):
-    row_progress = Signal(int, float)
-    overall_progress = Signal(float)
     row_error = Signal(int, str)
     log = Signal(str)
     finished = Signal()
@@ -667,20 +1002,61 @@ class EncodeWorker(QtCore.QObject):
         settings: Dict[str, Any],
         copy_only: bool,
         plugin_manager: Optional[PluginManager] = None,
+        preview: Optional[PreviewSpec] = None,
+        row_of: Optional[Callable[[PairItem], int]] = None,
     ):
         super().__init__()
         self.pairs = pairs
+        # Zeilen-Index der Tabelle; ohne (Vorschau) wird gesucht.
+        self._row_lookup = row_of
         self.settings = settings
         self.copy_only = copy_only
+        # Vorschau: nur Ausschnitte, kein Journal, keine Ablage der Quellen.
+        self.preview = preview
         self._stop_event = threading.Event()
         self._process_lock = threading.Lock()
         self._processes: List[subprocess.Popen] = []
-        self._progress_lock = threading.Lock()
-        self._completed = 0
+        self.progress = ProgressAggregator(len(pairs))
+        self._renditions = len(parse_ladder(settings.get("renditions", "")))
+        self.profile = encode_profile(settings)
+        # Messwerte fuer die Restzeit; Vorschauen zaehlen nicht.
+        self._history = EncodeHistory()
+        self._predictor = EtaPredictor(self._history.recent())
+        self.eta = RunningEta()
+        self._slow_reported = False
+        self._running_lock = threading.Lock()
+        self._running: List[PairItem] = []
+        self._plan_lock = threading.Lock()
+        # Zuletzt per Termin gewaehltes Preset (nur unter _plan_lock).
+        self._deadline_preset: Optional[str] = None
+        self._deadline_notes: Set[str] = set()
+        # Neue Paare kommen waehrend des Laufs ueber enqueue() hinzu.
+        self._queue: LiveQueue[PairItem] = LiveQueue(
+            pairs,
+            close_when_idle=not settings.get("keep_queue_open", False),
+            key=order_key(
+                settings.get("job_order", ORDER_TABLE), self._job_cost
+            ),
+        )
+        self._queued: Set[Tuple[str, Optional[str]]] = {
+            (p.image_path, p.audio_path) for p in pairs
+        }
+        self._journal: Optional[BatchJournal] = None
+        self._output_cache = OutputCache()
+        self._scheduler = AdaptiveScheduler(
+            int(settings.get("parallel_jobs", 0) or 0)
+        )
         self.plugin_manager = plugin_manager
+        self._still_cache = StillSegmentCache()
+        self._segments = SegmentedEncoder(
+            self._run_segment,
+            max_workers=self._scheduler.max_concurrency,
+            stop=self._stop_event,
+        )
 
     def stop(self):
         self._stop_event.set()
+        self._queue.close()
         with self._process_lock:
             for proc in list(self._processes):
                 try:
@@ -688,6 +1064,60 @@ class EncodeWorker(QtCore.QObject):
                 except Exception:
                     continue
 
+    def enqueue(self, items: List[PairItem]) -> int:
+        """Haengt gueltige, noch unbekannte Paare an den laufenden Stapel."""
+        fresh: List[PairItem] = []
+        for item in items:
+            key = (item.image_path, item.audio_path)
+            if item.status != "WARTET" or item.probing or key in self._queued:
+                continue
+            item.validate()
+            if item.valid:
+                fresh.append(item)
+                self._queued.add(key)
+        if not fresh:
+            return 0
+        self.progress.add_jobs(len(fresh))
+        added = self._queue.extend(fresh)
+        if added < len(fresh):
+            # Schlange schon geschlossen: nicht mehr als offen zaehlen.
+            self.progress.add_jobs(added - len(fresh))
+        return added
+
+    def is_pending(self, item: PairItem) -> bool:
+        return self._queue.is_pending(item)
+
+    def cancel(self, item: PairItem) -> bool:
+        """Nimmt ein wartendes Paar aus der Schlange."""
+        if not self._queue.cancel(item):
+            return False
+        item.status = "ABGEBROCHEN"
+        self._mark_complete(self._row_of(item), item)
+        return True
+
+    def move_to_front(self, item: PairItem) -> bool:
+        return self._queue.move_to_front(item)
+
+    def set_keep_open(self, keep_open: bool) -> None:
+        self._queue.set_close_when_idle(not keep_open)
+
+    def _job_cost(self, item: PairItem) -> float:
+        return job_cost(
+            item.duration,
+            self.settings.get("mode", "Standard"),
+            still=bool(self.settings.get("still_optimized")),
+            renditions=max(1, self._renditions),
+        )
+
+    def _row_of(self, item: PairItem) -> int:
+        # Zeilen koennen waehrend des Laufs dazukommen; Position erst jetzt.
+        if self._row_lookup is not None:
+            return self._row_lookup(item)
+        for row, pair in enumerate(self.pairs):
+            if pair is item:
+                return row
+        return -1
+
     def _escape_ffmpeg_path(self, path: Path) -> str:
         return path.as_posix().replace("'", r"\'")
 
@@ -700,58 +1130,372 @@ class EncodeWorker(QtCore.QObject):
             if proc in self._processes:
                 self._processes.remove(proc)
 
-    def _mark_complete(self, total: int) -> None:
-        with self._progress_lock:
-            self._completed += 1
-            completed = self._completed
-        self.overall_progress.emit(completed / max(1, total) * 100.0)
+    def _run_quiet(self, cmd: List[str]) -> int:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        self._register_process(proc)
+        try:
+            _, err = proc.communicate()
+        finally:
+            self._unregister_process(proc)
+        if proc.returncode != 0 and err:
+            lines = err.strip().splitlines()
+            logger.warning("FFmpeg-Fehler: %s", lines[-1] if lines else err)
+        return proc.returncode
+
+    def _run_capture(
+        self, cmd: List[str]
+    ) -> "subprocess.CompletedProcess[str]":
+        """Wie ``subprocess.run``, aber per Stopp abbrechbar."""
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        self._register_process(proc)
+        try:
+            out, err = proc.communicate()
+        finally:
+            self._unregister_process(proc)
+        return subprocess.CompletedProcess(cmd, proc.returncode, out, err)
 
-    def _encode_item(self, index: int, item: PairItem, total: int) -> None:
-        list_path: Optional[str] = None
-        if self._stop_event.is_set():
-            item.status = "ABGEBROCHEN"
-            self._mark_complete(total)
-            return
-        item.validate()
-        if not item.valid:
-            item.status = "FEHLER"
-            self.row_error.emit(index, item.validation_msg)
-            self._mark_complete(total)
-            return
-        proc: Optional[subprocess.Popen] = None
+    def _run_segment(self, cmd: List[str]) -> int:
+        token = self._scheduler.acquire(ENCODE, self._stop_event)
+        if token is None:
+            return -1
         try:
-            item.status = "ENCODIERE"
-            item.progress = 0.0
-            self.row_progress.emit(index, 0.0)
-            out_dir = Path(self.settings["out_dir"]).resolve()
-            out_dir.mkdir(parents=True, exist_ok=True)
-            w, h = self.settings["width"], self.settings["height"]
-            crf = self.settings["crf"]
-            preset = self.settings["preset"]
-            ab = self.settings["abitrate"]
-            duration = item.duration or 1
-            mode = self.settings.get("mode", "Standard")
-            quality_label = f"crf{crf}_{preset}"
-            form_label = mode.replace(" + ", "_").replace(" ", "_")
-            item.output = build_out_name(
-                item.audio_path,
-                out_dir,
-                self.settings.get("output_template"),
-                duration_seconds=item.duration,
-                quality=quality_label,
-                resolution=f"{w}x{h}",
-                form=form_label,
+            threads = self._scheduler.threads_for(ENCODE)
+            return self._run_quiet(with_thread_args(cmd, threads))
+        finally:
+            self._scheduler.release(token, ENCODE)
+
+    @contextmanager
+    def _cpu_slot(self) -> Iterator[int]:
+        """Kodier-Slot fuer CPU-lastige Vorarbeit (Bilder, Lautheit).
+
+        Liefert die Threadzahl, die der Arbeit zusteht.
+        """
+        token = self._scheduler.acquire(ENCODE, self._stop_event)
+        if token is None:
+            raise Exception("Abbruch durch Benutzer")
+        try:
+            yield self._scheduler.threads_for(ENCODE)
+        finally:
+            self._scheduler.release(token, ENCODE)
+
+    def _segment_plan(self, item: PairItem, still: bool) -> List[Segment]:
+        # Standbild-Modus (1 fps/VFR) ist auch ohne Aufteilen schnell.
+        if still or not self.settings.get("segmented", True):
+            return []
+        if (item.duration or 0) < MIN_SEGMENTED_SECONDS:
+            return []
+        return plan_segments(item.duration or 0)
+
+    def _encode_segments(
+        self, index: int, item: PairItem, jobs: List[SegmentJob]
+    ) -> int:
+        unique = len({job.key for job in jobs})
+        self.log.emit(
+            f"{Path(item.output).name}: {len(jobs)} Abschnitte "
+            f"({unique} verschieden) werden parallel kodiert"
+        )
+
+        def on_progress(ready: int, total: int) -> None:
+            # Der Rest entfaellt auf das Zusammenfuegen mit dem Audio.
+            item.progress = 95.0 * ready / max(1, total)
+            self.progress.touch(index)
+
+        try:
+            self._segments.run(jobs, on_progress)
+        except SegmentError as e:
+            if not self._stop_event.is_set():
+                self.log.emit(f"Abschnitte fehlgeschlagen: {e}")
+            return 1
+        return 0
+
+    def _render_preview(
+        self, cmd: List[str], index: int, item: PairItem
+    ) -> int:
+        assert self.preview is not None
+        spec = self.preview
+        if self.settings.get("mode") == "Video + Audio":
+            # Hinter dem Videoende gaebe es nur Ton; der Anfang genuegt.
+            spec = replace(spec, windows=1)
+
+        def on_progress(done: int, total: int) -> None:
+            item.progress = 90.0 * done / total
+            self.progress.touch(index)
+
+        return render_preview(
+            cmd, item.duration, spec, self._run_segment, on_progress
+        )
+
+    def _mark_complete(self, index: int, item: PairItem) -> None:
+        self.progress.finish(index, item.status)
+
+    def _run_with_progress(
+        self, cmd: List[str], index: int, item: PairItem
+    ) -> int:
+        kind = job_kind(cmd)
+        token = self._scheduler.acquire(kind, self._stop_event)
+        if token is None:
+            return -1
+        cmd = with_thread_args(cmd, self._scheduler.threads_for(kind))
+        # stderr landet in einer Datei, damit die Pipe nie volllaeuft;
+        # der Fortschritt kommt maschinenlesbar ueber stdout.
+        with tempfile.TemporaryFile(mode="w+") as stderr_log:
+            try:
+                proc = subprocess.Popen(
+                    with_progress_args(cmd),
+                    stderr=stderr_log,
+                    stdout=subprocess.PIPE,
+                    text=True,
+                )
+            except BaseException:
+                self._scheduler.release(token, kind)
+                raise
+            self._register_process(proc)
+            try:
+                reader = ProgressReader(item.duration)
+                if proc.stdout:
+                    for line in proc.stdout:
+                        if self._stop_event.is_set():
+                            proc.kill()
+                            break
+                        snap = reader.feed(line)
+                        if snap is None or snap.done:
+                            continue
+                        item.speed = snap.speed
+                        item.eta = snap.eta
+                        self._scheduler.report_speed(token, snap.speed)
+                        if item.duration:
+                            item.progress = snap.percent
+                            self.progress.touch(index)
+                proc.wait()
+            finally:
+                self._unregister_process(proc)
+                self._scheduler.release(token, kind)
+            if proc.returncode != 0 and not self._stop_event.is_set():
+                stderr_log.seek(0)
+                lines = stderr_log.read().strip().splitlines()
+                if lines:
+                    logger.warning("FFmpeg-Fehler: %s", lines[-1])
+        return proc.returncode
+
+    def _output_cache_key(
+        self, item: PairItem, audio_path: str, preset: str
+    ) -> Optional[str]:
+        """Schluessel aus Eingabe-Inhalten und Ausgabe-Einstellungen.
+
+        Haengt nicht vom fertigen Befehl ab, damit ein Treffer Messung,
+        Segmente und Bildvorbereitung ganz einspart. Plugins koennen den
+        Befehl noch aendern; dann wird nicht zwischengespeichert.
+        """
+        if not self.settings.get("output_cache", True):
+            return None
+        if self.plugin_manager is not None and self.plugin_manager.has_hook(
+            "before_encode"
+        ):
+            return None
+        settings = {
+            key: self.settings.get(key) for key in sorted(OUTPUT_SETTING_KEYS)
+        }
+        settings["preset"] = preset
+        description = {
+            "settings": settings,
+            "duration": item.duration,
+            "loudnorm": (
+                one_pass_filter() if settings["audio_normalize"] else ""
+            ),
+            "suffix": Path(str(item.output)).suffix,
+        }
+        cmd = ["videobatch", json.dumps(description, sort_keys=True)]
+        try:
+            if settings["mode"] == "Slideshow":
+                images = [str(p) for p in self._slideshow_images(item)]
+            else:
+                images = [item.image_path]
+            return self._output_cache.key_for([*images, audio_path], cmd, {})
+        except OSError as e:
+            logger.warning("Ausgabe-Cache übersprungen: %s", e)
+            return None
+
+    def _job_key(self, item: PairItem) -> Optional[str]:
+        try:
+            return job_key(
+                [item.image_path, item.audio_path or ""], self.settings
             )
-            if mode == "Video + Audio":
-                vdur = probe_duration(item.image_path)
-                extra = max(0.0, duration - vdur)
+        except OSError:
+            return None
+
+    def _skip_finished(self, index: int, item: PairItem, key: str) -> bool:
+        if self._journal is None:
+            return False
+        done = self._journal.completed_output(key)
+        if done is None:
+            return False
+        item.output = str(done)
+        item.status = "FERTIG"
+        item.progress = 100.0
+        self.log.emit(f"Übersprungen (bereits fertig): {done}")
+        self._mark_complete(index, item)
+        return True
+
+    @staticmethod
+    def _slideshow_images(item: PairItem) -> List[Path]:
+        img_dir = Path(item.image_path)
+        imgs: List[Path] = []
+        for ext in ("*.jpg", "*.jpeg", "*.png", "*.bmp", "*.webp"):
+            imgs.extend(sorted(img_dir.glob(ext)))
+        if not imgs:
+            raise Exception("Keine Bilder für Slideshow")
+        return imgs
+
+    def _slideshow_list(
+        self, item: PairItem, w: int, h: int, duration: float
+    ) -> Tuple[List[Path], List[Path], float, str]:
+        imgs = self._slideshow_images(item)
+        with self._cpu_slot() as threads:
+            frames = prepare_images(imgs, w, h, max_workers=threads)
+        self.log.emit(f"{len(frames)} Bilder auf {w}x{h} vorbereitet")
+        per = duration / len(imgs) if duration else 2
+        with tempfile.NamedTemporaryFile(
+            delete=False, mode="w", suffix=".txt"
+        ) as f:
+            for im in frames:
+                escaped_path = self._escape_ffmpeg_path(im)
+                f.write(f"file '{escaped_path}'\n")
+                f.write(f"duration {per}\n")
+            escaped_last = self._escape_ffmpeg_path(frames[-1])
+            f.write(f"file '{escaped_last}'\n")
+        return imgs, frames, per, f.name
+
+    def _ladder_command(
+        self,
+        item: PairItem,
+        mode: str,
+        ladder: List[Rendition],
+        audio_path: str,
+        outputs: List[str],
+        audio_args: List[str],
+        preset: str,
+    ) -> Tuple[List[str], Optional[str]]:
+        """Ein Lauf fuer alle Aufloesungsstufen; Quelle in groesster Stufe."""
+        w, h = ladder[0].width, ladder[0].height
+        crf = self.settings["crf"]
+        still = bool(self.settings.get("still_optimized"))
+        duration = item.duration or 1
+        encoder = ["-c:v", "libx264", "-preset", preset, "-crf", str(crf)]
+        list_path: Optional[str] = None
+        pre_filter = ""
+        if mode == "Video + Audio":
+            input_args = ["-i", item.image_path]
+            extra = max(0.0, duration - probe_duration(item.image_path))
+            if extra > 0:
+                pre_filter = f"tpad=stop_mode=clone:stop_duration={extra}"
+        elif mode == "Slideshow":
+            _, _, _, list_path = self._slideshow_list(item, w, h, duration)
+            input_args = concat_input(Path(list_path))
+            if still:
+                encoder += still_video_args(None, item.duration)
+        else:
+            source = still_source(
+                item.image_path, w, h, STILL_OUTPUT_FPS if still else None
+            )
+            input_args = source.args
+            encoder += (
+                still_video_args(duration=item.duration)
+                if still
+                else ["-tune", "stillimage"]
+            )
+        self.log.emit(
+            "Auflösungsstufen in einem Durchgang: "
+            + ", ".join(f"{r.name} ({r.size})" for r in ladder)
+        )
+        cmd = build_ladder_command(
+            input_args,
+            audio_path,
+            ladder,
+            outputs,
+            encoder,
+            audio_args,
+            pre_filter,
+        )
+        return cmd, list_path
+
+    def _item_command(
+        self,
+        item: PairItem,
+        audio_path: str,
+        ladder: List[Rendition],
+        outputs: List[str],
+        preset: str,
+        temp_files: List[str],
+    ) -> Tuple[List[str], List[SegmentJob]]:
+        """Baut den ffmpeg-Befehl samt Vorarbeit; Hilfsdateien landen in
+        ``temp_files`` und werden vom Aufrufer entfernt."""
+        w, h = self.settings["width"], self.settings["height"]
+        crf = self.settings["crf"]
+        ab = self.settings["abitrate"]
+        duration = item.duration or 1
+        mode = self.settings.get("mode", "Standard")
+        still = bool(self.settings.get("still_optimized"))
+        segment_jobs: List[SegmentJob] = []
+        normalize = bool(self.settings.get("audio_normalize", False))
+        audio = plan_audio_args(audio_path, ab, has_filters=normalize)
+        if normalize:
+            # Misst nur beim ersten Mal; danach kommen die Werte aus dem
+            # Cache (auch fuer Vorschau und Aufloesungsstufen).
+            with self._cpu_slot():
+                audio = with_loudnorm(audio, audio_path, self._run_capture)
+        self.log.emit(f"{Path(audio_path).name}: {describe_decision(audio)}")
+        if ladder:
+            cmd, list_path = self._ladder_command(
+                item, mode, ladder, audio_path, outputs, audio.args, preset
+            )
+            if list_path:
+                temp_files.append(list_path)
+        elif mode == "Video + Audio":
+            vdur = probe_duration(item.image_path)
+            extra = max(0.0, duration - vdur)
+            tail_list = None
+            if extra > 0 and self.preview is None:
+                tail_list = extend_with_tail(
+                    item.image_path,
+                    duration,
+                    crf,
+                    preset,
+                    self._run_segment,
+                )
+                self.log.emit(
+                    f"Videoende um {extra:.1f}s verlängert, Rest kopiert"
+                    if tail_list is not None
+                    else "Schlussbild nicht anhängbar – Video wird "
+                    "komplett neu kodiert"
+                )
+            if tail_list is not None:
+                cmd = build_concat_mux_command(
+                    tail_list,
+                    audio_path,
+                    str(item.output),
+                    audio.args,
+                    duration,
+                )
+            else:
                 cmd = [
                     "ffmpeg",
                     "-y",
                     "-i",
                     item.image_path,
                     "-i",
-                    item.audio_path,
+                    audio_path,
                 ]
                 if extra > 0:
                     cmd += [
@@ -763,10 +1507,7 @@ class EncodeWorker(QtCore.QObject):
                 else:
                     cmd += ["-c:v", "copy"]
                 cmd += [
-                    "-c:a",
-                    "aac",
-                    "-b:a",
-                    ab,
+                    *audio.args,
                     "-shortest",
                     "-preset",
                     preset,
@@ -774,130 +1515,290 @@ class EncodeWorker(QtCore.QObject):
                     str(crf),
                     item.output,
                 ]
-            elif mode == "Slideshow":
-                img_dir = Path(item.image_path)
-                imgs = []
-                for ext in ("*.jpg", "*.jpeg", "*.png", "*.bmp", "*.webp"):
-                    imgs.extend(sorted(img_dir.glob(ext)))
-                if not imgs:
-                    raise Exception("Keine Bilder für Slideshow")
-                per = duration / len(imgs) if duration else 2
-                with tempfile.NamedTemporaryFile(
-                    delete=False, mode="w", suffix=".txt"
-                ) as f:
-                    for im in imgs:
-                        escaped_path = self._escape_ffmpeg_path(im)
-                        f.write(f"file '{escaped_path}'\n")
-                        f.write(f"duration {per}\n")
-                    escaped_last = self._escape_ffmpeg_path(imgs[-1])
-                    f.write(f"file '{escaped_last}'\n")
-                    list_path = f.name
-                cmd = [
-                    "ffmpeg",
-                    "-y",
-                    "-f",
-                    "concat",
-                    "-safe",
-                    "0",
-                    "-i",
-                    list_path,
-                    "-i",
-                    item.audio_path,
+        elif mode == "Slideshow":
+            _, frames, per, list_path = self._slideshow_list(
+                item, w, h, duration
+            )
+            temp_files.append(list_path)
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                list_path,
+                "-i",
+                audio_path,
+                "-c:v",
+                "libx264",
+                *(still_video_args(None, item.duration) if still else []),
+                "-vf",
+                f"scale={w}:{h}:force_original_aspect_ratio=decrease,pad={w}:{h}:(ow-iw)/2:(oh-ih)/2",
+                *audio.args,
+                "-shortest",
+                "-preset",
+                preset,
+                "-crf",
+                str(crf),
+                item.output,
+            ]
+            segments = self._segment_plan(item, still)
+            if segments:
+                names = [str(frame) for frame in frames]
+                video_args = [
+                    "-vf",
+                    scale_pad_filter(w, h),
+                    "-r",
+                    str(SEGMENT_FPS),
                     "-c:v",
                     "libx264",
-                    "-vf",
-                    f"scale={w}:{h}:force_original_aspect_ratio=decrease,pad={w}:{h}:(ow-iw)/2:(oh-ih)/2",
-                    "-c:a",
-                    "aac",
-                    "-b:a",
-                    ab,
-                    "-shortest",
                     "-preset",
                     preset,
                     "-crf",
                     str(crf),
-                    item.output,
                 ]
-            else:
-                cmd = [
-                    "ffmpeg",
-                    "-y",
-                    "-loop",
-                    "1",
-                    "-i",
-                    item.image_path,
-                    "-i",
-                    item.audio_path,
+                segment_jobs = [
+                    slideshow_job(
+                        names, per, seg, video_args, self._segments.root
+                    )
+                    for seg in segments
+                ]
+        elif mode == "Mehrere Audios, 1 Bild" and is_still_image(
+            item.image_path
+        ):
+            segment = self._still_cache.ensure(
+                item.image_path,
+                w,
+                h,
+                crf,
+                preset,
+                self._run_segment,
+                **({"fps": STILL_OUTPUT_FPS} if still else {}),
+            )
+            if self._stop_event.is_set():
+                raise Exception("Abbruch durch Benutzer")
+            self.log.emit(f"Standbild-Segment wird genutzt: {segment}")
+            cmd = build_mux_command(
+                segment,
+                audio_path,
+                str(item.output),
+                audio.args,
+                item.duration,
+            )
+        else:
+            source = still_source(
+                item.image_path, w, h, STILL_OUTPUT_FPS if still else None
+            )
+            cmd = [
+                "ffmpeg",
+                "-y",
+                *source.args,
+                "-i",
+                audio_path,
+                "-c:v",
+                "libx264",
+                *(
+                    still_video_args(duration=item.duration)
+                    if still
+                    else ["-tune", "stillimage"]
+                ),
+                "-vf",
+                source.video_filter,
+                *audio.args,
+                "-shortest",
+                "-preset",
+                preset,
+                "-crf",
+                str(crf),
+                item.output,
+            ]
+            segments = self._segment_plan(item, still)
+            if segments:
+                video_args = [
+                    "-vf",
+                    source.video_filter,
+                    "-r",
+                    str(SEGMENT_FPS),
                     "-c:v",
                     "libx264",
                     "-tune",
                     "stillimage",
-                    "-vf",
-                    f"scale={w}:{h}:force_original_aspect_ratio=decrease,pad={w}:{h}:(ow-iw)/2:(oh-ih)/2",
-                    "-c:a",
-                    "aac",
-                    "-b:a",
-                    ab,
-                    "-shortest",
                     "-preset",
                     preset,
                     "-crf",
                     str(crf),
-                    item.output,
                 ]
-            if self.plugin_manager is not None:
-                payload = self.plugin_manager.run_hook(
-                    "before_encode",
-                    {
-                        "command": cmd,
-                        "mode": mode,
-                        "image": item.image_path,
-                        "audio": item.audio_path,
-                        "output": str(item.output),
-                    },
+                # Beim Standbild sind alle vollen Abschnitte gleich und
+                # werden nur einmal kodiert.
+                segment_jobs = [
+                    segment_job(
+                        segment_command(source.args, seg, video_args),
+                        [source.path],
+                    )
+                    for seg in segments
+                ]
+        if segment_jobs:
+            cmd = build_concat_mux_command(
+                self._segments.concat_list(segment_jobs),
+                audio_path,
+                str(item.output),
+                audio.args,
+                item.duration or 0.0,
+            )
+        if self.plugin_manager is not None:
+            payload = self.plugin_manager.run_hook(
+                "before_encode",
+                {
+                    "command": cmd,
+                    "mode": mode,
+                    "image": item.image_path,
+                    "audio": audio_path,
+                    "output": str(item.output),
+                    "outputs": [str(p) for p in outputs],
+                },
+            )
+            cmd = payload.get("command", cmd)
+        return cmd, segment_jobs
+
+    def _encode_item(
+        self,
+        index: int,
+        item: PairItem,
+        total: int,
+        profile: Optional[EncodeProfile] = None,
+    ) -> None:
+        # Temporaere Concat-Listen, nach dem Job geloescht.
+        temp_files: List[str] = []
+        if self._stop_event.is_set():
+            item.status = "ABGEBROCHEN"
+            self._mark_complete(index, item)
+            return
+        item.validate()
+        audio_path = item.audio_path
+        if not item.valid or audio_path is None:
+            item.status = "FEHLER"
+            self.row_error.emit(index, item.validation_msg)
+            self._mark_complete(index, item)
+            return
+        key = self._job_key(item)
+        if (
+            key is not None
+            and self.settings.get("resume")
+            and self._skip_finished(index, item, key)
+        ):
+            return
+        started = time.monotonic()
+        # Das Preset kann sich per Termin zwischen zwei Jobs aendern; es
+        # gilt nur fuer diesen Job und bleibt aus dem Journal-Schluessel.
+        profile = profile or self.profile
+        try:
+            item.status = "ENCODIERE"
+            item.progress = 0.0
+            item.speed = 0.0
+            item.eta = 0.0
+            self.progress.touch(index)
+            out_dir = Path(self.settings["out_dir"]).resolve()
+            out_dir.mkdir(parents=True, exist_ok=True)
+            w, h = self.settings["width"], self.settings["height"]
+            crf = self.settings["crf"]
+            preset = profile.preset
+            mode = self.settings.get("mode", "Standard")
+            quality_label = f"crf{crf}_{preset}"
+            form_label = mode.replace(" + ", "_").replace(" ", "_")
+            ladder = parse_ladder(self.settings.get("renditions", ""))
+            outputs = [
+                str(
+                    build_out_name(
+                        audio_path,
+                        out_dir,
+                        self.settings.get("output_template"),
+                        duration_seconds=item.duration,
+                        quality=quality_label,
+                        resolution=rendition.size,
+                        form=form_label,
+                        rendition=rendition.name,
+                    )
+                )
+                for rendition in ladder
+            ]
+            item.output = (
+                outputs[0]
+                if outputs
+                else str(
+                    build_out_name(
+                        audio_path,
+                        out_dir,
+                        self.settings.get("output_template"),
+                        duration_seconds=item.duration,
+                        quality=quality_label,
+                        resolution=f"{w}x{h}",
+                        form=form_label,
+                    )
                 )
-                cmd = payload.get("command", cmd)
-            proc = subprocess.Popen(
-                cmd,
-                stderr=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                text=True,
             )
-            self._register_process(proc)
-            if proc.stderr:
-                for line in proc.stderr:
-                    if self._stop_event.is_set():
-                        proc.kill()
-                        break
-                    if "time=" in line and duration:
-                        try:
-                            t = line.split("time=")[1].split(" ")[0]
-                            h_, m_, s_ = t.split(":")
-                            elapsed = (
-                                float(h_) * 3600 + float(m_) * 60 + float(s_)
-                            )
-                            perc = min(100.0, elapsed / duration * 100.0)
-                            item.progress = perc
-                            self.row_progress.emit(index, perc)
-                        except Exception as e:
-                            logger.warning(
-                                "Fehler beim Lesen des Fortschritts: %s",
-                                e,
-                            )
-            proc.wait()
+            # Der Ausgabe-Cache kennt nur eine Datei je Auftrag. Schluessel
+            # und Treffer vor aller Vorarbeit (Messung, Segmente, Bilder).
+            cache_key = (
+                None
+                if ladder or self.preview is not None
+                else self._output_cache_key(item, audio_path, preset)
+            )
+            cache_hit = None
+            if cache_key is not None:
+                cache_hit = self._output_cache.fetch(
+                    cache_key, Path(item.output)
+                )
+            if cache_hit:
+                self.log.emit(
+                    f"Aus dem Ausgabe-Cache übernommen ({cache_hit}): "
+                    f"{item.output}"
+                )
+                returncode = 0
+            else:
+                cmd, segment_jobs = self._item_command(
+                    item, audio_path, ladder, outputs, preset, temp_files
+                )
+                unlink_shared(Path(item.output))
+                returncode = 0
+                if segment_jobs:
+                    returncode = self._encode_segments(
+                        index, item, segment_jobs
+                    )
+                if returncode == 0 and self.preview is not None:
+                    returncode = self._render_preview(cmd, index, item)
+                elif returncode == 0:
+                    returncode = self._run_with_progress(cmd, index, item)
             if self._stop_event.is_set():
                 item.status = "ABGEBROCHEN"
                 self.log.emit("Abbruch durch Benutzer.")
-            elif proc.returncode != 0:
+            elif returncode != 0:
                 item.status = "FEHLER"
                 self.row_error.emit(index, "FFmpeg-Fehler")
                 self.log.emit(f"FFmpeg-Fehler bei {item.output}")
             else:
                 item.status = "FERTIG"
                 item.progress = 100.0
-                self.row_progress.emit(index, 100.0)
-                self.log.emit(f"Fertig: {item.output}")
-                if self.plugin_manager is not None:
+                self.progress.touch(index)
+                for path in outputs or [item.output]:
+                    self.log.emit(f"Fertig: {path}")
+                if cache_key is not None and not cache_hit:
+                    self._output_cache.store(cache_key, Path(item.output))
+                if not cache_hit:
+                    self._record_encode(
+                        item, time.monotonic() - started, profile
+                    )
+                if self._journal is not None and key is not None:
+                    try:
+                        self._journal.record(
+                            key,
+                            str(item.output),
+                            [item.image_path, audio_path],
+                        )
+                    except OSError as e:
+                        logger.warning("Journal nicht schreibbar: %s", e)
+                if self.plugin_manager is not None and self.preview is None:
                     self.plugin_manager.run_hook(
                         "after_encode",
                         {"output": str(item.output), "mode": mode},
@@ -908,12 +1809,12 @@ class EncodeWorker(QtCore.QObject):
             file_hint = (
                 item.output
                 or item.image_path
-                or item.audio_path
+                or audio_path
                 or "unbekannte Datei"
             )
             self.log.emit(f"Fehler bei {file_hint}: {e}")
         finally:
-            if list_path:
+            for list_path in temp_files:
                 try:
                     Path(list_path).unlink(missing_ok=True)
                 except Exception as cleanup_error:
@@ -921,31 +1822,157 @@ class EncodeWorker(QtCore.QObject):
                         "Konnte temporaere Liste nicht loeschen: "
                         f"{list_path} ({cleanup_error})"
                     )
-            if proc is not None:
-                self._unregister_process(proc)
-            self._mark_complete(total)
+            item.speed = 0.0
+            item.eta = 0.0
+            self._mark_complete(index, item)
+
+    def _consume(self) -> None:
+        while True:
+            item = self._queue.take()
+            if item is None:
+                return
+            with self._running_lock:
+                self._running.append(item)
+            try:
+                profile = self._follow_deadline(item)
+                self._encode_item(
+                    self._row_of(item), item, self.progress.total, profile
+                )
+            finally:
+                with self._running_lock:
+                    self._running.remove(item)
+                self._queue.done()
+
+    def predict(self, item: PairItem) -> Optional[float]:
+        return self._predictor.predict(self.profile, item.duration)
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Geschaetzte Restzeit des Stapels; None ohne Messwerte."""
+        pending = []
+        for item in self._queue.pending():
+            seconds = self.predict(item)
+            if seconds is None:
+                return None
+            pending.append(seconds)
+        with self._running_lock:
+            running_items = list(self._running)
+        running = []
+        for item in running_items:
+            if item.eta:
+                running.append(item.eta)
+                continue
+            seconds = self.predict(item)
+            if seconds is None:
+                return None
+            running.append(seconds * (1 - item.progress / 100))
+        jobs = max(len(running_items), self._scheduler.encode_target)
+        return remaining_seconds(pending, running, jobs, self.eta.factor)
+
+    def _follow_deadline(self, item: PairItem) -> EncodeProfile:
+        """Waehlt vor jedem Job das Preset passend zum Termin neu.
+
+        Liefert das Profil fuer diesen Job; ``self.settings`` und
+        ``self.profile`` bleiben unveraendert, da andere Worker-Threads sie
+        ohne Sperre lesen.
+        """
+        deadline = self.settings.get("deadline")
+        if not deadline or self.preview is not None:
+            return self.profile
+        with self._plan_lock:
+            durations = [
+                p.duration
+                for p in [item, *self._queue.pending()]
+                if p.duration > 0
+            ]
+            with self._running_lock:
+                others = [p for p in self._running if p is not item]
+            jobs = max(1, self._scheduler.encode_target)
+            # Laufende Jobs belegen ihre Plaetze noch eine Weile.
+            budget = deadline - time.time() - sum(p.eta for p in others) / jobs
+            estimates = preset_seconds(
+                self._predictor, self.profile, durations, jobs, self.eta.factor
+            )
+            current = self._deadline_preset or self.profile.preset
+            plan = choose_preset(estimates, budget, current)
+            if plan is None:
+                self._note_deadline(
+                    "unknown",
+                    f"Termin: noch keine Messwerte – Preset {current} bleibt, "
+                    "bis die ersten Jobs gemessen sind",
+                )
+                return replace(self.profile, preset=current)
+            if plan.preset != current:
+                self._deadline_preset = plan.preset
+                self.log.emit(
+                    f"Termin: Preset {current} → {plan.preset} "
+                    f"(Rest ca. {human_time(plan.seconds)})"
+                )
+            if not plan.on_time:
+                self._note_deadline(
+                    "late",
+                    "Termin nicht zu halten: auch mit "
+                    f"{plan.preset} ca. {human_time(plan.seconds)} Rest",
+                )
+            return replace(self.profile, preset=plan.preset)
+
+    def _note_deadline(self, kind: str, message: str) -> None:
+        # Jeden Hinweis nur einmal je Lauf.
+        if kind not in self._deadline_notes:
+            self._deadline_notes.add(kind)
+            self.log.emit(message)
+
+    def _record_encode(
+        self, item: PairItem, wall: float, profile: EncodeProfile
+    ) -> None:
+        if self.preview is not None or item.duration <= 0 or wall <= 0:
+            return
+        with self._running_lock:
+            jobs = len(self._running)
+        record = EncodeRecord(
+            profile, item.duration, wall, max(1, jobs), current_load()
+        )
+        predicted = self._predictor.predict(profile, item.duration)
+        if predicted is not None:
+            self.eta.observe(predicted, wall)
+        self._predictor.add(record)
+        self._history.record(record)
+        if self.eta.slow and not self._slow_reported:
+            self._slow_reported = True
+            self.log.emit(
+                f"Hinweis: Kodierung läuft {self.eta.factor:.1f}x langsamer "
+                "als bisher üblich (Rechner ausgelastet?)"
+            )
 
     def run(self):
-        total = len(self.pairs)
-        parallel_jobs = max(1, int(self.settings.get("parallel_jobs", 1)))
-        if parallel_jobs == 1:
-            for i, item in enumerate(self.pairs):
-                self._encode_item(i, item, total)
-                if self._stop_event.is_set():
-                    break
+        out_dir = Path(self.settings["out_dir"]).resolve()
+        if self.preview is None:
+            self._journal = BatchJournal(out_dir)
+        if (
+            self._journal is not None
+            and self.settings.get("resume")
+            and len(self._journal)
+        ):
+            self.log.emit(
+                f"Fortsetzen: {len(self._journal)} fertige Jobs im Journal."
+            )
+        self.log.emit(f"Parallelität: {self._scheduler.describe()}")
+        order = self.settings.get("job_order", ORDER_TABLE)
+        if order != ORDER_TABLE:
+            self.log.emit(f"Reihenfolge: {ORDER_LABELS.get(order, order)}")
+        # Auch bei wenigen Paaren alle Plaetze besetzen: nachgereichte
+        # Paare sollen sofort parallel laufen.
+        parallel_jobs = self._scheduler.max_concurrency
+        if parallel_jobs <= 1:
+            self._consume()
         else:
-            with ThreadPoolExecutor(max_workers=parallel_jobs) as executor:
-                futures = [
-                    executor.submit(self._encode_item, i, item, total)
-                    for i, item in enumerate(self.pairs)
-                ]
-                while futures:
-                    _, futures = wait(futures, return_when=FIRST_COMPLETED)
-                    if self._stop_event.is_set():
-                        for future in futures:
-                            future.cancel()
-                        break
-        if all(p.status == "FERTIG" for p in self.pairs):
+            with ThreadPoolExecutor(
+                max_workers=parallel_jobs, thread_name_prefix="encode"
+            ) as executor:
+                for _ in range(parallel_jobs):
+                    executor.submit(self._consume)
+        if self.preview is None and all(
+            p.status == "FERTIG" for p in self.pairs
+        ):
             try:
                 dst = get_used_dir()
                 moved = 0
@@ -1144,6 +2171,69 @@ class ImageListWidget(DropListWidget):
 
 
 class AudioListWidget(DropListWidget):
+    WAVEFORM_SIZE = QtCore.QSize(96, 24)
+
+    def __init__(self, title: str, patterns: Tuple[str, ...]):
+        super().__init__(title, patterns)
+        self.setIconSize(self.WAVEFORM_SIZE)
+        self.waveforms = WaveformScheduler(parent=self)
+        self.waveforms.ready.connect(self._on_waveform)
+        self._waveform_failed: Set[str] = set()
+        # Erst nach kurzer Ruhe anfragen, nicht bei jedem Scroll-Schritt.
+        self._waveform_timer = QtCore.QTimer(self)
+        self._waveform_timer.setSingleShot(True)
+        self._waveform_timer.setInterval(80)
+        self._waveform_timer.timeout.connect(self._request_visible_waveforms)
+        self.verticalScrollBar().valueChanged.connect(
+            self._waveform_timer.start
+        )
+        self.model().rowsInserted.connect(self._waveform_timer.start)
+
+    def resizeEvent(self, e: QtGui.QResizeEvent) -> None:
+        super().resizeEvent(e)
+        self._waveform_timer.start()
+
+    def _visible_items(self) -> List[QtWidgets.QListWidgetItem]:
+        first = self.indexAt(QtCore.QPoint(0, 0)).row()
+        bottom = self.viewport().height()
+        items: List[QtWidgets.QListWidgetItem] = []
+        for row in range(max(0, first), self.count()):
+            item = self.item(row)
+            if self.visualItemRect(item).top() > bottom:
+                break
+            items.append(item)
+        return items
+
+    def _request_visible_waveforms(self) -> None:
+        missing: List[str] = []
+        for item in self._visible_items():
+            path = item.data(Qt.UserRole)
+            if not path or not item.icon().isNull():
+                continue
+            peaks = cached_peaks(path)
+            if peaks is not None:
+                self._set_waveform(item, peaks)
+            elif path not in self._waveform_failed:
+                missing.append(path)
+        self.waveforms.request(missing)
+
+    def _set_waveform(self, item: QtWidgets.QListWidgetItem, peaks) -> None:
+        size = self.WAVEFORM_SIZE
+        color = self.palette().color(QtGui.QPalette.Highlight)
+        item.setIcon(
+            QtGui.QIcon(
+                waveform_pixmap(peaks, size.width(), size.height(), color)
+            )
+        )
+
+    def _on_waveform(self, path: str, peaks: Optional[Peaks]) -> None:
+        if peaks is None:
+            self._waveform_failed.add(path)
+            return
+        for item in self._visible_items():
+            if item.data(Qt.UserRole) == path and item.icon().isNull():
+                self._set_waveform(item, peaks)
+
     def contextMenuEvent(self, e: QtGui.QContextMenuEvent):
         item = self.itemAt(e.pos())
         if not item:
@@ -1419,6 +2509,8 @@ class InfoDashboard(QtWidgets.QWidget):
         self.progress.setMinimumHeight(26)
         self.progress.setAccessibleName("Fortschritt gesamt")
         self.progress.setFormat("%p%")
+        self.eta_label = QtWidgets.QLabel()
+        self.eta_label.setAccessibleName("Restzeit")
         self.mini_log = QtWidgets.QPlainTextEdit()
         self.mini_log.setReadOnly(True)
         self.mini_log.setMaximumBlockCount(300)
@@ -1478,6 +2570,7 @@ class InfoDashboard(QtWidgets.QWidget):
             ),
             self.progress,
             self.progress_value,
+            self.eta_label,
             self.ffmpeg_lbl,
             self.env_lbl,
         ):
@@ -1489,6 +2582,7 @@ class InfoDashboard(QtWidgets.QWidget):
         lay.addLayout(row)
         lay.addWidget(self.mini_log)
         self.set_selection_counts(0, 0)
+        self.set_eta(None)
 
     def set_counts(self, t, d, e):
         self.total_label.setText(str(t))
@@ -1514,6 +2608,24 @@ class InfoDashboard(QtWidgets.QWidget):
         self.progress.setValue(v)
         self.progress_value.setText(f"{int(v)}%")
 
+    def set_eta(self, seconds: Optional[float], note: str = "") -> None:
+        if seconds is None:
+            self.eta_label.setText("Restzeit: –")
+            self.eta_label.setToolTip(
+                "Noch keine Messwerte für diese Einstellungen"
+            )
+            return
+        now = datetime.now()
+        finish = now + timedelta(seconds=seconds)
+        day = "" if finish.date() == now.date() else f" am {finish:%d.%m.}"
+        self.eta_label.setText(
+            f"Restzeit: ca. {human_time(seconds)} "
+            f"(fertig{day} gegen {finish:%H:%M}){note}"
+        )
+        self.eta_label.setToolTip(
+            "Schätzung aus bisherigen Kodierungen mit ähnlichen Einstellungen"
+        )
+
     def set_env(self, ff_ok, imp_ok=True):
         self.ffmpeg_lbl.setText(
             text_with_fallback(
@@ -1593,6 +2705,20 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.pairs: List[PairItem] = []
         self.model = PairTableModel(self.pairs)
+        self.model.estimate = self._estimate_pair
+        self._eta_predictor: Optional[EtaPredictor] = None
+        self._eta_timer = QtCore.QTimer(self)
+        self._eta_timer.setSingleShot(True)
+        self._eta_timer.setInterval(ETA_REFRESH_MS)
+        self._eta_timer.timeout.connect(self._update_eta)
+        self.probe_scheduler = ProbeScheduler(self)
+        self.probe_scheduler.probed.connect(self._on_probe_result)
+        self.model.probe = self.probe_scheduler.submit
+        self.duplicate_scheduler = DuplicateScheduler(self)
+        self.duplicate_scheduler.checked.connect(self._on_duplicates_checked)
+        self._progress_timer = QtCore.QTimer(self)
+        self._progress_timer.setInterval(PROGRESS_FLUSH_MS)
+        self._progress_timer.timeout.connect(self._flush_progress)
         self.plugin_manager = PluginManager(APP_DIR / "plugins")
         self.plugin_manager.load()
         logger.info(
@@ -1725,19 +2851,7 @@ class MainWindow(QtWidgets.QMainWindow):
             "Qualität für das Video (0 bis 51)"
         )
         self.preset_combo = QtWidgets.QComboBox()
-        self.preset_combo.addItems(
-            [
-                "ultrafast",
-                "superfast",
-                "veryfast",
-                "faster",
-                "fast",
-                "medium",
-                "slow",
-                "slower",
-                "veryslow",
-            ]
-        )
+        self.preset_combo.addItems(list(PRESETS))
         self.preset_combo.setCurrentText(
             self.settings.value("encode/preset", "ultrafast", str)
         )
@@ -1745,6 +2859,27 @@ class MainWindow(QtWidgets.QMainWindow):
         self.preset_combo.setAccessibleDescription(
             "Geschwindigkeits-Voreinstellung für die Kodierung"
         )
+        self.deadline_check = QtWidgets.QCheckBox("Fertig bis")
+        self.deadline_check.setChecked(
+            bool(self.settings.value("encode/deadline_enabled", False, bool))
+        )
+        self.deadline_check.setAccessibleName("Termin aktiv")
+        self.deadline_check.setAccessibleDescription(
+            "Preset automatisch so wählen, dass der Stapel rechtzeitig fertig ist"
+        )
+        self.deadline_edit = QtWidgets.QTimeEdit(
+            QtCore.QTime.fromString(
+                str(self.settings.value("encode/deadline_time", "18:00", str)),
+                "HH:mm",
+            )
+        )
+        self.deadline_edit.setDisplayFormat("HH:mm")
+        self.deadline_edit.setAccessibleName("Termin Uhrzeit")
+        self.deadline_edit.setAccessibleDescription(
+            "Uhrzeit, zu der alle Videos fertig sein sollen (heute oder morgen)"
+        )
+        self.deadline_edit.setEnabled(self.deadline_check.isChecked())
+        self.deadline_check.toggled.connect(self.deadline_edit.setEnabled)
         self.width_spin = QtWidgets.QSpinBox()
         self.width_spin.setRange(16, 7680)
         self.width_spin.setValue(self.settings.value("encode/width", 1920, int))
@@ -1779,6 +2914,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.output_template_edit.setAccessibleDescription(
             "Vorlage für Ausgabedateien"
         )
+        self.renditions_edit = QtWidgets.QLineEdit(
+            str(self.settings.value("encode/renditions", "", str))
+        )
+        self.renditions_edit.setPlaceholderText("leer = nur Breite × Höhe")
+        self.renditions_edit.setAccessibleName("Auflösungsstufen")
+        self.renditions_edit.setAccessibleDescription(
+            "Mehrere Ausgaben je Paar, zum Beispiel 1080p, 720p, 480p"
+        )
         self.mode_combo = QtWidgets.QComboBox()
         self.mode_combo.addItems(
             ["Standard", "Slideshow", "Video + Audio", "Mehrere Audios, 1 Bild"]
@@ -1793,20 +2936,123 @@ class MainWindow(QtWidgets.QMainWindow):
         )
         max_parallel = max(1, os.cpu_count() or 4)
         self.parallel_jobs_spin = QtWidgets.QSpinBox()
-        self.parallel_jobs_spin.setRange(1, max_parallel)
+        self.parallel_jobs_spin.setRange(0, max_parallel)
+        # 0 = automatische Parallelitaet nach Last und Durchsatz.
+        self.parallel_jobs_spin.setSpecialValueText("Auto")
         self.parallel_jobs_spin.setValue(
-            self.settings.value("encode/parallel_jobs", 1, int)
+            self._int_setting("encode/parallel_jobs", 0)
         )
         self.parallel_jobs_spin.setAccessibleName("Parallelität")
         self.parallel_jobs_spin.setAccessibleDescription(
             "Anzahl paralleler Jobs"
         )
+        self.job_order_combo = QtWidgets.QComboBox()
+        for order in ORDERS:
+            self.job_order_combo.addItem(ORDER_LABELS[order], order)
+        self._select_job_order(
+            str(self.settings.value("encode/job_order", ORDER_TABLE, str))
+        )
+        self.job_order_combo.setAccessibleName("Reihenfolge")
+        self.job_order_combo.setAccessibleDescription(
+            "In welcher Reihenfolge die Paare kodiert werden"
+        )
+        self.resume_check = QtWidgets.QCheckBox(
+            "Fertige Paare überspringen (Fortsetzen)"
+        )
+        self.resume_check.setChecked(
+            bool(self.settings.value("encode/resume", True, bool))
+        )
+        self.resume_check.setAccessibleName("Batch fortsetzen")
+        self.resume_check.setAccessibleDescription(
+            "Überspringt Paare, deren Ausgabe laut Journal schon fertig ist"
+        )
+        self.output_cache_check = QtWidgets.QCheckBox(
+            "Gleiche Aufträge aus dem Cache übernehmen"
+        )
+        self.output_cache_check.setChecked(
+            bool(self.settings.value("encode/output_cache", True, bool))
+        )
+        self.output_cache_check.setAccessibleName("Ausgabe-Cache")
+        self.output_cache_check.setAccessibleDescription(
+            "Verknüpft identische Ergebnisse statt sie neu zu erstellen"
+        )
+        self.still_optimized_check = QtWidgets.QCheckBox(
+            "Standbild-optimiert (1 fps)"
+        )
+        self.still_optimized_check.setChecked(
+            bool(self.settings.value("encode/still_optimized", False, bool))
+        )
+        self.still_optimized_check.setAccessibleName("Standbild-optimiert")
+        self.still_optimized_check.setAccessibleDescription(
+            "Kodiert Standbilder mit 1 fps und langen Keyframe-Abständen"
+        )
+        self.segmented_check = QtWidgets.QCheckBox(
+            "Lange Einträge in Abschnitten kodieren"
+        )
+        self.segmented_check.setChecked(
+            bool(self.settings.value("encode/segmented", True, bool))
+        )
+        self.segmented_check.setAccessibleName("Abschnitte")
+        self.segmented_check.setAccessibleDescription(
+            "Teilt lange Videos in Abschnitte, die parallel kodiert werden"
+        )
+        self.audio_normalize_check = QtWidgets.QCheckBox(
+            "Lautheit angleichen (-16 LUFS)"
+        )
+        self.audio_normalize_check.setChecked(
+            bool(self.settings.value("encode/audio_normalize", False, bool))
+        )
+        self.audio_normalize_check.setAccessibleName("Lautheit angleichen")
+        self.audio_normalize_check.setAccessibleDescription(
+            "Misst jede Audiodatei einmal und gleicht die Lautheit an"
+        )
+        self.preview_seconds_spin = QtWidgets.QSpinBox()
+        self.preview_seconds_spin.setRange(2, 120)
+        self.preview_seconds_spin.setSuffix(" s")
+        self.preview_seconds_spin.setValue(
+            self._int_setting("preview/seconds", int(PREVIEW_SECONDS))
+        )
+        self.preview_seconds_spin.setAccessibleName("Vorschau-Länge")
+        self.preview_windows_spin = QtWidgets.QSpinBox()
+        self.preview_windows_spin.setRange(1, 5)
+        self.preview_windows_spin.setSuffix(" Ausschnitt(e)")
+        self.preview_windows_spin.setValue(
+            self._int_setting("preview/windows", 1)
+        )
+        self.preview_windows_spin.setAccessibleName("Vorschau-Ausschnitte")
+        self.preview_windows_spin.setAccessibleDescription(
+            "1 = nur der Anfang, mehr = gleichmäßig über die Laufzeit verteilt"
+        )
         self.clear_after = QtWidgets.QCheckBox(
             "Nach Fertigstellung Listen leeren"
         )
         self.clear_after.setChecked(
             self.settings.value("ui/clear_after", False, bool)
         )
+        self.keep_queue_open = QtWidgets.QCheckBox(
+            "Nach dem letzten Job auf neue Paare warten"
+        )
+        self.keep_queue_open.setChecked(
+            bool(self.settings.value("ui/keep_queue_open", False, bool))
+        )
+        self.keep_queue_open.setAccessibleName("Warteschlange offen halten")
+        self.keep_queue_open.setAccessibleDescription(
+            "Das Encoding läuft weiter und kodiert neu hinzugefügte Paare, "
+            "bis es gestoppt oder der Haken entfernt wird"
+        )
+        self.keep_queue_open.toggled.connect(self._on_keep_queue_open)
+        self.skip_duplicate_images = QtWidgets.QCheckBox(
+            "Doppelte Bilder beim Hinzufügen überspringen"
+        )
+        self.skip_duplicate_images.setChecked(
+            bool(self.settings.value("ui/skip_duplicate_images", False, bool))
+        )
+        self.skip_duplicate_images.setAccessibleName(
+            "Doppelte Bilder überspringen"
+        )
+        self.skip_duplicate_images.setAccessibleDescription(
+            "Erkennt mehrfach exportierte Bilder und nimmt sie nur einmal auf"
+        )
         self.auto_open_output = QtWidgets.QCheckBox(
             "Ausgabeordner nach Fertigstellung öffnen"
         )
@@ -1944,8 +3190,29 @@ class MainWindow(QtWidgets.QMainWindow):
             self.preset_combo,
             "x264 Preset (schneller = größere Datei)",
         )
+        deadline_row = QtWidgets.QHBoxLayout()
+        deadline_row.setContentsMargins(0, 0, 0, 0)
+        deadline_row.addWidget(self.deadline_check)
+        deadline_row.addWidget(self.deadline_edit)
+        deadline_row.addStretch(1)
+        deadline_wrap = QtWidgets.QWidget()
+        deadline_wrap.setLayout(deadline_row)
+        self._add_form(
+            form,
+            "Termin",
+            deadline_wrap,
+            "Wählt das langsamste Preset, das rechtzeitig fertig wird, "
+            "und schaltet bei Verzug schneller",
+        )
         self._add_form(form, "Breite", self.width_spin, "Video-Breite in Pixel")
         self._add_form(form, "Höhe", self.height_spin, "Video-Höhe in Pixel")
+        self._add_form(
+            form,
+            "Auflösungsstufen",
+            self.renditions_edit,
+            "z.B. 1080p, 720p, 480p oder 1280x720: alle Größen in einem "
+            "Durchgang, Ton nur einmal kodiert",
+        )
         self._add_form(
             form, "Audio-Bitrate", self.abitrate_edit, "z.B. 192k, 256k"
         )
@@ -1981,7 +3248,56 @@ class MainWindow(QtWidgets.QMainWindow):
             form,
             "Parallelität (Jobs)",
             self.parallel_jobs_spin,
-            "Anzahl paralleler Jobs",
+            "Auto passt die Zahl der Jobs an CPU-Last und Tempo an",
+        )
+        self._add_form(
+            form,
+            "Reihenfolge",
+            self.job_order_combo,
+            "Nach geschätzter Rechenzeit aus Dauer und Modus",
+        )
+        self._add_form(
+            form,
+            "Fortsetzen",
+            self.resume_check,
+            "Nach Abbruch oder Absturz nur fehlende Paare neu erstellen",
+        )
+        self._add_form(
+            form,
+            "Ausgabe-Cache",
+            self.output_cache_check,
+            "Gleiches Bild + Audio + Einstellungen nicht erneut kodieren",
+        )
+        self._add_form(
+            form,
+            "Standbild",
+            self.still_optimized_check,
+            "Viel schneller und kleiner; Slideshows mit einem Bild pro Dia",
+        )
+        self._add_form(
+            form,
+            "Abschnitte",
+            self.segmented_check,
+            "Ab 30 Minuten auf allen Kernen; fertige Abschnitte bleiben "
+            "nach Abbruch erhalten",
+        )
+        self._add_form(
+            form,
+            "Lautheit",
+            self.audio_normalize_check,
+            "Gleich laute Ergebnisse; die Messung je Datei wird gemerkt",
+        )
+        preview_row = QtWidgets.QHBoxLayout()
+        preview_row.setContentsMargins(0, 0, 0, 0)
+        preview_row.addWidget(self.preview_seconds_spin)
+        preview_row.addWidget(self.preview_windows_spin)
+        preview_wrap = QtWidgets.QWidget()
+        preview_wrap.setLayout(preview_row)
+        self._add_form(
+            form,
+            "Vorschau",
+            preview_wrap,
+            "Länge und Zahl der Ausschnitte für den Vorschau-Knopf",
         )
         self._add_form(
             form,
@@ -2029,6 +3345,8 @@ class MainWindow(QtWidgets.QMainWindow):
             "Schriftgröße der Oberfläche anpassen",
         )
         form.addRow("", self.clear_after)
+        form.addRow("", self.keep_queue_open)
+        form.addRow("", self.skip_duplicate_images)
         form.addRow("", self.auto_open_output)
         form.addRow("", self.auto_save_project)
         form.addRow("", self.large_controls_toggle)
@@ -2138,6 +3456,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_save = QtWidgets.QPushButton("Projekt speichern")
         self.btn_load = QtWidgets.QPushButton("Projekt laden")
         self.btn_encode = QtWidgets.QPushButton("START")
+        self.btn_preview = QtWidgets.QPushButton("Vorschau")
         self.btn_stop = QtWidgets.QPushButton("Stopp")
         self.btn_stop.setEnabled(False)
         self.btn_wizard = QtWidgets.QPushButton("Geführter Start")
@@ -2150,6 +3469,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_save.setToolTip("Aktuellen Stand speichern")
         self.btn_load.setToolTip("Gespeichertes Projekt laden")
         self.btn_encode.setToolTip("Encoding starten")
+        self.btn_preview.setToolTip(
+            "Kurze Probe der gewählten Paare in kleiner Auflösung erstellen"
+        )
         self.btn_stop.setToolTip("Aktuellen Vorgang abbrechen")
         self.btn_wizard.setToolTip("Schritt-für-Schritt-Assistent öffnen")
 
@@ -2178,6 +3500,7 @@ class MainWindow(QtWidgets.QMainWindow):
             (self.btn_load, "Gespeichertes Projekt laden"),
             (self.btn_encode, "Videos jetzt erstellen"),
             (self.btn_stop, "Laufenden Vorgang abbrechen"),
+            (self.btn_preview, "Ausschnitt prüfen, bevor der Batch läuft"),
         ]
         for i, (btn, tip) in enumerate(btn_defs):
             row, col = divmod(i, 3)
@@ -2282,6 +3605,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_save.clicked.connect(self._save_project)
         self.btn_load.clicked.connect(self._load_project)
         self.btn_encode.clicked.connect(self._start_encode)
+        self.btn_preview.clicked.connect(self._start_preview)
         self.btn_stop.clicked.connect(self._stop_encode)
         self.btn_wizard.clicked.connect(self._show_guided_wizard)
         self.table.doubleClicked.connect(self._show_statusbar_path)
@@ -2311,6 +3635,18 @@ class MainWindow(QtWidgets.QMainWindow):
         )
         self.structure_search.textChanged.connect(self._apply_structure_filter)
         self.out_dir_edit.editingFinished.connect(self._refresh_structure_view)
+        # Restzeit haengt von Modus, Groesse, Preset und Parallelitaet ab.
+        for signal in (
+            self.mode_combo.currentTextChanged,
+            self.preset_combo.currentTextChanged,
+            self.width_spin.valueChanged,
+            self.height_spin.valueChanged,
+            self.crf_spin.valueChanged,
+            self.parallel_jobs_spin.valueChanged,
+            self.still_optimized_check.toggled,
+            self.renditions_edit.editingFinished,
+        ):
+            signal.connect(self._schedule_eta_update)
 
         self._set_font(self._font_size)
         self._apply_theme(self.settings.value("ui/theme", "Modern"))
@@ -2963,6 +4299,65 @@ class MainWindow(QtWidgets.QMainWindow):
         self.dashboard.set_counts(pair_count, fin_count, err_count)
         self.dashboard.set_selection_counts(selected_images, selected_audios)
         self._update_encode_ready_indicator(pair_count)
+        self._schedule_eta_update()
+
+    def _schedule_eta_update(self, *args) -> None:
+        # Gebuendelt: viele Proben oder Fortschrittsschritte, eine Rechnung.
+        if not self._eta_timer.isActive():
+            self._eta_timer.start()
+
+    def _history_predictor(self) -> EtaPredictor:
+        if self._eta_predictor is None:
+            history = EncodeHistory()
+            self._eta_predictor = EtaPredictor(history.recent())
+            history.close()
+        return self._eta_predictor
+
+    def _current_profile(self) -> EncodeProfile:
+        if self.worker is not None:
+            return self.worker.profile
+        settings = {
+            "mode": self.mode_combo.currentText(),
+            "width": self.width_spin.value(),
+            "height": self.height_spin.value(),
+            "preset": self.preset_combo.currentText(),
+            "crf": self.crf_spin.value(),
+            "still_optimized": self.still_optimized_check.isChecked(),
+            "renditions": self.renditions_edit.text(),
+        }
+        try:
+            return encode_profile(settings)
+        except ValueError:
+            settings["renditions"] = ""
+            return encode_profile(settings)
+
+    def _estimate_pair(self, item: PairItem) -> Optional[float]:
+        if self.worker is not None:
+            return self.worker.predict(item)
+        return self._history_predictor().predict(
+            self._current_profile(), item.duration
+        )
+
+    def _update_eta(self) -> None:
+        if self.worker is not None and self.worker.preview is None:
+            note = " – langsamer als üblich" if self.worker.eta.slow else ""
+            self.dashboard.set_eta(self.worker.remaining_seconds(), note)
+            return
+        durations = [
+            p.duration
+            for p in self.pairs
+            if p.status == "WARTET" and p.valid and p.duration > 0
+        ]
+        seconds = None
+        if durations:
+            seconds = self._history_predictor().batch_seconds(
+                self._current_profile(),
+                durations,
+                self.parallel_jobs_spin.value(),
+            )
+        self.dashboard.set_eta(seconds)
+        # Schaetzung je Zeile in der Fortschrittsspalte auffrischen.
+        self.model.refresh_rows(0, len(self.pairs) - 1, 6, 6)
 
     def _update_encode_ready_indicator(self, pair_count: int) -> None:
         if pair_count > 0 and not self.btn_stop.isEnabled():
@@ -3209,6 +4604,53 @@ class MainWindow(QtWidgets.QMainWindow):
         return sorted(files)
 
     def _on_images_added(self, files: List[str]):
+        # Per Drag & Drop stehen die neuen Bilder schon in der Liste.
+        new = set(files)
+        existing = [
+            path
+            for path in (
+                self.image_list.item(i).data(Qt.UserRole)
+                for i in range(self.image_list.count())
+            )
+            if path not in new
+        ]
+        # Der Bildvergleich laeuft im Hintergrund. Sollen Dubletten
+        # wegfallen, entstehen die Paare erst mit seinem Ergebnis.
+        pending = self.skip_duplicate_images.isChecked()
+        self.duplicate_scheduler.submit(files, existing, pending)
+        if pending:
+            self._log(f"{len(files)} Bild(er) werden auf Dubletten geprüft …")
+        else:
+            self._add_images(files)
+
+    def _on_duplicates_checked(
+        self, files: List[str], redundant: Set[str], pending: bool
+    ) -> None:
+        """Findet mehrfach exportierte Bilder, bevor daraus Paare werden."""
+        duplicates = [f for f in dict.fromkeys(files) if f in redundant]
+        names = ", ".join(Path(f).name for f in duplicates[:5])
+        if len(duplicates) > 5:
+            names += ", …"
+        if not pending:
+            if duplicates:
+                self._log(
+                    f"Hinweis: {len(duplicates)} Bild(er) gleichen anderen "
+                    f"Bildern der Liste: {names}"
+                )
+            return
+        dropped = set(duplicates)
+        if dropped:
+            self._log(
+                f"{len(duplicates)} doppelte(s) Bild(er) übersprungen: {names}"
+            )
+            for row in reversed(range(self.image_list.count())):
+                if self.image_list.item(row).data(Qt.UserRole) in dropped:
+                    self.image_list.takeItem(row)
+        self._add_images([f for f in files if f not in dropped])
+
+    def _add_images(self, files: List[str]) -> None:
+        if not files:
+            return
         self._push_history()
         for f in files:
             self.image_list.add_files([f])
@@ -3225,14 +4667,16 @@ class MainWindow(QtWidgets.QMainWindow):
             self.audio_list.add_files([f])
             self._debug(f"Audio hinzugefügt: {f}")
         it = iter(files)
+        updated: List[PairItem] = []
         for p in self.pairs:
             if p.audio_path is None:
                 try:
                     p.audio_path = next(it)
-                    p.update_duration()
                     p.validate()
+                    updated.append(p)
                 except StopIteration:
                     break
+        self.probe_scheduler.submit(updated)
         self.model.layoutChanged.emit()
         self._update_counts()
         self._resize_columns()
@@ -3250,7 +4694,29 @@ class MainWindow(QtWidgets.QMainWindow):
         self._on_images_added([path])
         self._log(f"Favorit genutzt: {path}")
 
+    def _pairs_locked(self) -> bool:
+        """Im laufenden Stapel bleibt die Paarliste bestehen.
+
+        Der Worker arbeitet mit denselben Objekten und Zeilennummern;
+        neu aufbauen (Auto-Pair, Leeren, Undo, Laden) erst nach dem Lauf.
+        """
+        if self.worker is None or self.worker.preview is not None:
+            return False
+        self._log("Während der Kodierung nicht möglich – bitte erst stoppen")
+        return True
+
+    def _set_pairs_editable(self, editable: bool) -> None:
+        for btn in (
+            self.btn_auto_pair,
+            self.btn_clear,
+            self.btn_undo,
+            self.btn_load,
+        ):
+            btn.setEnabled(editable)
+
     def _auto_pair(self):
+        if self._pairs_locked():
+            return
         self._push_history()
         imgs = [
             self.image_list.item(i).data(Qt.UserRole)
@@ -3270,28 +4736,17 @@ class MainWindow(QtWidgets.QMainWindow):
             img = imgs[0]
             for aud in auds:
                 p = PairItem(img, aud)
-                p.update_duration()
                 p.validate()
                 new.append(p)
-        elif mode == "Slideshow":
-            if len(imgs) == len(auds):
-                pairs = zip(imgs, auds)
-            elif len(imgs) == 1:
-                pairs = ((imgs[0], a) for a in auds)
-            else:
-                pairs = zip(imgs, auds)
-            for img, aud in pairs:
-                p = PairItem(img, aud)
-                p.update_duration()
+        elif mode == "Slideshow" and len(imgs) == 1:
+            for aud in auds:
+                p = PairItem(imgs[0], aud)
                 p.validate()
                 new.append(p)
         else:
-            for img, aud in zip(imgs, auds):
-                p = PairItem(img, aud)
-                p.update_duration()
-                p.validate()
-                new.append(p)
+            new = self._pair_by_name(imgs, auds)
         self.model.add_pairs(new)
+        self.probe_scheduler.submit(new)
         self._debug(
             f"Auto-Pair Ergebnis: {[(p.image_path, p.audio_path) for p in new][:3]} ..."
         )
@@ -3299,7 +4754,82 @@ class MainWindow(QtWidgets.QMainWindow):
         self._resize_columns()
         self._log(f"Auto-Pair erstellt {len(new)} Paar(e)")
 
+    def _pair_by_name(self, imgs: List[str], auds: List[str]) -> List[PairItem]:
+        result = pair_by_name(imgs, auds)
+        if not result.matches:
+            # Namen ohne jeden Bezug: wie frueher nach Listenposition.
+            self._log("Auto-Pair: keine Namen passen – Paare nach Reihenfolge")
+            pairs = [PairItem(img, aud) for img, aud in zip(imgs, auds)]
+        else:
+            pairs = [PairItem(m.image, m.audio) for m in result.matches]
+            pairs += [PairItem(img) for img in result.unmatched_images]
+            unsure = [m for m in result.matches if m.confidence < 1.0]
+            detail = f"davon {len(unsure)} nur ähnlich"
+            if unsure:
+                lowest = min(m.confidence for m in unsure)
+                detail += f", geringste Sicherheit {lowest:.0%}"
+            self._log(
+                f"Auto-Pair nach Namen: {len(result.matches)} Paar(e), {detail}"
+            )
+            for m in unsure[:50]:
+                self._debug(
+                    f"Ähnlich gepaart ({m.confidence:.0%}): "
+                    f"{Path(m.image).name} ↔ {Path(m.audio).name}"
+                )
+            if result.unmatched_images:
+                self._log(
+                    f"{len(result.unmatched_images)} Bild(er) ohne passendes "
+                    "Audio"
+                )
+            if result.unmatched_audios:
+                names = ", ".join(
+                    Path(a).name for a in result.unmatched_audios[:5]
+                )
+                more = ", …" if len(result.unmatched_audios) > 5 else ""
+                self._log(
+                    f"{len(result.unmatched_audios)} Audio(s) übrig: "
+                    f"{names}{more}"
+                )
+        for p in pairs:
+            p.validate()
+        return pairs
+
+    def _on_probe_result(
+        self, item: PairItem, audio_path: str, duration: float
+    ) -> None:
+        if item.audio_path != audio_path:
+            # Audio inzwischen geaendert: das neuere Ergebnis folgt noch,
+            # oder es gibt nichts mehr zu pruefen.
+            if not item.audio_path:
+                item.probing = False
+                item.duration = 0.0
+                self.model.refresh_row(self.model.row_of(item))
+            return
+        item.duration = duration
+        item.probing = False
+        self.model.refresh_row(self.model.row_of(item))
+        self._queue_new_pairs([item])
+        self._schedule_eta_update()
+
+    def _queue_new_pairs(self, items: List[PairItem]) -> None:
+        # Laufender Stapel: fertig gepruefte Paare sofort mit einreihen.
+        if self.worker is None or self.worker.preview is not None:
+            return
+        added = self.worker.enqueue(items)
+        if added:
+            self._log(
+                f"{added} Paar(e) in die laufende Warteschlange übernommen"
+            )
+
+    def _on_keep_queue_open(self, checked: bool) -> None:
+        if self.worker is not None and self.worker.preview is None:
+            self.worker.set_keep_open(checked)
+            if not checked:
+                self._log("Warteschlange endet nach den laufenden Jobs")
+
     def _clear_all(self):
+        if self._pairs_locked():
+            return
         if (
             QtWidgets.QMessageBox.question(
                 self, "Löschen?", "Alle Paare wirklich entfernen?"
@@ -3320,11 +4850,14 @@ class MainWindow(QtWidgets.QMainWindow):
         )
 
     def _undo_last(self):
-        if not self._history:
+        if not self._history or self._pairs_locked():
             return
         last = self._history.pop()
         self.model.clear()
         self.model.add_pairs(last)
+        self.probe_scheduler.submit(
+            [p for p in last if p.audio_path and not p.duration]
+        )
         self._update_counts()
         self._resize_columns()
         self._refresh_structure_view()
@@ -3365,6 +4898,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self._log(f"Projekt gespeichert: {path}")
 
     def _load_project(self):
+        if self._pairs_locked():
+            return
         start_dir = self._get_project_start_dir()
         path, _ = QtWidgets.QFileDialog.getOpenFileName(
             self, "Projekt laden", start_dir, "JSON (*.json)"
@@ -3394,10 +4929,10 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             p = PairItem(image_path, audio_path or None)
             p.output = output_path
-            p.update_duration()
             p.validate()
             new.append(p)
         self.model.add_pairs(new)
+        self.probe_scheduler.submit(new)
         s = data.get("settings", {})
         self.out_dir_edit.setText(s.get("out_dir", self.out_dir_edit.text()))
         self.crf_spin.setValue(s.get("crf", self.crf_spin.value()))
@@ -3416,6 +4951,30 @@ class MainWindow(QtWidgets.QMainWindow):
         self.parallel_jobs_spin.setValue(
             s.get("parallel_jobs", self.parallel_jobs_spin.value())
         )
+        self._select_job_order(s.get("job_order", self._job_order()))
+        if "deadline_time" in s:
+            deadline = QtCore.QTime.fromString(s["deadline_time"], "HH:mm")
+            self.deadline_check.setChecked(deadline.isValid())
+            if deadline.isValid():
+                self.deadline_edit.setTime(deadline)
+        self.resume_check.setChecked(
+            s.get("resume", self.resume_check.isChecked())
+        )
+        self.output_cache_check.setChecked(
+            s.get("output_cache", self.output_cache_check.isChecked())
+        )
+        self.still_optimized_check.setChecked(
+            s.get("still_optimized", self.still_optimized_check.isChecked())
+        )
+        self.segmented_check.setChecked(
+            s.get("segmented", self.segmented_check.isChecked())
+        )
+        self.audio_normalize_check.setChecked(
+            s.get("audio_normalize", self.audio_normalize_check.isChecked())
+        )
+        self.renditions_edit.setText(
+            s.get("renditions", self.renditions_edit.text())
+        )
         self._update_counts()
         self._resize_columns()
         self._refresh_structure_view()
@@ -3454,6 +5013,18 @@ class MainWindow(QtWidgets.QMainWindow):
             return None
         if not template_result.is_valid:
             self._log("Hinweis: Template ungültig, setze Standard.")
+        renditions = self.renditions_edit.text().strip()
+        try:
+            parse_ladder(renditions)
+        except ValueError as exc:
+            if require_valid:
+                QtWidgets.QMessageBox.warning(
+                    self, "Ungültige Auflösungsstufen", str(exc)
+                )
+                self._log("Abbruch: Auflösungsstufen sind ungültig.")
+                return None
+            self._log("Hinweis: Auflösungsstufen ungültig, werden ignoriert.")
+            renditions = ""
         return {
             "out_dir": self.out_dir_edit.text().strip(),
             "crf": self.crf_spin.value(),
@@ -3464,8 +5035,31 @@ class MainWindow(QtWidgets.QMainWindow):
             "mode": self.mode_combo.currentText(),
             "output_template": output_template,
             "parallel_jobs": self.parallel_jobs_spin.value(),
+            "job_order": self._job_order(),
+            "deadline_time": (
+                self.deadline_edit.time().toString("HH:mm")
+                if self.deadline_check.isChecked()
+                else ""
+            ),
+            "resume": self.resume_check.isChecked(),
+            "output_cache": self.output_cache_check.isChecked(),
+            "still_optimized": self.still_optimized_check.isChecked(),
+            "segmented": self.segmented_check.isChecked(),
+            "audio_normalize": self.audio_normalize_check.isChecked(),
+            "renditions": renditions,
         }
 
+    def _job_order(self) -> str:
+        return self.job_order_combo.currentData() or ORDER_TABLE
+
+    def _select_job_order(self, order: str) -> None:
+        index = self.job_order_combo.findData(order)
+        self.job_order_combo.setCurrentIndex(max(0, index))
+
+    def _int_setting(self, key: str, default: int) -> int:
+        value = self.settings.value(key, default, int)
+        return value if isinstance(value, int) else default
+
     def _dir_has_slideshow_images(self, path: Path) -> bool:
         try:
             for entry in path.iterdir():
@@ -3598,6 +5192,14 @@ class MainWindow(QtWidgets.QMainWindow):
                 "Encoding abgebrochen: nicht alle Bilder haben ein Audio."
             )
             return
+        if any(p.probing for p in self.pairs):
+            QtWidgets.QMessageBox.information(
+                self,
+                "Dauer wird ermittelt",
+                "Die Audiodauern werden noch geprüft. Bitte kurz warten.",
+            )
+            self._log("Encoding verschoben: Audiodauern werden noch geprüft.")
+            return
         mode = settings.get("mode", "Standard")
         if mode == "Mehrere Audios, 1 Bild":
             if self.image_list.count() == 0:
@@ -3685,26 +5287,123 @@ class MainWindow(QtWidgets.QMainWindow):
             self._show_error_dialog("Ordnerproblem", str(e))
             self._log(f"Encoding abgebrochen: Ordnerproblem ({e})")
             return
+        settings["keep_queue_open"] = self.keep_queue_open.isChecked()
+        if settings.get("deadline_time"):
+            deadline = next_deadline(
+                datetime.strptime(settings["deadline_time"], "%H:%M").time()
+            )
+            settings["deadline"] = deadline.timestamp()
+            self._log(
+                f"Termin {deadline:%d.%m. %H:%M}: Preset wird passend "
+                "gewählt und im Lauf nachgeführt"
+            )
+        self._log("Starte Encoding …")
+        self._launch_worker(
+            EncodeWorker(
+                self.pairs,
+                settings,
+                self.copy_only,
+                plugin_manager=self.plugin_manager,
+                row_of=self.model.row_of,
+            ),
+            self._encode_finished,
+        )
+
+    def _launch_worker(
+        self, worker: EncodeWorker, on_finished: Callable[[], None]
+    ) -> None:
         self.btn_encode.setEnabled(False)
+        self.btn_preview.setEnabled(False)
         self.btn_stop.setEnabled(True)
+        self._set_pairs_editable(worker.preview is not None)
         self.progress_total.setValue(0)
         self.dashboard.set_progress(0)
-        self._log("Starte Encoding …")
-        self.worker = EncodeWorker(
-            self.pairs,
-            settings,
-            self.copy_only,
-            plugin_manager=self.plugin_manager,
-        )
+        self.worker = worker
         self.thread = QtCore.QThread()
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
-        self.worker.row_progress.connect(self._on_row_progress)
-        self.worker.overall_progress.connect(self._on_overall_progress)
-        self.worker.row_error.connect(self._on_row_error)
+        if worker.preview is not None:
+            # Vorschau-Zeilen zaehlen in der eigenen Kopie, nicht in der
+            # Tabelle; Fehler nur melden, keinen Status setzen.
+            self.worker.row_error.connect(self._on_preview_error)
+        else:
+            self.worker.row_error.connect(self._on_row_error)
         self.worker.log.connect(self._log)
-        self.worker.finished.connect(self._encode_finished)
+        self.worker.finished.connect(on_finished)
         self.thread.start()
+        self._progress_timer.start()
+
+    def _start_preview(self):
+        if self.worker is not None:
+            return
+        settings = self._gather_settings()
+        if settings is None:
+            return
+        sel = self.table.selectionModel()
+        rows = sorted(
+            {idx.row() for idx in sel.selectedRows()} if sel else set()
+        ) or [0]
+        chosen = []
+        for row in rows:
+            if not 0 <= row < len(self.pairs):
+                continue
+            pair = self.pairs[row]
+            pair.validate()
+            if pair.valid and not pair.probing:
+                chosen.append(pair)
+        if not chosen:
+            QtWidgets.QMessageBox.information(
+                self,
+                "Keine Vorschau möglich",
+                "Bitte ein vollständiges Paar (Bild und Audio) auswählen.",
+            )
+            return
+        root = reset_preview_dir()
+        spec = PreviewSpec(
+            float(self.preview_seconds_spin.value()),
+            self.preview_windows_spin.value(),
+        )
+        items = [
+            PairItem(p.image_path, p.audio_path, duration=p.duration)
+            for p in chosen
+        ]
+        self._log(
+            f"Vorschau: {len(items)} Paar(e), {spec.windows} × "
+            f"{spec.seconds:.0f} s in {root}"
+        )
+        self._launch_worker(
+            EncodeWorker(
+                items,
+                preview_settings(settings, root),
+                True,
+                plugin_manager=self.plugin_manager,
+                preview=spec,
+            ),
+            self._preview_finished,
+        )
+
+    def _preview_finished(self):
+        worker = self.worker
+        self._progress_timer.stop()
+        self.btn_encode.setEnabled(True)
+        self.btn_preview.setEnabled(True)
+        self.btn_stop.setEnabled(False)
+        if self.thread:
+            self.thread.quit()
+            self.thread.wait()
+        self.thread = None
+        self.worker = None
+        done = [
+            Path(p.output)
+            for p in (worker.pairs if worker else [])
+            if p.status == "FERTIG" and Path(p.output).is_file()
+        ]
+        if not done:
+            self._log("Vorschau fehlgeschlagen – Details im Protokoll.")
+            return
+        target = done[0] if len(done) == 1 else done[0].parent
+        self._log(f"Vorschau fertig: {target}")
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(str(target)))
 
     def _suggest_add_images(self):
         msg = QtWidgets.QMessageBox(self)
@@ -3752,28 +5451,31 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_stop.setEnabled(False)
         self._log("Encoding gestoppt")
 
-    def _on_row_progress(self, row: int, perc: float):
-        if 0 <= row < len(self.pairs):
-            self.pairs[row].progress = perc
-            idx = self.model.index(row, 6)
-            self.model.dataChanged.emit(idx, idx)
+    def _flush_progress(self):
+        if self.worker is None:
+            return
+        flush = self.worker.progress.take()
+        if flush is None:
+            return
+        if flush.has_rows and self.worker.preview is None:
+            self.model.refresh_rows(flush.first_row, flush.last_row, 6, 7)
+        self._on_overall_progress(flush)
+        self._schedule_eta_update()
 
-    def _on_overall_progress(self, perc: float):
-        v = int(perc)
-        processed = sum(
-            1
-            for pair in self.pairs
-            if pair.status in {"FERTIG", "FEHLER", "ABGEBROCHEN"}
-        )
-        total = max(1, len(self.pairs))
+    def _on_overall_progress(self, flush: ProgressFlush):
+        v = int(flush.percent)
         self.progress_total.setFormat(
-            f"%p% gesamt ({processed}/{total} erledigt)"
+            f"%p% gesamt ({flush.processed}/{max(1, flush.total)} erledigt)"
         )
         self.progress_total.setValue(v)
         self.dashboard.set_progress(v)
 
     def _on_row_error(self, row: int, msg: str):
         msg = self._normalize_error_message(msg)
+        if row < 0:
+            # Paar steht nicht mehr in der Tabelle.
+            self._log(f"Fehler: {msg}")
+            return
         self._log(f"Fehler in Zeile {row + 1}: {msg}")
         if 0 <= row < len(self.pairs):
             self.pairs[row].status = "FEHLER"
@@ -3786,8 +5488,22 @@ class MainWindow(QtWidgets.QMainWindow):
         self._update_counts()
         self._flag_row_error(row, msg)
 
+    def _on_preview_error(self, index: int, msg: str):
+        msg = self._normalize_error_message(msg)
+        worker = self.worker
+        if worker is not None and 0 <= index < len(worker.pairs):
+            audio = Path(worker.pairs[index].audio_path or "").name
+            self._log(f"Vorschau-Fehler ({audio}): {msg}")
+        else:
+            self._log(f"Vorschau-Fehler: {msg}")
+        self._show_error_dialog("Fehler in der Vorschau", msg)
+
     def _encode_finished(self):
+        self._progress_timer.stop()
+        self._flush_progress()
+        self._set_pairs_editable(True)
         self.btn_encode.setEnabled(True)
+        self.btn_preview.setEnabled(True)
         self.btn_stop.setEnabled(False)
         self.progress_total.setValue(100)
         self.dashboard.set_progress(100)
@@ -3797,6 +5513,8 @@ class MainWindow(QtWidgets.QMainWindow):
             self.thread.wait()
         self.thread = None
         self.worker = None
+        # Neue Messwerte dieses Laufs fuer die naechste Schaetzung laden.
+        self._eta_predictor = None
         self._update_counts()
         summary_dir = self._archive_generation_run()
         if summary_dir is not None:
@@ -4016,7 +5734,16 @@ class MainWindow(QtWidgets.QMainWindow):
         act_open = menu.addAction("Im Ordner zeigen")
         act_copy = menu.addAction("Pfad kopieren")
         act_remove = menu.addAction("Zeile löschen")
+        act_front = act_cancel = None
+        pair = self.pairs[row]
+        if self.worker is not None and self.worker.is_pending(pair):
+            menu.addSeparator()
+            act_front = menu.addAction("Als Nächstes kodieren")
+            act_cancel = menu.addAction("Aus Warteschlange nehmen")
         action = menu.exec(self.table.viewport().mapToGlobal(pos))
+        if action is not None and action in (act_front, act_cancel):
+            self._reprioritize_row(row, action is act_front)
+            return
         if action == act_open:
             p = self.pairs[row]
             path = p.output or p.image_path or p.audio_path
@@ -4031,12 +5758,26 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.statusBar().showMessage("Pfad kopiert", 2000)
                 self._log(f"Pfad kopiert: {path}")
         elif action == act_remove:
+            if self.worker is not None:
+                self.worker.cancel(self.pairs[row])
             self._push_history()
             self.model.remove_rows([row])
             self._update_counts()
             self._resize_columns()
             self._log(f"Zeile {row + 1} gelöscht")
 
+    def _reprioritize_row(self, row: int, to_front: bool) -> None:
+        if self.worker is None:
+            return
+        pair = self.pairs[row]
+        if to_front:
+            if self.worker.move_to_front(pair):
+                self._log(f"Zeile {row + 1} wird als Nächstes kodiert")
+        elif self.worker.cancel(pair):
+            self.model.refresh_row(row)
+            self._update_counts()
+            self._log(f"Zeile {row + 1} aus der Warteschlange genommen")
+
     def _show_statusbar_path(self, index: QtCore.QModelIndex):
         if not index.isValid():
             return
@@ -4049,6 +5790,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self.settings.setValue("ui/geometry", self.saveGeometry())
         self.settings.setValue("ui/window_state", self.saveState())
         self.settings.setValue("ui/clear_after", self.clear_after.isChecked())
+        self.settings.setValue(
+            "ui/skip_duplicate_images", self.skip_duplicate_images.isChecked()
+        )
+        self.settings.setValue(
+            "ui/keep_queue_open", self.keep_queue_open.isChecked()
+        )
+        self.settings.setValue(
+            "preview/seconds", self.preview_seconds_spin.value()
+        )
+        self.settings.setValue(
+            "preview/windows", self.preview_windows_spin.value()
+        )
         self.settings.setValue(
             "ui/auto_open_output", self.auto_open_output.isChecked()
         )
@@ -4084,9 +5837,30 @@ class MainWindow(QtWidgets.QMainWindow):
                 "encode/output_template", s["output_template"]
             )
             self.settings.setValue("encode/parallel_jobs", s["parallel_jobs"])
+            self.settings.setValue("encode/job_order", s["job_order"])
+            self.settings.setValue(
+                "encode/deadline_enabled", bool(s["deadline_time"])
+            )
+            self.settings.setValue(
+                "encode/deadline_time",
+                self.deadline_edit.time().toString("HH:mm"),
+            )
+            self.settings.setValue("encode/resume", s["resume"])
+            self.settings.setValue("encode/output_cache", s["output_cache"])
+            self.settings.setValue(
+                "encode/still_optimized", s["still_optimized"]
+            )
+            self.settings.setValue("encode/segmented", s["segmented"])
+            self.settings.setValue(
+                "encode/audio_normalize", s["audio_normalize"]
+            )
+            self.settings.setValue("encode/renditions", s["renditions"])
         if self.auto_save_project.isChecked():
             self._auto_save_project("Schließen")
         self._stop_audio_preview()
+        self.probe_scheduler.shutdown()
+        self.duplicate_scheduler.shutdown()
+        self.audio_list.waveforms.shutdown()
         super().closeEvent(event)
 
 
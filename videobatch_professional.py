@@ -1,26 +1,178 @@
 from __future__ import annotations
 
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import json
 from pathlib import Path
+import time
 from typing import Any
 
+from core.batch_journal import BatchJournal, job_key
+from core.job_queue import (
+    DEFAULT_LEASE_SECONDS,
+    PENDING,
+    RUNNING,
+    JobQueue,
+    LeaseKeeper,
+    default_worker_id,
+    job_queue_path,
+)
+from core.job_order import ORDER_TABLE, ORDERS, job_cost, order_jobs
+from core.media_info import probe_media, probe_worker_count
+from core.utils import ProcessGroup, build_out_name
 from videobatch_extra import cli_slideshow, cli_video
 
+POLL_SECONDS = 2.0
 
-def _run_job(job: dict[str, Any], out_dir: Path) -> dict[str, Any]:
+
+def _run_job(
+    job: dict[str, Any],
+    out_dir: Path,
+    journal: BatchJournal | None = None,
+    resume: bool = False,
+) -> dict[str, Any]:
     mode = job.get("mode", "video")
     source = job.get("source")
     audio = job.get("audio")
     if not source or not audio:
         return {"ok": False, "error": "source/audio fehlt", "job": job}
 
+    inputs = [str(source), str(audio)]
+    try:
+        key: str | None = job_key(inputs, {"mode": mode})
+    except OSError:
+        key = None
+    if resume and journal is not None and key is not None:
+        done = journal.completed_output(key)
+        if done is not None:
+            return {
+                "ok": True,
+                "skipped": True,
+                "output": str(done),
+                "job": job,
+            }
+    output = build_out_name(str(audio), out_dir)
     if mode == "slideshow":
-        code = cli_slideshow(str(source), str(audio), str(out_dir))
+        code = cli_slideshow(
+            str(source), str(audio), str(out_dir), output=str(output)
+        )
     else:
-        code = cli_video(str(source), str(audio), str(out_dir))
-    return {"ok": code == 0, "exit_code": code, "job": job}
+        code = cli_video(
+            str(source), str(audio), str(out_dir), output=str(output)
+        )
+    if code == 0 and journal is not None and key is not None:
+        journal.record(key, str(output), inputs)
+    return {
+        "ok": code == 0,
+        "exit_code": code,
+        "output": str(output),
+        "job": job,
+    }
+
+
+def _job_duration(job: dict[str, Any]) -> float:
+    if job.get("duration"):
+        return float(job["duration"])
+    audio = job.get("audio")
+    return probe_media(str(audio)).duration if audio else 0.0
+
+
+def order_manifest(
+    jobs: list[dict[str, Any]], order: str
+) -> list[dict[str, Any]]:
+    """Sortiert Manifest-Jobs nach geschaetzter Rechenzeit.
+
+    Die Jobdatei vergibt Jobs in Einreihungsreihenfolge; die Dauer kommt
+    aus ``duration`` im Job oder aus der (gecachten) Audio-Probe.
+    """
+    if order == ORDER_TABLE:
+        return list(jobs)
+    with ThreadPoolExecutor(max_workers=probe_worker_count()) as pool:
+        durations = list(pool.map(_job_duration, jobs))
+    costs = {
+        id(job): job_cost(duration, job.get("mode", "video"))
+        for job, duration in zip(jobs, durations)
+    }
+    return order_jobs(jobs, order, lambda job: costs[id(job)])
+
+
+def _worker_loop(
+    queue_path: str,
+    batch: str,
+    worker: str,
+    lease_seconds: float,
+    resume: bool = False,
+) -> int:
+    queue = JobQueue(Path(queue_path), lease_seconds=lease_seconds)
+    journals: dict[str, BatchJournal] = {}
+    handled = 0
+    try:
+        while True:
+            claimed = queue.claim(worker, batch)
+            if claimed is None:
+                counts = queue.counts(batch)
+                if counts[PENDING] == 0 and counts[RUNNING] == 0:
+                    return handled
+                # Andere Worker arbeiten noch; deren Jobs koennen bei
+                # Absturz nach Ablauf der Lease wieder frei werden.
+                time.sleep(POLL_SECONDS)
+                continue
+            payload = claimed.payload
+            out = payload["out"]
+            if out not in journals:
+                journals[out] = BatchJournal(Path(out))
+            # Geht die Lease verloren, hat ein anderer Worker den Job; dann
+            # die eigenen ffmpeg-Prozesse sofort beenden.
+            group = ProcessGroup()
+            with LeaseKeeper(queue, claimed, group.terminate) as lease:
+                try:
+                    with group.active():
+                        result = _run_job(
+                            payload["job"], Path(out), journals[out], resume
+                        )
+                except Exception as e:
+                    result = {
+                        "ok": False,
+                        "error": str(e),
+                        "job": payload["job"],
+                    }
+            result["worker"] = worker
+            result["attempt"] = claimed.attempts
+            if lease.lost or not queue.complete(
+                claimed.id, worker, result, ok=bool(result.get("ok"))
+            ):
+                print(f"[LEASE VERLOREN] {payload.get('job')}")
+                continue
+            if result.get("skipped"):
+                state = "ÜBERSPRUNGEN"
+            else:
+                state = "OK" if result.get("ok") else "FEHLER"
+            print(f"[{state}] {result.get('job')}")
+            handled += 1
+    finally:
+        queue.close()
+
+
+def _process_worker(
+    queue_path: str,
+    batch: str,
+    threads: int,
+    lease_seconds: float,
+    resume: bool = False,
+) -> int:
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [
+            pool.submit(
+                _worker_loop,
+                queue_path,
+                batch,
+                default_worker_id(str(i)),
+                lease_seconds,
+                resume,
+            )
+            for i in range(threads)
+        ]
+        return sum(f.result() for f in futures)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -30,35 +182,106 @@ def build_parser() -> argparse.ArgumentParser:
             "JSON-Metadaten-Export"
         )
     )
-    parser.add_argument("--manifest", required=True)
-    parser.add_argument("--out", required=True)
+    parser.add_argument("--manifest")
+    parser.add_argument("--out")
     parser.add_argument("--threads", type=int, default=2)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Anzahl Worker-Prozesse (je --threads Jobs gleichzeitig)",
+    )
+    parser.add_argument(
+        "--queue",
+        default=None,
+        help="SQLite-Jobdatei (Standard: Arbeitsordner); "
+        "für mehrere Rechner auf ein gemeinsames Laufwerk legen",
+    )
+    parser.add_argument(
+        "--batch",
+        default=None,
+        help="Batch-Name; ohne --manifest einem laufenden Batch beitreten",
+    )
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS)
+    parser.add_argument(
+        "--order",
+        choices=ORDERS,
+        default=ORDER_TABLE,
+        help="Reihenfolge nach geschätzter Rechenzeit: table = wie im "
+        "Manifest, longest = längste zuerst (kürzeste Gesamtzeit), "
+        "shortest = kürzeste zuerst (früh erste Ergebnisse)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Jobs überspringen, deren Ausgabe laut Journal fertig ist",
+    )
     parser.add_argument("--metadata-out", default="batch_metadata.json")
     return parser
 
 
 def main() -> int:
-    args = build_parser().parse_args()
-    out_dir = Path(args.out)
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    jobs = json.loads(Path(args.manifest).read_text(encoding="utf-8"))
-    if not isinstance(jobs, list):
-        print("Manifest muss eine JSON-Liste sein")
-        return 2
-
-    results: list[dict[str, Any]] = []
-    with ThreadPoolExecutor(max_workers=max(args.threads, 1)) as pool:
-        future_map = {pool.submit(_run_job, job, out_dir): job for job in jobs}
-        for future in as_completed(future_map):
-            result = future.result()
-            results.append(result)
-            state = "OK" if result.get("ok") else "FEHLER"
-            print(f"[{state}] {result.get('job')}")
+    parser = build_parser()
+    args = parser.parse_args()
+    if not args.manifest and not args.batch:
+        parser.error("--manifest oder --batch angeben")
+    if args.manifest and not args.out:
+        parser.error("--out ist mit --manifest erforderlich")
+
+    queue_path = Path(args.queue) if args.queue else job_queue_path()
+    queue = JobQueue(queue_path, lease_seconds=args.lease)
+
+    if args.manifest:
+        jobs = json.loads(Path(args.manifest).read_text(encoding="utf-8"))
+        if not isinstance(jobs, list):
+            print("Manifest muss eine JSON-Liste sein")
+            queue.close()
+            return 2
+        out_dir = Path(args.out).resolve()
+        out_dir.mkdir(parents=True, exist_ok=True)
+        batch = args.batch or (
+            f"{Path(args.manifest).stem}-{time.strftime('%Y%m%d-%H%M%S')}"
+        )
+        jobs = order_manifest(jobs, args.order)
+        queue.enqueue(batch, [{"job": j, "out": str(out_dir)} for j in jobs])
+        print(f"{len(jobs)} Jobs in Batch '{batch}' eingereiht: {queue_path}")
+    else:
+        batch = args.batch
+        print(f"Trete Batch '{batch}' bei: {queue_path}")
+    requeued = queue.requeue_expired(batch)
+    if requeued:
+        print(f"{requeued} Jobs mit abgelaufener Lease wieder freigegeben")
+
+    threads = max(args.threads, 1)
+    workers = max(args.workers, 1)
+    if workers == 1:
+        _process_worker(
+            str(queue_path), batch, threads, args.lease, args.resume
+        )
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _process_worker,
+                    str(queue_path),
+                    batch,
+                    threads,
+                    args.lease,
+                    args.resume,
+                )
+                for _ in range(workers)
+            ]
+            for future in futures:
+                future.result()
 
+    counts = queue.counts(batch)
+    results = queue.results(batch)
+    queue.close()
     metadata = {
-        "jobs": len(jobs),
+        "batch": batch,
+        "jobs": sum(counts.values()),
         "ok": sum(1 for r in results if r.get("ok")),
+        "skipped": sum(1 for r in results if r.get("skipped")),
         "failed": sum(1 for r in results if not r.get("ok")),
         "results": results,
     }